@@ -1,16 +1,43 @@
-from flask import Flask, request, render_template, jsonify
-from twilio.twiml.voice_response import VoiceResponse, Gather
+from flask import Flask, request, render_template, jsonify, Response, g
 from twilio.rest import Client
+from twilio.http.http_client import TwilioHttpClient
+from twilio.base.exceptions import TwilioRestException
 import requests
+import atexit
+import hmac
+import io
 import json
+import logging
 import os
-from datetime import datetime
 import re
+import threading
+import time
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from storage import LogAppointmentStore, SlotUnavailable
+from cache import ReadCache
+from jobs import JobQueue, PermanentJobError
+from http_cache import conditional_json, make_etag
+from intents import IntentRouter
+from catalog import SORT_KEYS, VehicleCatalog
+from catalog_import import import_catalog
+from response_cache import ResponseCache
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, Registry
+from llm_client import LLMClient
+from sessions import Message, VoiceSession, create_session_store
+from context_window import ConversationWindow
+import twiml
+from extractor import (APPOINTMENT_FIELDS, conversation_text, conversation_extractor,
+                       message_extractor, voice_extractor)
+from logging_config import setup_logging
 
 # Environment variables'ları yükle
 load_dotenv()
 
+# LOG_LEVEL=DEBUG ile ayrıntılı çıkarım/sohbet logları açılır
+setup_logging()
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
 app.config['JSON_AS_ASCII'] = False
 app.secret_key = os.getenv('SECRET_KEY', 'default_secret_key')
@@ -21,16 +48,59 @@ TWILIO_ACCOUNT_SID = os.getenv('TWILIO_ACCOUNT_SID')
 TWILIO_AUTH_TOKEN = os.getenv('TWILIO_AUTH_TOKEN')
 TWILIO_PHONE_NUMBER = os.getenv('TWILIO_PHONE_NUMBER')
 MY_PHONE_NUMBER = os.getenv('MY_PHONE_NUMBER')
+VOICE_WEBHOOK_URL = os.getenv('VOICE_WEBHOOK_URL', "https://4a82-159-146-96-133.ngrok-free.app/voice")
 
 # Hassas bilgilerin varlığını kontrol et
 if not all([OPENROUTER_API_KEY, TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_PHONE_NUMBER, MY_PHONE_NUMBER]):
     raise ValueError("Lütfen .env dosyasında tüm gerekli API anahtarlarını tanımlayın!")
 
 # Veritabanı dosyaları
-APPOINTMENTS_FILE = 'data/appointments.json'
+APPOINTMENTS_FILE = 'data/appointments.json'  # eski format, ilk açılışta log'a taşınır
+APPOINTMENTS_LOG = 'data/appointments.log'
 VEHICLES_FILE = 'data/vehicles.json'
 os.makedirs('data', exist_ok=True)
 
+# Randevu deposu (append-only log + bellek içi indeks)
+appointment_store = LogAppointmentStore(
+    APPOINTMENTS_LOG,
+    legacy_json_path=APPOINTMENTS_FILE,
+    fsync=os.getenv('APPOINTMENTS_FSYNC', 'false').lower() == 'true'
+)
+
+# Araç kataloğu ve randevu listesi için okuma önbelleği
+read_cache = ReadCache()
+
+# Prometheus metrikleri - değerler process başınadır, /metrics ile okunur
+metrics = Registry()
+http_requests = metrics.counter(
+    'galeri_http_requests_total', 'HTTP istek sayısı', ('method', 'route', 'status'))
+http_duration = metrics.histogram(
+    'galeri_http_request_duration_seconds',
+    'HTTP istek süresi (stream yanıtlarında başlıklar gönderilene kadar)', ('method', 'route'))
+stage_duration = metrics.histogram(
+    'galeri_stage_duration_seconds',
+    'Aşama süresi: llm, extraction, storage_read, storage_write, twilio', ('stage',))
+stage_timer = stage_duration.time
+chat_turns = metrics.counter(
+    'galeri_chat_turns_total', 'Sohbet turları: path=rules LLM atlandı, path=llm modele gitti', ('path', 'intent'))
+
+def record_request(method, route, status, seconds):
+    http_requests.inc(method, route, str(status))
+    http_duration.observe(seconds, method, route)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        # route şablonu kullanılır (/api/appointments/<int:appointment_id>) - etiket sayısı sınırlı kalır
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        record_request(request.method, route, response.status_code, time.perf_counter() - started)
+    return response
+
 # Örnek araç veritabanı
 SAMPLE_VEHICLES = {
     "otomobil": [
@@ -50,251 +120,101 @@ SAMPLE_VEHICLES = {
 
 def init_database():
     """Veritabanı dosyalarını oluştur"""
-    if not os.path.exists(APPOINTMENTS_FILE):
-        with open(APPOINTMENTS_FILE, 'w', encoding='utf-8') as f:
-            json.dump([], f, ensure_ascii=False, indent=2)
-    
     if not os.path.exists(VEHICLES_FILE):
         with open(VEHICLES_FILE, 'w', encoding='utf-8') as f:
             json.dump(SAMPLE_VEHICLES, f, ensure_ascii=False, indent=2)
+        read_cache.put_file(VEHICLES_FILE, SAMPLE_VEHICLES)
+
+def read_json_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
 def load_vehicles():
-    """Araç veritabanını yükle"""
+    """Araç veritabanını yükle (dosya değişmediyse önbellekten)"""
     try:
-        with open(VEHICLES_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except:
+        return read_cache.get_file(VEHICLES_FILE, read_json_file)
+    except (OSError, ValueError):
         return SAMPLE_VEHICLES
 
+def get_catalog():
+    """İndeksli katalog - vehicles.json değişince yeniden kurulur"""
+    return read_cache.get_versioned('vehicle_catalog', catalog_version(), lambda: VehicleCatalog(load_vehicles()))
+
 def load_appointments():
-    """Randevuları yükle"""
-    try:
-        with open(APPOINTMENTS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except:
-        return []
+    """Randevuları yükle (depo sürümü değişmediyse önbellekten)"""
+    def read_all():
+        with stage_timer('storage_read'):
+            return appointment_store.all()
+    return read_cache.get_versioned('appointments', appointment_store.version, read_all)
+
+# Randevu saatleri - her (tarih, saat, araç tipi) için en fazla SLOT_CAPACITY aktif randevu
+SLOT_CAPACITY = int(os.getenv('SLOT_CAPACITY', '1'))
+SLOT_TIMES = [t.strip() for t in os.getenv('SLOT_TIMES', '09:00,10:00,11:00,12:00,13:00,14:00,15:00,16:00,17:00').split(',')
+              if t.strip()]
+SLOT_SEARCH_DAYS = int(os.getenv('SLOT_SEARCH_DAYS', '14'))
 
 def save_appointment(appointment_data):
-    """Yeni randevu kaydet"""
-    appointments = load_appointments()
-    
+    """Yeni randevu kaydet - log'a tek satır eklenir, saat doluysa SlotUnavailable"""
     appointment = {
-        'id': len(appointments) + 1,
         'created_at': datetime.now().isoformat(),
         'status': 'active',
         **appointment_data
     }
     
-    appointments.append(appointment)
-    
-    with open(APPOINTMENTS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(appointments, f, ensure_ascii=False, indent=2)
-    
-    return appointment
+    with stage_timer('storage_write'):
+        return appointment_store.insert(appointment, capacity=SLOT_CAPACITY)
+
+def slot_candidates(date=None, now=None):
+    """Sıradaki (tarih, saat) adayları - bugünün geçmiş saatleri atlanır"""
+    now = now or datetime.now()
+    if date:
+        days = [date]
+    else:
+        days = [(now + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(SLOT_SEARCH_DAYS)]
+    today, current = now.strftime('%Y-%m-%d'), now.strftime('%H:%M')
+    for day in days:
+        for slot_time in SLOT_TIMES:
+            if day > today or (day == today and slot_time > current):
+                yield day, slot_time
 
-# Konuşma geçmişini saklamak için
-conversations = {}
+def next_free_slots(vehicle_type, date=None, limit=5, now=None):
+    """Boş randevu saatleri [(tarih, saat)] - tarih verilmezse bugünden itibaren"""
+    return appointment_store.free_slots(slot_candidates(date, now), vehicle_type, SLOT_CAPACITY, limit)
+
+def format_slots(slots, with_date=True):
+    return ", ".join(f"{day} {slot_time}" if with_date else slot_time for day, slot_time in slots)
+
+# Oturum deposu ayarları - sqlite backend tüm worker'lar arasında paylaşılır
+SESSION_SETTINGS = {
+    'backend': os.getenv('SESSION_BACKEND', 'memory'),
+    'db_path': os.getenv('SESSION_DB', 'data/sessions.db'),
+    'max_entries': int(os.getenv('SESSION_MAX_ENTRIES', '10000')),
+    'idle_ttl': int(os.getenv('SESSION_IDLE_TTL', '1800')),
+    'max_bytes': int(os.getenv('SESSION_MAX_BYTES', str(64 * 1024 * 1024)))
+}
+
+# Konuşma geçmişini saklamak için (LRU + boşta kalma süresi ile sınırlı)
+conversations = create_session_store('conversations', **SESSION_SETTINGS)
 
 # Sesli asistan session yönetimi için
-voice_sessions = {}
+voice_sessions = create_session_store('voice', **SESSION_SETTINGS)
 
 def extract_appointment_from_conversation(conversation_history):
     """Konuşma geçmişinden randevu bilgilerini çıkar"""
     try:
-        import re
-        from datetime import datetime, timedelta
-        
-        appointment_info = {
-            'name': None,
-            'phone': None,
-            'vehicle_type': None,
-            'date': None,
-            'time': None
-        }
-        
         # SADECE kullanıcı mesajlarını al - AI mesajlarını filtrele
-        user_messages = []
-        all_user_text = ""
-        
-        for msg in conversation_history:
-            if msg.get('role') == 'user':
-                user_messages.append(msg['content'])
-                all_user_text += " " + msg['content'].lower()
-        
-        print(f"🔍 DEBUG - Kullanıcı mesajları: {user_messages}")
-        print(f"🔍 DEBUG - Analiz edilen kullanıcı metni: '{all_user_text[:200]}...'")
-        
-        # İSİM TESPİTİ 
-        name_patterns = [
-            r'([A-ZÇĞİÖŞÜ][a-zçğıöşü]+\s+[A-ZÇĞİÖŞÜ][a-zçğıöşü]+)',
-            r'([a-zA-ZçğıöşüÇĞİÖŞÜ]+\s+[a-zA-ZçğıöşüÇĞİÖŞÜ]+)',
-            r'isim.*?([a-zA-ZçğıöşüÇĞİÖŞÜ\s]+)',
-            r'ben\s+([a-zA-ZçğıöşüÇĞİÖŞÜ\s]+)',
-        ]
-        
-        # Önce mesajın başındaki kelimelerden isim arama
-        words = all_user_text.split()
-        if len(words) >= 2:
-            first_two_words = f"{words[0]} {words[1]}"
-            car_words = ['toyota', 'honda', 'volkswagen', 'mercedes', 'civic', 'corolla', 'golf', 'otomobil', 'suv', 'karavan', 'randevu', 'telefon', 'saat', 'yarın', 'pazartesi', 'salı', 'çarşamba', 'perşembe', 'cuma', 'cumartesi', 'pazar']
-            
-            # İlk iki kelime araba kelimesi değilse ve sadece harfse isim olabilir
-            if (not any(car in first_two_words.lower() for car in car_words) and 
-                re.match(r'^[a-zA-ZçğıöşüÇĞİÖŞÜ]+\s+[a-zA-ZçğıöşüÇĞİÖŞÜ]+$', first_two_words) and
-                len(first_two_words) > 4):
-                appointment_info['name'] = first_two_words.title()
-                print(f"👤 DEBUG - İsim bulundu (başta): {appointment_info['name']}")
-        
-        # Eğer bulunamadıysa pattern'lerle ara
-        if not appointment_info['name']:
-            for pattern in name_patterns:
-                matches = re.findall(pattern, all_user_text)
-                for match in matches:
-                    name = str(match).strip()
-                    car_words = ['toyota', 'honda', 'volkswagen', 'mercedes', 'civic', 'corolla', 'golf', 'otomobil', 'suv', 'karavan', 'randevu', 'telefon']
-                    
-                    if name and len(name) > 2 and len(name) < 30 and not any(car in name.lower() for car in car_words):
-                        if re.match(r'^[a-zA-ZçğıöşüÇĞİÖŞÜ\s]+$', name):
-                            appointment_info['name'] = name.title()
-                            print(f"👤 DEBUG - İsim bulundu (pattern): {appointment_info['name']}")
-                            break
-                if appointment_info['name']:
-                    break
-        
-        # TELEFON TESPİTİ - Kullanıcı mesajlarından
-        phone_patterns = [
-            r'\b(05\d{9})\b',
-            r'\b(5\d{9})\b',
-            r'\b(0\d{10})\b', 
-            r'(\d{11})',
-            r'(\d{10})',
-            r'telefon.*?(\d{10,11})',
-            r'numara.*?(\d{10,11})',
-            r'(\d{3})\s*(\d{3})\s*(\d{4})',
-            r'(\d{3})\s*(\d{3})\s*(\d{2})\s*(\d{2})',
-        ]
-        
-        for pattern in phone_patterns:
-            matches = re.findall(pattern, all_user_text)
-            for match in matches:
-                if isinstance(match, tuple):
-                    # Tuple ise birleştir
-                    phone = ''.join(match).strip()
-                else:
-                    phone = str(match).strip()
-                
-                # Sadece rakamları al
-                phone = re.sub(r'[^\d]', '', phone)
-                
-                if phone and phone.isdigit() and len(phone) >= 10:
-                    # 0 ile başlıyorsa 05 kontrolü
-                    if len(phone) == 11 and phone.startswith('0') and not phone.startswith('05'):
-                        continue
-                    # 10 haneli ise 5 ile başlamalı  
-                    if len(phone) == 10 and not phone.startswith('5'):
-                        continue
-                        
-                    appointment_info['phone'] = phone
-                    print(f"📞 DEBUG - Telefon bulundu: {appointment_info['phone']}")
-                    break
-            if appointment_info['phone']:
-                break
-        
-        # ARAÇ TİPİ TESPİTİ - Kullanıcı mesajlarından
-        vehicle_keywords = {
-            'otomobil': ['otomobil', 'sedan', 'corolla', 'civic', 'golf', 'araba', 'binek'],
-            'suv': ['suv', 'rav4', 'crv', 'cr-v', 'es u vi'],
-            'karavan': ['karavan', 'california', 'marco polo', 'kamper', 'marco', 'polo']
-        }
-        
-        for vehicle_type, keywords in vehicle_keywords.items():
-            for keyword in keywords:
-                if keyword in all_user_text:
-                    appointment_info['vehicle_type'] = vehicle_type
-                    print(f"🚗 DEBUG - Araç tipi bulundu: {keyword} -> {vehicle_type}")
-                    break
-            if appointment_info['vehicle_type']:
-                break
-        
-        # TARİH TESPİTİ - Kullanıcı mesajlarından
-        date_patterns = [
-            r'\b(\d{1,2})[./](\d{1,2})[./](\d{4})\b',
-            r'\b(\d{4})[/-](\d{1,2})[/-](\d{1,2})\b'
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.findall(pattern, all_user_text)
-            for match in matches:
-                try:
-                    if len(str(match[2])) == 4:
-                        day, month, year = match
-                    else:
-                        year, month, day = match
-                    
-                    date_obj = datetime(int(year), int(month), int(day))
-                    appointment_info['date'] = date_obj.strftime('%Y-%m-%d')
-                    print(f"📅 DEBUG - Tarih bulundu: {appointment_info['date']}")
-                    break
-                except ValueError:
-                    continue
-            if appointment_info['date']:
-                break
-        
-        # Gün isimleri - Kullanıcı mesajlarından
-        if not appointment_info['date']:
-            days = {
-                'pazartesi': 0, 'salı': 1, 'çarşamba': 2, 'perşembe': 3, 
-                'cuma': 4, 'cumartesi': 5, 'pazar': 6, 'yarın': 1
-            }
-            
-            for day_name, day_num in days.items():
-                if day_name in all_user_text:
-                    today = datetime.now()
-                    if day_name == 'yarın':
-                        target_date = today + timedelta(days=1)
-                    else:
-                        current_weekday = today.weekday()
-                        days_ahead = (day_num - current_weekday) % 7
-                        if days_ahead == 0:
-                            days_ahead = 7
-                        target_date = today + timedelta(days=days_ahead)
-                    
-                    appointment_info['date'] = target_date.strftime('%Y-%m-%d')
-                    print(f"📅 DEBUG - Gün ismi ile tarih: {day_name} -> {appointment_info['date']}")
-                    break
-        
-        # SAAT TESPİTİ - Kullanıcı mesajlarından
-        time_patterns = [
-            r'\b(\d{1,2})[:.,-](\d{2})\b',
-            r'saat\s*(\d{1,2})\b',
-            r'\b(\d{1,2})\s*(?:saat|saatte)\b'
-        ]
-        
-        for pattern in time_patterns:
-            matches = re.findall(pattern, all_user_text)
-            for match in matches:
-                try:
-                    if isinstance(match, tuple) and len(match) >= 2:
-                        hour = int(match[0])
-                        minute = int(match[1])
-                    else:
-                        hour = int(match)
-                        minute = 0
-                    
-                    if 8 <= hour <= 18:
-                        appointment_info['time'] = f"{hour:02d}:{minute:02d}"
-                        print(f"🕐 DEBUG - Saat bulundu: {appointment_info['time']}")
-                        break
-                except (ValueError, IndexError):
-                    continue
-            if appointment_info['time']:
-                break
-        
-        print(f"📋 DEBUG - FINAL Çıkarılan randevu bilgileri: {appointment_info}")
+        all_user_text = conversation_text(conversation_history)
+        logger.debug("Kullanıcı mesajları: %s", all_user_text)
+
+        appointment_info = dict.fromkeys(APPOINTMENT_FIELDS)
+        with stage_timer('extraction'):
+            appointment_info.update(conversation_extractor.extract(all_user_text))
+
+        logger.debug("Çıkarılan randevu bilgileri: %s", appointment_info)
         return appointment_info
-        
-    except Exception as e:
-        print(f"❌ DEBUG - Randevu bilgisi çıkarma hatası: {e}")
+
+    except Exception:
+        logger.exception("Randevu bilgisi çıkarma hatası")
         return None
 
 def check_appointment_completeness(appointment_info, conversation_history):
@@ -309,42 +229,214 @@ def check_appointment_completeness(appointment_info, conversation_history):
         has_date = appointment_info.get('date') and appointment_info.get('date') != None
         has_time = appointment_info.get('time') and appointment_info.get('time') != None
         
-        print(f"📊 DEBUG - Kontrol sonuçları:")
-        print(f"  👤 İsim: {has_name} ({appointment_info.get('name')})")
-        print(f"  📞 Telefon: {has_phone} ({appointment_info.get('phone')})")
-        print(f"  🚗 Araç: {has_vehicle} ({appointment_info.get('vehicle_type')})")
-        print(f"  📅 Tarih: {has_date} ({appointment_info.get('date')})")
-        print(f"  🕐 Saat: {has_time} ({appointment_info.get('time')})")
+        logger.debug("Kontrol sonuçları: isim=%s telefon=%s araç=%s tarih=%s saat=%s",
+                     bool(has_name), bool(has_phone), bool(has_vehicle), bool(has_date), bool(has_time))
         
         return has_name and has_phone and has_vehicle and has_date and has_time
             
-    except Exception as e:
-        print(f"❌ DEBUG - Tamamlanma kontrol hatası: {e}")
+    except Exception:
+        logger.exception("Tamamlanma kontrol hatası")
         return False
 
+# Büyük stoklarda sayfa ve sistem mesajı kategori başına bu kadar araçla sınırlanır
+HOME_VEHICLES_PER_CATEGORY = int(os.getenv('HOME_VEHICLES_PER_CATEGORY', '24'))
+PROMPT_VEHICLES_PER_CATEGORY = int(os.getenv('PROMPT_VEHICLES_PER_CATEGORY', '30'))
+
+def home_vehicles(catalog):
+    """Ana sayfa kartları - tamamı filtrelerle /api/vehicles/search üzerinden gezilir"""
+    return read_cache.get_versioned('home_vehicles', catalog_version(), lambda: {
+        category: catalog.search(category=category, limit=HOME_VEHICLES_PER_CATEGORY)[0]
+        for category in catalog.categories
+    })
+
 @app.route('/')
 def home():
-    vehicles = load_vehicles()
-    appointments = load_appointments()
-    return render_template('index.html', vehicles=vehicles, appointments=appointments)
+    version = appointment_store.version  # listeden önce okunur - aradaki değişiklikler akıştan gelir
+    with stage_timer('storage_read'):
+        recent, _ = appointment_store.query(limit=10, descending=True)
+    catalog = get_catalog()
+    return render_template('index.html', vehicles=home_vehicles(catalog),
+                           vehicle_counts={c: len(catalog.by_category(c)) for c in catalog.categories},
+                           vehicle_total=len(catalog), vehicle_features=catalog.values('ozellikler'),
+                           recent_appointments=recent[::-1], appointment_count=len(appointment_store),
+                           appointment_version=version)
 
 @app.route('/api/vehicles')
 def get_vehicles():
-    vehicles = load_vehicles()
-    return jsonify(vehicles)
+    return conditional_json(request, make_etag('vehicles', catalog_version()), load_vehicles,
+                            cache=read_cache, cache_key='vehicles_body')
+
+VEHICLE_SEARCH_PAGE_SIZE = 50
+VEHICLE_SEARCH_PAGE_MAX = 500
+
+def parse_vehicle_search(args):
+    """GET /api/vehicles/search parametreleri - hatalıysa ValueError"""
+    limit = int(args.get('limit', VEHICLE_SEARCH_PAGE_SIZE))
+    offset = int(args.get('offset', 0))
+    if not 0 <= limit <= VEHICLE_SEARCH_PAGE_MAX or offset < 0:
+        raise ValueError(f"limit 0-{VEHICLE_SEARCH_PAGE_MAX}, offset 0 veya büyük olmalı")
+    sort = args.get('sort') or None
+    if sort is not None and sort not in SORT_KEYS:
+        raise ValueError(f"sort {', '.join(SORT_KEYS)} değerlerinden biri olmalı")
+    query = {'limit': limit, 'offset': offset, 'sort': sort}
+    for field in ('category', 'brand', 'model'):
+        if args.get(field):
+            query[field] = args[field]
+    for field in ('year', 'min_price', 'max_price'):
+        if args.get(field):
+            query[field] = int(args[field])
+    # ?feature=Hibrit&feature=Otomatik veya ?feature=Hibrit,Otomatik - hepsi aranır
+    query['features'] = [f.strip() for value in args.getlist('feature') for f in value.split(',') if f.strip()]
+    return query
+
+@app.route('/api/vehicles/search')
+def search_vehicles():
+    """Filtreli katalog araması - ?min_price=&max_price=&feature=Hibrit&sort=price"""
+    try:
+        query = parse_vehicle_search(request.args)
+    except ValueError as e:
+        return jsonify({'error': f'Geçersiz parametre: {e}'}), 400
+
+    def build():
+        items, total = get_catalog().search(**query)
+        return {'items': items, 'total': total}
+
+    return conditional_json(request, make_etag('vehicles', catalog_version(), request.query_string), build)
+
+# Toplu stok içe aktarma - aynı anda tek import, okumalar beklemez
+CATALOG_IMPORT_TOKEN = os.getenv('CATALOG_IMPORT_TOKEN')
+catalog_import_lock = threading.Lock()
+
+def import_vehicles(source, fmt='csv'):
+    """Stok akışını vehicles.json'a aktar ve canlı önbelleği yeni katalogla değiştir
+
+    İndeksler dosya yerine geçmeden önce kurulur; istekler o ana kadar eski
+    kataloğu, sonrasında yenisini görür. Eşzamanlı import varsa RuntimeError.
+    """
+    if not catalog_import_lock.acquire(blocking=False):
+        raise RuntimeError("Başka bir katalog içe aktarımı sürüyor")
+    try:
+        prepared = {}
+
+        def prepare(vehicles):
+            prepared['vehicles'] = vehicles
+            prepared['catalog'] = VehicleCatalog(vehicles)
+
+        with stage_timer('catalog_import'):
+            report = import_catalog(source, VEHICLES_FILE, fmt, prepare=prepare)
+        read_cache.put_file(VEHICLES_FILE, prepared['vehicles'])
+        read_cache.get_versioned('vehicle_catalog', catalog_version(), lambda: prepared['catalog'])
+        # Sistem mesajı ve yönlendirici ilk sohbet isteğini bekletmesin
+        prompt_version()
+        get_intent_router()
+        logger.info("Katalog içe aktarıldı", extra={k: v for k, v in report.items() if k != 'error_samples'})
+        return report
+    finally:
+        catalog_import_lock.release()
+
+@app.route('/api/vehicles/import', methods=['POST'])
+def import_vehicles_endpoint():
+    """Gövdedeki CSV/JSONL stok dosyasını içe aktar - ?format=csv|jsonl"""
+    # Token tanımlı değilse uç kapalıdır - anonim istemci canlı kataloğu değiştiremez
+    if not CATALOG_IMPORT_TOKEN:
+        return jsonify({'error': 'Katalog içe aktarma kapalı'}), 403
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {CATALOG_IMPORT_TOKEN}'):
+        return jsonify({'error': 'Yetkisiz'}), 401
+    fmt = request.args.get('format', 'csv')
+    if fmt not in ('csv', 'jsonl'):
+        return jsonify({'error': 'format csv veya jsonl olmalı'}), 400
+
+    # Gövde belleğe alınmadan satır satır okunur
+    source = io.TextIOWrapper(request.stream, encoding='utf-8-sig', newline='')
+    try:
+        return jsonify(import_vehicles(source, fmt))
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 409
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
 @app.route('/api/vehicles/<category>')
 def get_vehicles_by_category(category):
     vehicles = load_vehicles()
     if category in vehicles:
-        return jsonify(vehicles[category])
+        return conditional_json(request, make_etag('vehicles', category, catalog_version()),
+                                lambda: vehicles[category], cache=read_cache, cache_key=f'vehicles_body:{category}')
     return jsonify({'error': 'Kategori bulunamadı'}), 404
 
+@app.route('/api/cache/stats')
+def cache_stats():
+    stats = read_cache.stats()
+    if response_cache is not None:
+        stats['llm_responses'] = response_cache.stats()
+    return jsonify(stats)
+
+@app.route('/api/llm/stats')
+def llm_stats():
+    return jsonify(llm_client.stats.snapshot())
+
+@app.route('/api/sessions/stats')
+def session_stats():
+    return jsonify({
+        'conversations': conversations.stats(),
+        'voice_sessions': voice_sessions.stats()
+    })
+
+APPOINTMENT_PAGE_SIZE = 50
+APPOINTMENT_PAGE_MAX = 500
+
+def parse_appointment_query(args):
+    """GET /api/appointments parametrelerini doğrula - hatalıysa ValueError"""
+    limit = int(args.get('limit', APPOINTMENT_PAGE_SIZE))
+    if not 0 <= limit <= APPOINTMENT_PAGE_MAX:
+        raise ValueError(f"limit 0-{APPOINTMENT_PAGE_MAX} arasında olmalı")
+    cursor = int(args['cursor']) if args.get('cursor') else None
+    order = args.get('order', 'asc')
+    if order not in ('asc', 'desc'):
+        raise ValueError("order asc veya desc olmalı")
+
+    filters = {}
+    for field in ('status', 'vehicle_type', 'date_from', 'date_to'):
+        if args.get(field):
+            filters[field] = args[field]
+    for field in ('date_from', 'date_to'):
+        if field in filters:
+            datetime.strptime(filters[field], '%Y-%m-%d')
+    if 'callback_requested' in args:
+        if args['callback_requested'] not in ('true', 'false'):
+            raise ValueError("callback_requested true veya false olmalı")
+        filters['callback_requested'] = args['callback_requested'] == 'true'
+
+    fields = [f for f in args.get('fields', '').split(',') if f]
+    return filters, cursor, limit, order == 'desc', fields
+
 @app.route('/api/appointments', methods=['GET', 'POST'])
 def handle_appointments():
     if request.method == 'GET':
-        appointments = load_appointments()
-        return jsonify(appointments)
+        version = appointment_store.version
+        if not request.args:
+            # eski istemciler için tüm liste
+            return conditional_json(request, make_etag('appointments', version), load_appointments,
+                                    cache=read_cache, cache_key='appointments_body')
+
+        try:
+            filters, cursor, limit, descending, fields = parse_appointment_query(request.args)
+        except ValueError as e:
+            return jsonify({'error': f'Geçersiz parametre: {e}'}), 400
+
+        def build_page():
+            with stage_timer('storage_read'):
+                items, next_cursor = appointment_store.query(filters, after=cursor, limit=limit,
+                                                             descending=descending)
+            if fields:
+                items = [{key: item.get(key) for key in ['id', *fields]} for item in items]
+            page = {'items': items, 'next_cursor': next_cursor}
+            if not filters:
+                page['total'] = len(appointment_store)
+            return page
+
+        # Sorgu başına gövde önbelleğe alınmaz, ama değişmediyse sorgu hiç çalışmaz
+        tag = make_etag('appointments', version, request.query_string)
+        return conditional_json(request, tag, build_page)
     
     elif request.method == 'POST':
         data = request.get_json()
@@ -353,54 +445,153 @@ def handle_appointments():
         if not all(field in data for field in required_fields):
             return jsonify({'error': 'Eksik bilgi'}), 400
         
-        appointment = save_appointment(data)
+        try:
+            appointment = save_appointment(data)
+        except SlotUnavailable as e:
+            return slot_conflict(e.slot)
         return jsonify(appointment), 201
 
-@app.route('/api/appointments/<int:appointment_id>', methods=['PUT', 'DELETE'])
+def slot_conflict(slot):
+    """409 - dolu saat ve aynı araç tipi için önerilen boş saatler"""
+    date, slot_time, vehicle_type = slot
+    available = next_free_slots(vehicle_type, limit=5)
+    return jsonify({
+        'error': f"{date} {slot_time} saati dolu. Müsait saatler: {format_slots(available) or 'yok'}",
+        'available': [{'date': day, 'time': free_time} for day, free_time in available]
+    }), 409
+
+@app.route('/api/slots')
+def free_slots():
+    """Boş randevu saatleri - ?vehicle_type=suv&date=2025-07-01&limit=5"""
+    try:
+        limit = min(int(request.args.get('limit', 5)), 50)
+        date = request.args.get('date')
+        if date:
+            datetime.strptime(date, '%Y-%m-%d')
+    except ValueError:
+        return jsonify({'error': 'Geçersiz parametre'}), 400
+    slots = next_free_slots(request.args.get('vehicle_type'), date=date, limit=limit)
+    return jsonify({
+        'capacity': SLOT_CAPACITY,
+        'available': [{'date': day, 'time': slot_time} for day, slot_time in slots]
+    })
+
+@app.route('/api/appointments/<int:appointment_id>', methods=['GET', 'PUT', 'DELETE'])
 def handle_appointment(appointment_id):
-    appointments = load_appointments()
+    if request.method == 'GET':
+        with stage_timer('storage_read'):
+            appointment = appointment_store.get(appointment_id)
+    elif request.method == 'PUT':
+        data = request.get_json() or {}
+        try:
+            with stage_timer('storage_write'):
+                appointment = appointment_store.update(appointment_id, data, capacity=SLOT_CAPACITY)
+        except SlotUnavailable as e:
+            return slot_conflict(e.slot)
+    else:
+        with stage_timer('storage_write'):
+            appointment = appointment_store.delete(appointment_id)
     
-    appointment = next((a for a in appointments if a['id'] == appointment_id), None)
     if not appointment:
         return jsonify({'error': 'Randevu bulunamadı'}), 404
     
-    if request.method == 'PUT':
-        data = request.get_json()
-        appointment.update(data)
-    elif request.method == 'DELETE':
-        appointments.remove(appointment)
-    
-    with open(APPOINTMENTS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(appointments, f, ensure_ascii=False, indent=2)
-    
     return jsonify(appointment)
 
-@app.route('/test-ai', methods=['POST'])
-def test_ai():
+CHANGE_FEED_HEARTBEAT = 15  # sn - sessizlikte yorum satırı gider, kopan bağlantı fark edilir
+CHANGE_FEED_MAX_AGE = 300  # sn - sonra tarayıcı Last-Event-ID ile yeniden bağlanır
+# Akış asgi.py üzerinden sunulur; WSGI'de her açık sekme bir worker'ı CHANGE_FEED_MAX_AGE
+# boyunca tutardı (gunicorn sync worker'ları tükenir). Tek kullanıcılı geliştirme için açılabilir.
+CHANGE_FEED_WSGI = os.getenv('CHANGE_FEED_WSGI', 'false').lower() == 'true'
+
+def sse_message(event, data, event_id=None):
+    """Adlandırılmış, id'li server-sent event"""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def appointment_changes_since(since):
+    """since sonrasındaki randevu değişiklikleri SSE metni olarak ve yeni imleç
+
+    Değişiklik geçmişi yetmiyorsa tek bir 'reset' olayı döner; istemci listeyi
+    baştan almalıdır.
+    """
+    result = appointment_store.changes(since)
+    if result is None:
+        version = appointment_store.version
+        return sse_message('reset', {'version': version}, version), version
+    events, version = result
+    return ''.join(sse_message('change', event, event['version']) for event in events), version
+
+def parse_change_cursor(cursor):
+    """Last-Event-ID (yeniden bağlanma) veya ?since= değeri - yoksa güncel sürüm"""
+    return int(cursor) if cursor else appointment_store.version
+
+def stream_appointment_changes(since):
+    yield "retry: 3000\n\n"
+    deadline = time.monotonic() + CHANGE_FEED_MAX_AGE
+    while time.monotonic() < deadline:
+        timeout = min(CHANGE_FEED_HEARTBEAT, deadline - time.monotonic())
+        if appointment_store.wait_for_change(since, timeout):
+            text, since = appointment_changes_since(since)
+            if text:
+                yield text
+                continue
+        yield ": ping\n\n"
+
+@app.route('/api/appointments/changes')
+def appointment_changes():
+    """Randevu ekleme/güncelleme/silme olay akışı (SSE) - ASGI'de asgi.appointment_changes sunar"""
+    if not CHANGE_FEED_WSGI:
+        # Dashboard akış yoksa listeyi eski usul tam yenilemeyle günceller
+        return jsonify({'error': 'Değişiklik akışı sadece ASGI giriş noktasında sunulur'}), 404
     try:
-        data = request.get_json()
-        if not data or 'message' not in data:
-            return jsonify({'error': 'Mesaj bulunamadı'}), 400
+        since = parse_change_cursor(request.headers.get('Last-Event-ID') or request.args.get('since'))
+    except ValueError:
+        return jsonify({'error': 'Geçersiz imleç'}), 400
+    return Response(
+        stream_appointment_changes(since),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
-        user_id = request.remote_addr + request.headers.get('User-Agent', '')
-        
-        if user_id not in conversations:
-            conversations[user_id] = []
-        
-        # Sistem mesajını ekle
-        if not conversations[user_id]:
-            vehicles = load_vehicles()
-            
-            vehicle_info = "Galerindeki mevcut araçlar:\n\n"
-            
-            for category, vehicle_list in vehicles.items():
-                vehicle_info += f"🚗 {category.upper()} KATEGORİSİ:\n"
-                for vehicle in vehicle_list:
-                    vehicle_info += f"- {vehicle['marka']} {vehicle['model']} ({vehicle['yil']}) - ₺{vehicle['fiyat']:,} TL\n"
-                    vehicle_info += f"  Özellikler: {', '.join(vehicle['ozellikler'])}\n"
-                vehicle_info += "\n"
-            
-            system_content = f"""Sen bir otomotiv galerisinin Türkçe konuşan AI asistanısın.
+OPENROUTER_URL = os.getenv('OPENROUTER_API_URL', "https://openrouter.ai/api/v1/chat/completions")
+APPOINTMENT_TRIGGER = "RANDEVU_OLUSTUR"
+
+OPENROUTER_HEADERS = {
+    "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+    "Content-Type": "application/json",
+    "HTTP-Referer": "http://localhost:5000",
+    "X-Title": "Galeri AI Asistan"
+}
+
+# Paylaşılan, keep-alive bağlantı havuzlu LLM istemcisi
+llm_client = LLMClient(
+    OPENROUTER_URL,
+    headers=OPENROUTER_HEADERS,
+    pool_size=int(os.getenv('LLM_POOL_SIZE', '10')),
+    max_retries=int(os.getenv('LLM_MAX_RETRIES', '2')),
+    backoff=float(os.getenv('LLM_RETRY_BACKOFF', '0.5')),
+    timeout=float(os.getenv('LLM_TIMEOUT', '30')),
+    connect_timeout=float(os.getenv('LLM_CONNECT_TIMEOUT', '5'))
+)
+
+def build_system_prompt():
+    """Araç kataloğu ile sistem mesajını oluştur"""
+    catalog = get_catalog()
+    
+    vehicle_info = "Galerindeki mevcut araçlar:\n\n"
+    
+    for category in catalog.categories:
+        # Büyük stokta kategori başına en uygun fiyatlı araçlar listelenir, kalanı sayı olarak verilir
+        vehicle_list, total = catalog.search(category=category, sort='price', limit=PROMPT_VEHICLES_PER_CATEGORY)
+        vehicle_info += f"🚗 {category.upper()} KATEGORİSİ:\n"
+        for vehicle in vehicle_list:
+            vehicle_info += f"- {vehicle['marka']} {vehicle['model']} ({vehicle['yil']}) - ₺{vehicle['fiyat']:,} TL\n"
+            vehicle_info += f"  Özellikler: {', '.join(vehicle['ozellikler'])}\n"
+        if total > len(vehicle_list):
+            vehicle_info += f"- ...ve {total - len(vehicle_list)} araç daha (en uygun fiyatlı {len(vehicle_list)} araç listelendi)\n"
+        vehicle_info += "\n"
+    
+    return f"""Sen bir otomotiv galerisinin Türkçe konuşan AI asistanısın.
 
 {vehicle_info}
 
@@ -438,101 +629,296 @@ Kurallar:
 - Samimi ve profesyonel ol
 - Fiyatları doğru ver  
 - Müşterinin bütçesine uygun öner"""
-            conversations[user_id].append({
-                "role": "system",
-                "content": system_content
-            })
 
-        conversations[user_id].append({
-            "role": "user",
-            "content": data['message']
-        })
+def catalog_version():
+    """Araç kataloğu sürümü - vehicles.json değişince değişir"""
+    return read_cache.file_stamp(VEHICLES_FILE)
 
-        if not OPENROUTER_API_KEY:
-            return jsonify({'error': 'AI servisi şu anda kullanılamıyor.'}), 500
+def get_system_prompt():
+    """Sistem mesajı katalog sürümü başına bir kez oluşturulur, tüm oturumlar paylaşır"""
+    return read_cache.get_versioned('system_prompt', catalog_version(), build_system_prompt)
+
+def prompt_version():
+    """Sistem mesajı içeriğinin özeti - yeniden başlatmada ve dosya kopyalamada değişmez"""
+    return read_cache.get_versioned('prompt_version', catalog_version(), lambda: make_etag(get_system_prompt()))
+
+# Sık sorulan soruların LLM yanıtları - katalog değişince boşaltılır
+RESPONSE_CACHE_TURNS = int(os.getenv('RESPONSE_CACHE_TURNS', '2'))
+response_cache = ResponseCache(
+    max_entries=int(os.getenv('RESPONSE_CACHE_SIZE', '1000')),
+    ttl=int(os.getenv('RESPONSE_CACHE_TTL', str(6 * 3600))),
+    near_threshold=float(os.getenv('RESPONSE_CACHE_NEAR_THRESHOLD', '0')),
+    path=os.getenv('RESPONSE_CACHE_FILE', 'data/response_cache.json') or None
+) if os.getenv('RESPONSE_CACHE', 'true').lower() == 'true' else None
+if response_cache is not None:
+    atexit.register(response_cache.save)  # aradaki yazmalar save_interval ile sınırlı
+response_cache_lookups = metrics.counter(
+    'galeri_response_cache_lookups_total', 'LLM yanıt önbelleği sorguları', ('result',))
+# Yanıtı randevu durumuna veya kişisel bilgiye bağlı olabilecek turlar önbelleğe girmez
+_UNCACHEABLE_TURN_RE = re.compile(r'\d|randevu|saat|müsait|bugün|yarın|telefon|isim|adım', re.IGNORECASE)
+
+def response_cache_turns(history):
+    """Önbellek anahtarı olacak kullanıcı turları - konuşma önbelleğe uygun değilse None
+
+    Anahtar saklanan sohbet geçmişinden kurulur (payload'daki sistem mesajları hariç).
+    Yalnızca tamamı RESPONSE_CACHE_TURNS kullanıcı turuna sığan, özetlenmemiş konuşmalar
+    önbelleğe alınır; böylece anahtar modele giden bağlamı tam olarak belirler.
+    """
+    if response_cache is None:
+        return None
+    turns = [m.content for m in history if m.role == 'user']
+    if (len(turns) > RESPONSE_CACHE_TURNS or any(m.role == 'system' for m in history)
+            or any(_UNCACHEABLE_TURN_RE.search(turn) for turn in turns)):
+        return None
+    return turns
+
+def cached_ai_response(cache_turns):
+    if cache_turns is None:
+        return None
+    cached = response_cache.get(prompt_version(), cache_turns)
+    response_cache_lookups.inc('miss' if cached is None else 'hit')
+    return cached
+
+def remember_ai_response(cache_turns, ai_response):
+    """Tetikleyici içeren (randevu oluşturan) yanıtlar asla önbelleğe alınmaz"""
+    if cache_turns is not None and APPOINTMENT_TRIGGER not in ai_response:
+        response_cache.put(prompt_version(), cache_turns, ai_response)
 
-        url = "https://openrouter.ai/api/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "http://localhost:5000",
-            "X-Title": "Galeri AI Asistan"
-        }
+# Oturumlarda sadece kullanıcı/asistan turları tutulur, bütçe aşılınca eski turlar özetlenir
+context_window = ConversationWindow(
+    max_tokens=int(os.getenv('CONTEXT_MAX_TOKENS', '1500')),
+    summary_tokens=int(os.getenv('CONTEXT_SUMMARY_TOKENS', '200'))
+)
+
+def slot_hint():
+    """Araç tipi başına yakın boş saatler - randevu deposu değişince veya saat dönünce yenilenir"""
+    now = datetime.now()
+
+    def build():
+        lines = [f"- {vehicle_type}: {format_slots(next_free_slots(vehicle_type, limit=3, now=now)) or 'yok'}"
+                 for vehicle_type in load_vehicles()]
+        return "Müsait randevu saatleri (dolu saate randevu verme, bunlardan öner):\n" + "\n".join(lines)
+
+    return read_cache.get_versioned('slot_hint', (appointment_store.version, now.strftime('%Y-%m-%d %H')), build)
+
+def append_user_turn(user_id, message):
+    history = conversations.get(user_id) or []
+    history.append(Message("user", message))
+    history = context_window.fit(history)
+    conversations[user_id] = history
+    return history
+
+def build_chat_request(user_id, message):
+    """Kullanıcı mesajını geçmişe ekle: (OpenRouter payload'ı, önbellek anahtarı turları)"""
+    history = append_user_turn(user_id, message)
+
+    payload = {
+        "model": "openai/gpt-3.5-turbo",
+        "messages": [{"role": "system", "content": get_system_prompt()},
+                     {"role": "system", "content": slot_hint()}] + [message.to_dict() for message in history],
+        "max_tokens": 500,
+        "temperature": 0.7
+    }
+    return payload, response_cache_turns(history)
+
+CHAT_FAST_PATH = os.getenv('CHAT_FAST_PATH', 'true').lower() == 'true'
+
+def get_intent_router():
+    return read_cache.get_versioned('intent_router', catalog_version(), lambda: IntentRouter(get_catalog()))
+
+def answer_without_llm(user_id, message):
+    """Katalog sorusu veya eksiksiz randevu mesajıysa LLM'e gitmeden yanıtla - değilse None
+
+    Tur sohbet geçmişine yazılır; sonraki LLM turları bağlamı kaybetmez.
+    """
+    if not CHAT_FAST_PATH:
+        return None
+    # Eksiksiz randevu: model de sadece tetikleyiciyi yazacaktı, kayıt aynı yoldan yapılır
+    if check_single_message_completeness(extract_appointment_from_single_message(message)):
+        intent, reply = 'booking', f"Tüm bilgilerinizi aldım! {APPOINTMENT_TRIGGER}"
+    else:
+        routed = get_intent_router().route(message)
+        if routed is None:
+            return None
+        intent, reply = routed
+
+    chat_turns.inc('rules', intent)
+    append_user_turn(user_id, message)
+    return {**finalize_ai_response(user_id, reply), 'intent': intent}
+
+def finalize_ai_response(user_id, ai_response):
+    """AI yanıtını geçmişe ekle, randevu tetikleyicisini işle"""
+    history = conversations.get(user_id) or []
+    history.append(Message("assistant", ai_response))
+    
+    logger.debug("AI yanıtı: %r (geçmiş: %d mesaj)", ai_response, len(history))
+    
+    # Randevu oluşturma kontrolü - Temizlenmiş sistem
+    appointment_created = None
+    
+    # Ana trigger kelimesi kontrolü
+    if APPOINTMENT_TRIGGER in ai_response:
+        logger.debug("%s tetikleyicisi bulundu", APPOINTMENT_TRIGGER)
         
-        payload = {
-            "model": "openai/gpt-3.5-turbo",
-            "messages": conversations[user_id],
-            "max_tokens": 500,
-            "temperature": 0.7
-        }
-
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
+        # SADECE SON KULLANICI MESAJINI KULLAN - ESKİ BİLGİLERİ UNUTT
+        last_user_message = ""
+        for msg in reversed(history):
+            if msg.role == 'user':
+                last_user_message = msg.content
+                break
         
-        if response.status_code == 200:
-            result = response.json()
-            if 'choices' in result and result['choices']:
-                ai_response = result['choices'][0]['message']['content']
-                
-                conversations[user_id].append({
-                    "role": "assistant",
-                    "content": ai_response
-                })
-                
-                print(f"\n🤖 DEBUG - AI YANITI: '{ai_response}'")
-                print(f"🔍 DEBUG - Konuşma geçmişi uzunluğu: {len(conversations[user_id])}")
+        # Sadece son mesajdan bilgi çıkar
+        appointment_info = extract_appointment_from_single_message(last_user_message)
+        
+        if appointment_info and check_single_message_completeness(appointment_info):
+            try:
+                appointment_created = save_appointment(appointment_info)
+                logger.info("Randevu oluşturuldu", extra={'appointment_id': appointment_created['id'], 'source': 'chat'})
                 
-                # Randevu oluşturma kontrolü - Temizlenmiş sistem
-                appointment_created = None
+                # AI yanıtından trigger kelimesini kaldır ve başarı mesajı ekle
+                ai_response = ai_response.replace(APPOINTMENT_TRIGGER, "")
+                success_msg = f"\n\n✅ Mükemmel! Randevunuz başarıyla kaydedildi!\nRandevu Numaranız: #{appointment_created['id']}\nGaleri ekibimiz size ulaşacak."
+                ai_response += success_msg
+                history[-1].content = ai_response
                 
-                # Ana trigger kelimesi kontrolü
-                if "RANDEVU_OLUSTUR" in ai_response:
-                    print("🎯 DEBUG - RANDEVU_OLUSTUR tetikleyicisi bulundu!")
-                    
-                    # SADECE SON KULLANICI MESAJINI KULLAN - ESKİ BİLGİLERİ UNUTT
-                    last_user_message = ""
-                    for msg in reversed(conversations[user_id]):
-                        if msg.get('role') == 'user':
-                            last_user_message = msg['content']
-                            break
-                    
-                    print(f"🔍 DEBUG - Sadece son mesaj analiz ediliyor: '{last_user_message}'")
-                    
-                    # Sadece son mesajdan bilgi çıkar
-                    appointment_info = extract_appointment_from_single_message(last_user_message)
-                    print(f"📋 DEBUG - Son mesajdan çıkarılan bilgiler: {appointment_info}")
-                    
-                    if appointment_info and check_single_message_completeness(appointment_info):
-                        try:
-                            appointment_created = save_appointment(appointment_info)
-                            print(f"✅ DEBUG - Randevu BAŞARIYLA oluşturuldu: ID {appointment_created['id']}")
-                            
-                            # AI yanıtından trigger kelimesini kaldır ve başarı mesajı ekle
-                            ai_response = ai_response.replace("RANDEVU_OLUSTUR", "")
-                            success_msg = f"\n\n✅ Mükemmel! Randevunuz başarıyla kaydedildi!\nRandevu Numaranız: #{appointment_created['id']}\nGaleri ekibimiz size ulaşacak."
-                            ai_response += success_msg
-                            conversations[user_id][-1]['content'] = ai_response
-                            
-                            # Randevu oluştu, konuşma geçmişini temizle
-                            conversations[user_id] = [conversations[user_id][0]]  # Sadece sistem mesajını tut
-                            
-                        except Exception as e:
-                            print(f"❌ DEBUG - Randevu oluşturma hatası: {e}")
-                            ai_response = ai_response.replace("RANDEVU_OLUSTUR", "")
-                            ai_response += "\n\n❌ Üzgünüm, randevu oluşturulurken bir hata oluştu. Lütfen tekrar deneyin."
-                    else:
-                        print("ℹ️ DEBUG - Son mesajda randevu için yeterli bilgi YOK")
-                        ai_response = ai_response.replace("RANDEVU_OLUSTUR", "")
-                        ai_response += "\n\n⚠️ Lütfen tüm bilgileri tek mesajda verin: İsim, telefon, araç tipi, tarih, saat"
+                # Randevu oluştu, konuşma geçmişini temizle
+                history = []
                 
-                # Geçmiş çok uzunsa temizle
-                if len(conversations[user_id]) > 12:
-                    conversations[user_id] = [conversations[user_id][0]] + conversations[user_id][-10:]
+            except SlotUnavailable as e:
+                date, slot_time, vehicle_type = e.slot
+                ai_response = ai_response.replace(APPOINTMENT_TRIGGER, "")
+                alternatives = format_slots(next_free_slots(vehicle_type, limit=3))
+                ai_response += (f"\n\n⚠️ Üzgünüm, {date} {slot_time} saati dolu. "
+                                f"Müsait saatler: {alternatives or 'yakın tarihte boş saat yok'}. "
+                                "Bilgilerinizi yeni saatle tekrar yazabilir misiniz?")
+                history[-1].content = ai_response
+            except Exception:
+                logger.exception("Randevu oluşturma hatası")
+                ai_response = ai_response.replace(APPOINTMENT_TRIGGER, "")
+                ai_response += "\n\n❌ Üzgünüm, randevu oluşturulurken bir hata oluştu. Lütfen tekrar deneyin."
+        else:
+            logger.debug("Son mesajda randevu için yeterli bilgi yok")
+            ai_response = ai_response.replace(APPOINTMENT_TRIGGER, "")
+            ai_response += "\n\n⚠️ Lütfen tüm bilgileri tek mesajda verin: İsim, telefon, araç tipi, tarih, saat"
+    
+    # Geçmiş token bütçesini aşıyorsa eski turları özetle
+    conversations[user_id] = context_window.fit(history)
+    
+    response_data = {'response': ai_response}
+    if appointment_created:
+        response_data['appointment_created'] = appointment_created
+    return response_data
+
+def sse_event(data):
+    """Server-sent event satırı"""
+    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def strip_trigger_for_stream(buffer):
+    """Tetikleyici kelimeyi tarayıcıya göndermeden ayıkla
+
+    Yayınlanabilecek metni ve tetikleyicinin başlangıcı olabilecek, bir
+    sonraki token'ı bekleyen kuyruğu döndürür.
+    """
+    buffer = buffer.replace(APPOINTMENT_TRIGGER, "")
+    for size in range(min(len(buffer), len(APPOINTMENT_TRIGGER) - 1), 0, -1):
+        if APPOINTMENT_TRIGGER.startswith(buffer[-size:]):
+            return buffer[:-size], buffer[-size:]
+    return buffer, ""
+
+def parse_stream_line(line):
+    """OpenRouter SSE satırını çöz: (bitti_mi, token)"""
+    if not line.startswith(b'data:'):
+        return False, None  # boş satırlar ve ": OPENROUTER PROCESSING" yorumları
+    data = line[5:].strip()
+    if data == b'[DONE]':
+        return True, None
+    
+    choices = json.loads(data).get('choices') or [{}]
+    return False, (choices[0].get('delta') or {}).get('content')
+
+def stream_ai_response(user_id, payload, cache_turns=None):
+    """OpenRouter yanıtını token token SSE olarak aktar, bitince randevu kontrolünü yap"""
+    started = time.perf_counter()
+    first_token_ms = None
+    parts = []
+    pending = ""
+    
+    try:
+        with stage_timer('llm'), llm_client.post({**payload, "stream": True}, stream=True) as response:
+            if response.status_code != 200:
+                yield sse_event({'error': 'AI servisi hatası.'})
+                return
+            
+            # chunk_size=None: parçalar geldiği anda işlenir, 512 byte beklenmez
+            for line in response.iter_lines(chunk_size=None):
+                done, token = parse_stream_line(line)
+                if done:
+                    break
+                if not token:
+                    continue
                 
-                response_data = {'response': ai_response}
-                if appointment_created:
-                    response_data['appointment_created'] = appointment_created
+                if first_token_ms is None:
+                    first_token_ms = round((time.perf_counter() - started) * 1000, 1)
+                    logger.debug("İlk token süresi: %s ms", first_token_ms)
                 
-                return jsonify(response_data)
+                parts.append(token)
+                visible, pending = strip_trigger_for_stream(pending + token)
+                if visible:
+                    yield sse_event({'token': visible})
+        
+        if not parts:
+            yield sse_event({'error': 'AI yanıt alınamadı.'})
+            return
+        
+        remember_ai_response(cache_turns, "".join(parts))
+        response_data = finalize_ai_response(user_id, "".join(parts))
+        yield sse_event({'done': True, 'ttft_ms': first_token_ms, **response_data})
+    
+    except requests.exceptions.Timeout:
+        yield sse_event({'error': 'AI servisi yanıt vermiyor.'})
+    except requests.exceptions.ConnectionError:
+        yield sse_event({'error': 'AI servisine bağlanılamıyor.'})
+    except Exception:
+        logger.exception("Stream hatası")
+        yield sse_event({'error': 'Bir hata oluştu.'})
+
+@app.route('/test-ai', methods=['POST'])
+def test_ai():
+    try:
+        data = request.get_json()
+        if not data or 'message' not in data:
+            return jsonify({'error': 'Mesaj bulunamadı'}), 400
+
+        if not OPENROUTER_API_KEY:
+            return jsonify({'error': 'AI servisi şu anda kullanılamıyor.'}), 500
+
+        user_id = request.remote_addr + request.headers.get('User-Agent', '')
+        fast_response = answer_without_llm(user_id, data['message'])
+        if fast_response is not None:
+            return jsonify(fast_response)
+        payload, cache_turns = build_chat_request(user_id, data['message'])
+        cached = cached_ai_response(cache_turns)
+        if cached is not None:
+            return jsonify({**finalize_ai_response(user_id, cached), 'cached': True})
+        chat_turns.inc('llm', 'open')
+
+        # Streaming modu - token'lar SSE ile tarayıcıya aktarılır
+        if data.get('stream'):
+            return Response(
+                stream_ai_response(user_id, payload, cache_turns),
+                mimetype='text/event-stream',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
+
+        with stage_timer('llm'):
+            response = llm_client.post(payload)
+        
+        if response.status_code == 200:
+            result = response.json()
+            if 'choices' in result and result['choices']:
+                ai_response = result['choices'][0]['message']['content']
+                remember_ai_response(cache_turns, ai_response)
+                return jsonify(finalize_ai_response(user_id, ai_response))
             else:
                 return jsonify({'error': 'AI yanıt alınamadı.'}), 500
         else:
@@ -542,10 +928,13 @@ Kurallar:
         return jsonify({'error': 'AI servisi yanıt vermiyor.'}), 500
     except requests.exceptions.ConnectionError:
         return jsonify({'error': 'AI servisine bağlanılamıyor.'}), 500
-    except Exception as e:
-        print(f"❌ DEBUG - Genel hata: {e}")
+    except Exception:
+        logger.exception("Genel hata")
         return jsonify({'error': 'Bir hata oluştu.'}), 500
 
+# Karşılama sabittir - yanıtın tamamı bir kez üretilir
+VOICE_GREETING = twiml.ASK.render("Hoşgeldiniz! Randevu almak için isim soyisminizi söyleyebilir misiniz?")
+
 @app.route('/voice', methods=['POST'])
 def voice():
     """Twilio webhook endpoint'i - Randevu Alma Sistemi"""
@@ -554,263 +943,87 @@ def voice():
         speech_result = request.values.get('SpeechResult', '')
         call_sid = request.values.get('CallSid', '')
         
-        if call_sid not in voice_sessions:
-            voice_sessions[call_sid] = {
-                'conversation_history': [],
-                'collected_info': {},
-                'step': 'greeting',
-                'caller': caller_number
-            }
-        
-        session = voice_sessions[call_sid]
-        response = VoiceResponse()
-        
+        session = voice_sessions.get(call_sid) or VoiceSession(caller_number)
         if not speech_result:
-            ai_response = "Hoşgeldiniz! Randevu almak için isim soyisminizi söyleyebilir misiniz?"
-            session['step'] = 'waiting_name'
+            session.step = 'waiting_name'
+            voice_sessions[call_sid] = session
+            return VOICE_GREETING
         else:
-            session['conversation_history'].append(speech_result)
+            session.conversation_history.append(speech_result)
             
             try:
-                extracted_info = extract_voice_info(speech_result, session['collected_info'])
+                extracted_info = extract_voice_info(speech_result, session.collected_info)
                 if extracted_info:
-                    session['collected_info'].update(extracted_info)
-                
-                print(f"🔄 DEBUG - Güncel toplam bilgiler: {session['collected_info']}")
-                
-                ai_response = get_next_question(session['collected_info'])
-                print(f"🤖 DEBUG - AI sorusu: '{ai_response}'")
+                    session.collected_info.update(extracted_info)
                 
-                appointment_complete = is_voice_appointment_complete(session['collected_info'])
-                print(f"✅ DEBUG - Randevu tamamlandı mı? {appointment_complete}")
+                notice = release_unavailable_slot(session.collected_info)
+                ai_response = notice + get_next_question(session.collected_info)
+                appointment_complete = is_voice_appointment_complete(session.collected_info)
+                logger.debug("Sesli oturum: bilgiler=%s tamam=%s soru=%r",
+                             session.collected_info, appointment_complete, ai_response)
                 
                 if appointment_complete:
-                    if 'phone' not in session['collected_info']:
+                    if 'phone' not in session.collected_info:
                         clean_phone = caller_number.replace('+90', '').replace('+', '')
-                        session['collected_info']['phone'] = clean_phone
+                        session.collected_info['phone'] = clean_phone
                     
-                    appointment = save_appointment(session['collected_info'].copy())
-                    ai_response = f"Harika! Randevunuz başarıyla oluşturuldu. Randevu numaranız: {appointment['id']}. Galeri ekibimiz size ulaşacak. İyi günler!"
-                    
-                    del voice_sessions[call_sid]
-                    
-                    response.say(ai_response, voice='Polly.Filiz', language='tr-TR')
-                    return str(response)
+                    try:
+                        appointment = save_appointment(session.collected_info.copy())
+                    except SlotUnavailable:
+                        # Kontrolden sonra başka bir arayan aynı saati almış
+                        session.collected_info.pop('time')
+                        ai_response = "Üzgünüm, bu saat az önce doldu. " + get_next_question(session.collected_info)
+                    else:
+                        logger.info("Randevu oluşturuldu", extra={'appointment_id': appointment['id'], 'source': 'voice'})
+                        ai_response = f"Harika! Randevunuz başarıyla oluşturuldu. Randevu numaranız: {appointment['id']}. Galeri ekibimiz size ulaşacak. İyi günler!"
+                        
+                        voice_sessions.pop(call_sid)
+                        
+                        return twiml.SAY.render(ai_response)
             
-            except Exception as e:
+            except Exception:
+                logger.exception("Sesli randevu adımı hatası")
                 ai_response = "Özür dilerim, sizi anlayamadım. Tekrar söyleyebilir misiniz?"
         
-        response.say(ai_response, voice='Polly.Filiz', language='tr-TR')
+        # Paylaşılan backend'de görünmesi için oturumu geri yaz
+        voice_sessions[call_sid] = session
         
-        if call_sid in voice_sessions:
-            gather = Gather(
-                input='speech',
-                timeout=8,
-                speechTimeout=4,
-                language='tr-TR',
-                action='/voice',
-                method='POST'
-            )
-            gather.say("Dinliyorum...", voice='Polly.Filiz', language='tr-TR')
-            response.append(gather)
-            
-            response.say(
-                "Sizi duymadım. Aramayı sonlandırıyorum. İyi günler!",
-                voice='Polly.Filiz',
-                language='tr-TR'
-            )
-        
-        return str(response)
+        # Soru + Gather + vedalaşma iskeleti hazır, sadece soru metni doldurulur
+        return twiml.ASK.render(ai_response)
         
     except Exception as e:
-        response = VoiceResponse()
-        response.say(
-            "Bir hata oluştu. Tekrar arayabilirsiniz.",
-            voice='Polly.Filiz',
-            language='tr-TR'
-        )
-        return str(response)
+        return twiml.ERROR
 
 def extract_voice_info(speech_text, existing_info):
     """Sesli konuşmadan randevu bilgilerini çıkar - İYİLEŞTİRİLMİŞ"""
-    info = {}
-    speech_lower = speech_text.lower()
-    
-    print(f"🎤 DEBUG - Sesli giriş: '{speech_text}'")
-    print(f"📊 DEBUG - Mevcut bilgiler: {existing_info}")
-    
     try:
-        # İSİM KONTROLÜ - BASIT VE ETKİLİ
-        if 'name' not in existing_info:
-            speech_clean = speech_text.strip()
-            words = speech_clean.split()
-            
-            # 2 veya 3 kelimeli isim - direkt al 
-            if 2 <= len(words) <= 3:
-                # Hepsi harf mi kontrol et
-                if all(word.replace("'", "").replace("ğ", "g").replace("ı", "i").replace("ş", "s").replace("ç", "c").replace("ö", "o").replace("ü", "u").isalpha() for word in words):
-                    # Her kelime en az 2 harf olsun
-                    if all(len(word) >= 2 for word in words):
-                        info['name'] = " ".join(word.title() for word in words)
-                        print(f"👤 DEBUG - İsim bulundu: {info['name']}")
-                        
-            # Tek kelime ama "ben mehmet" gibi pattern
-            elif len(words) > 3:
-                name_patterns = [
-                    r"(?:ben|ismim|adım)\s+([a-zA-ZçğıöşüÇĞİÖŞÜ\s]+)",
-                ]
-                for pattern in name_patterns:
-                    match = re.search(pattern, speech_text, re.IGNORECASE) 
-                    if match:
-                        name_part = match.group(1).strip().split()[:3] # max 3 kelime
-                        if len(name_part) >= 2:
-                            info['name'] = " ".join(word.title() for word in name_part)
-                            print(f"👤 DEBUG - Pattern ile isim: {info['name']}")
-                            break
-        
-        # Araç tipi kontrolü
-        if 'vehicle_type' not in existing_info:
-            try:
-                vehicle_keywords = {
-                    'otomobil': ['otomobil', 'araba', 'sedan', 'hatchback', 'binek'],
-                    'suv': ['suv', 'es u vi', 'esuvi', 's u v', 'sav', 'jeep', 'crossover'],
-                    'karavan': ['karavan', 'kamper', 'rv', 'motorhome']
-                }
-                
-                for vehicle_type, keywords in vehicle_keywords.items():
-                    for keyword in keywords:
-                        if keyword in speech_lower:
-                            info['vehicle_type'] = vehicle_type
-                            break
-                    if 'vehicle_type' in info:
-                        break
-            except Exception as e:
-                pass
-        
-        # TARİH KONTROLÜ - SADECE GÜN İSİMLERİ VE NET TARİH FORMATLARI
-        if 'date' not in existing_info:
-            try:
-                # Önce gün isimlerine bak (güvenli)
-                days = {
-                    'pazartesi': 0, 'salı': 1, 'çarşamba': 2, 'perşembe': 3, 
-                    'cuma': 4, 'cumartesi': 5, 'pazar': 6, 'yarın': -1
-                }
-                
-                for day_name, day_num in days.items():
-                    if day_name in speech_lower:
-                        from datetime import datetime, timedelta
-                        today = datetime.now()
-                        
-                        if day_name == 'yarın':
-                            target_date = today + timedelta(days=1)
-                        else:
-                            current_weekday = today.weekday()
-                            days_ahead = (day_num - current_weekday) % 7
-                            if days_ahead == 0:
-                                days_ahead = 7
-                            target_date = today + timedelta(days=days_ahead)
-                        
-                        info['date'] = target_date.strftime('%Y-%m-%d')
-                        print(f"📅 DEBUG - Gün ismi ile tarih: {day_name} -> {info['date']}")
-                        break
-                
-                # Sadece net tarih formatları (çok spesifik)
-                if 'date' not in info:
-                    date_patterns = [
-                        r"(\d{1,2})[./](\d{1,2})[./](\d{4})",  # 15/06/2025
-                        r"(\d{4})[./](\d{1,2})[./](\d{1,2})",  # 2025/06/15
-                        r"(\d{1,2})[./](\d{1,2})",  # 15/06 (bu yıl)
-                        r"(\d{1,2})\s+(\d{1,2})\s+(\d{4})",  # 8 06 2025 (sesli)
-                        r"(\d{1,2})\s+(\d{1,2})",  # 8 06 (bu yıl, sesli)
-                    ]
-                
-                    # Net tarih formatları
-                    for pattern in date_patterns:
-                        match = re.search(pattern, speech_text)
-                        if match:
-                            groups = match.groups()
-                            
-                            try:
-                                from datetime import datetime
-                                
-                                if len(groups) == 3:
-                                    # Yıl var
-                                    if len(groups[2]) == 4:  # Son grup yıl
-                                        day, month, year = int(groups[0]), int(groups[1]), int(groups[2])
-                                    else:  # İlk grup yıl
-                                        year, month, day = int(groups[0]), int(groups[1]), int(groups[2])
-                                else:
-                                    # Yıl yok - bu yılı kullan
-                                    day, month = int(groups[0]), int(groups[1])
-                                    year = datetime.now().year
-                                
-                                # Tarih geçerli mi kontrol et
-                                if 1 <= month <= 12 and 1 <= day <= 31:
-                                    date_obj = datetime(year, month, day)
-                                    info['date'] = date_obj.strftime('%Y-%m-%d')
-                                    print(f"📅 DEBUG - Slash formatı tarih bulundu: {info['date']}")
-                                    break
-                                    
-                            except (ValueError, IndexError):
-                                continue
-                            
-            except Exception as e:
-                pass
-        
-        # SAAT KONTROLÜ - BASIT VE ETKİLİ
-        if 'time' not in existing_info:
-            try:
-                time_patterns = [
-                    r"(\d{4})",  # 1400, 1430 gibi
-                    r"(\d{1,2}):(\d{2})",  # 14:30
-                    r"saat\s*(\d{1,2})",  # saat 14, saat 2
-                    r"(\d{1,2})\s*saat",  # 14 saat
-                    r"(\d{1,2})\s*buçuk",  # 14 buçuk
-                ]
-                
-                for pattern in time_patterns:
-                    match = re.search(pattern, speech_text)
-                    if match:
-                        try:
-                            groups = match.groups()
-                            
-                            # 4 haneli saat formatı (1400, 1430)
-                            if len(groups) == 1 and len(str(groups[0])) == 4:
-                                time_str = str(groups[0])
-                                hour = int(time_str[:2])
-                                minute = int(time_str[2:])
-                            # 2 gruplı format (14:30)
-                            elif len(groups) >= 2 and groups[1]:
-                                hour = int(groups[0])
-                                minute = int(groups[1])
-                            # Buçuk
-                            elif 'buçuk' in pattern:
-                                hour = int(groups[0])
-                                minute = 30
-                            # Tek saat (saat 14)
-                            else:
-                                hour = int(groups[0])
-                                minute = 0
-                            
-                            # Saat geçerli mi kontrol et (8-18 arası)
-                            if 8 <= hour <= 18 and 0 <= minute <= 59:
-                                info['time'] = f"{hour:02d}:{minute:02d}"
-                                print(f"🕐 DEBUG - Saat bulundu: {info['time']} (input: {speech_text})")
-                                break
-                        except (ValueError, IndexError):
-                            continue
-            except Exception as e:
-                pass
-    
-    except Exception as e:
+        with stage_timer('extraction'):
+            info = voice_extractor.extract(speech_text, skip=existing_info)
+    except Exception:
+        logger.exception("Sesli bilgi çıkarma hatası")
+        info = {}
         speech_clean = speech_text.strip()
         if len(speech_clean) > 1 and len(speech_clean) < 20:
             if all(c.isalpha() or c.isspace() for c in speech_clean):
                 info['name'] = speech_clean.title()
-    
-    print(f"📤 DEBUG - Çıkarılan bilgiler: {info}")
+
+    logger.debug("Sesli giriş: %r mevcut=%s çıkarılan=%s", speech_text, existing_info, info)
     return info
 
+def release_unavailable_slot(collected_info):
+    """Dolu saat ya da boş saati kalmamış gün seçildiyse o alanı sil, yeniden sorulsun"""
+    vehicle_type, date = collected_info.get('vehicle_type'), collected_info.get('date')
+    if not vehicle_type or not date:
+        return ""
+    slot_time = collected_info.get('time')
+    if slot_time and appointment_store.slot_count((date, slot_time, vehicle_type)) >= SLOT_CAPACITY:
+        collected_info.pop('time')
+        return f"Üzgünüm, saat {slot_time} dolu. "
+    if not slot_time and not next_free_slots(vehicle_type, date=date, limit=1):
+        collected_info.pop('date')
+        return "Üzgünüm, o gün için boş saat kalmadı. "
+    return ""
+
 def get_next_question(collected_info):
     """Kısa net sorular"""
     
@@ -825,6 +1038,9 @@ def get_next_question(collected_info):
             return "Hangi gün geleceksiniz? Pazartesi, Salı gibi gün söyleyin."
         
         elif 'time' not in collected_info or not collected_info.get('time'):
+            free = next_free_slots(collected_info['vehicle_type'], date=collected_info['date'], limit=3)
+            if free:
+                return f"Saat kaçta? Müsait saatler: {format_slots(free, with_date=False)}."
             return "Saat kaçta? Örneğin saat 14 veya saat 15 gibi."
         
         else:
@@ -838,76 +1054,120 @@ def is_voice_appointment_complete(collected_info):
     required_fields = ['name', 'vehicle_type', 'date', 'time']
     return all(field in collected_info and collected_info[field] for field in required_fields)
 
+# Test/benchmark ortamında Twilio API'si yerine yerel bir sunucu kullanılabilir
+TWILIO_API_URL = os.getenv('TWILIO_API_URL')
+
+def create_twilio_client(http_client=None):
+    """Twilio REST istemcisi - TWILIO_API_URL verilmişse o adrese gider"""
+    client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, http_client=http_client)
+    if TWILIO_API_URL:
+        client.api.base_url = TWILIO_API_URL.rstrip('/')
+    return client
+
+_twilio_clients = threading.local()
+
+def get_twilio_client():
+    """Thread başına Twilio istemcisi - her arama worker'ı kendi keep-alive bağlantısını yeniden kullanır
+
+    TwilioHttpClient her istekte last_request/last_response alanlarını yazar; thread'ler
+    arasında paylaşılırsa bu alanlar karışır. Worker thread'leri uzun ömürlü olduğundan
+    TLS bağlantısı yine her aramada yeniden kurulmaz.
+    """
+    client = getattr(_twilio_clients, 'client', None)
+    if client is None:
+        http_client = TwilioHttpClient(pool_connections=True, timeout=float(os.getenv('TWILIO_TIMEOUT', '15')))
+        client = _twilio_clients.client = create_twilio_client(http_client=http_client)
+    return client
+
+def call_params(to):
+    """Twilio giden arama parametreleri"""
+    return {
+        'url': VOICE_WEBHOOK_URL,
+        'to': to,
+        'from_': TWILIO_PHONE_NUMBER,
+        'timeout': 30
+    }
+
+def place_call(payload):
+    """İş kuyruğu handler'ı - giden aramayı başlat, randevuya call_sid yaz"""
+    try:
+        with stage_timer('twilio'):
+            call = get_twilio_client().calls.create(**call_params(payload['to']))
+    except TwilioRestException as e:
+        # 4xx (429 hariç) istek hatasıdır - tekrar denemek aynı sonucu verir
+        if e.status is not None and 400 <= e.status < 500 and e.status != 429:
+            raise PermanentJobError(f"Twilio {e.status}: {e.msg}") from e
+        raise
+
+    if payload.get('appointment_id'):
+        with stage_timer('storage_write'):
+            appointment_store.update(payload['appointment_id'], {'call_sid': call.sid, 'call_status': call.status})
+    logger.info("Arama başlatıldı", extra={'call_sid': call.sid, 'appointment_id': payload.get('appointment_id')})
+    return {'call_sid': call.sid, 'status': call.status}
+
+# Giden aramalar kalıcı kuyrukta, arka plan worker'larında yapılır
+call_queue = JobQueue(
+    os.getenv('CALL_QUEUE_DB', 'data/jobs.db'),
+    handlers={'call': place_call},
+    workers=int(os.getenv('CALL_WORKERS', '2')),
+    rate=float(os.getenv('TWILIO_CALLS_PER_SECOND', '1')),
+    max_attempts=int(os.getenv('CALL_MAX_ATTEMPTS', '5')),
+    backoff=float(os.getenv('CALL_RETRY_BACKOFF', '2'))
+)
+
+def build_callback_data(data):
+    """Geri arama talebini randevu kaydına çevir - eksik bilgi varsa None"""
+    required_fields = ['phone', 'vehicle_type']
+    if not data or not all(field in data for field in required_fields):
+        return None
+    
+    phone_number = data['phone'].replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
+    
+    if phone_number.startswith('0'):
+        phone_number = '90' + phone_number[1:]
+    elif phone_number.startswith('5'):
+        phone_number = '90' + phone_number
+    elif not phone_number.startswith('90'):
+        phone_number = '90' + phone_number
+    
+    return {
+        'name': data.get('name', 'Callback Talebi'),
+        'phone': phone_number,
+        'vehicle_type': data['vehicle_type'],
+        'date': datetime.now().strftime('%Y-%m-%d'),
+        'time': datetime.now().strftime('%H:%M'),
+        'vehicle_price': data.get('vehicle_price', 0),
+        'callback_requested': True
+    }
+
 @app.route('/make-call', methods=['GET'])
 def make_call():
-    """Twilio üzerinden arama başlat"""
+    """Twilio üzerinden arama başlat - arama kuyruğa alınır, durum /api/jobs/<id> ile izlenir"""
     try:
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-        
-        call = client.calls.create(
-            url="https://4a82-159-146-96-133.ngrok-free.app/voice",
-            to=MY_PHONE_NUMBER,
-            from_=TWILIO_PHONE_NUMBER,
-            timeout=30
-        )
-        
-        return jsonify({
-            "message": "Arama başlatıldı",
-            "call_sid": call.sid,
-            "status": call.status
-        })
+        job_id = call_queue.enqueue('call', {'to': MY_PHONE_NUMBER})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+    return jsonify({
+        "message": "Arama kuyruğa alındı",
+        "job_id": job_id,
+        "status": "queued"
+    }), 202
+
 @app.route('/request-callback', methods=['POST'])
 def request_callback():
-    """Geri arama talebi al ve müşteriyi ara"""
+    """Geri arama talebi al, müşteriyi arama işini kuyruğa ekle"""
     try:
-        data = request.get_json()
-        
-        required_fields = ['phone', 'vehicle_type']
-        if not all(field in data for field in required_fields):
+        callback_data = build_callback_data(request.get_json())
+        if not callback_data:
             return jsonify({'error': 'Eksik bilgi', 'success': False}), 400
         
-        phone_number = data['phone'].replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
-        
-        if phone_number.startswith('0'):
-            phone_number = '90' + phone_number[1:]
-        elif phone_number.startswith('5'):
-            phone_number = '90' + phone_number
-        elif not phone_number.startswith('90'):
-            phone_number = '90' + phone_number
-        
-        callback_data = {
-            'name': data.get('name', 'Callback Talebi'),
-            'phone': phone_number,
-            'vehicle_type': data['vehicle_type'],
-            'date': datetime.now().strftime('%Y-%m-%d'),
-            'time': datetime.now().strftime('%H:%M'),
-            'vehicle_price': data.get('vehicle_price', 0),
-            'callback_requested': True
-        }
-        
         saved_callback = save_appointment(callback_data)
         
         try:
-            client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-            
-            call = client.calls.create(
-                url="https://4a82-159-146-96-133.ngrok-free.app/voice",
-                to=phone_number,
-                from_=TWILIO_PHONE_NUMBER,
-                timeout=30
-            )
-            
-            return jsonify({
-                'success': True,
-                'message': 'Geri arama talebi alındı ve arama başlatıldı',
-                'callback_id': saved_callback['id'],
-                'call_sid': call.sid
-            })
-            
-        except Exception as call_error:
+            job_id = call_queue.enqueue('call', {'to': callback_data['phone'], 'appointment_id': saved_callback['id']})
+        except Exception:
+            logger.exception("Arama kuyruğa alınamadı")
             return jsonify({
                 'success': True,
                 'message': 'Geri arama talebi alındı, manuel arama yapılacak',
@@ -915,153 +1175,53 @@ def request_callback():
                 'note': 'Otomatik arama başlatılamadı'
             })
         
+        return jsonify({
+            'success': True,
+            'message': 'Geri arama talebi alındı, arama sıraya alındı',
+            'callback_id': saved_callback['id'],
+            'job_id': job_id
+        }), 202
+        
     except Exception as e:
         return jsonify({'error': 'Sistem hatası', 'success': False}), 500
 
+@app.route('/api/jobs/<int:job_id>')
+def job_status(job_id):
+    job = call_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'İş bulunamadı'}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/stats')
+def job_stats():
+    return jsonify(call_queue.stats())
+
+# Boyut gauge'ları toplama anında okunur - istek yolunda maliyeti yoktur
+metrics.gauge('galeri_sessions', 'Açık oturum sayısı',
+              lambda: {('conversations',): len(conversations), ('voice',): len(voice_sessions)}, ('store',))
+metrics.gauge('galeri_appointments', 'Randevu sayısı', lambda: {(): len(appointment_store)})
+def call_job_counts():
+    stats = call_queue.stats()
+    return {(status,): stats[status] for status in ('queued', 'running', 'done', 'failed')}
+
+metrics.gauge('galeri_call_jobs', 'Durum bazında arama işi sayısı', call_job_counts, ('status',))
+
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.expose(), content_type=METRICS_CONTENT_TYPE)
+
 def extract_appointment_from_single_message(message):
     """Tek mesajdan randevu bilgilerini çıkar - ESKİ BİLGİLERİ KULLANMA"""
     try:
-        import re
-        from datetime import datetime, timedelta
-        
-        appointment_info = {
-            'name': None,
-            'phone': None,
-            'vehicle_type': None,
-            'date': None,
-            'time': None
-        }
-        
-        message_lower = message.lower()
-        print(f"🔍 DEBUG - Tek mesaj analizi: '{message}'")
-        
-        # İSİM TESPİTİ 
-        name_patterns = [
-            r'([A-ZÇĞİÖŞÜ][a-zçğıöşü]+\s+[A-ZÇĞİÖŞÜ][a-zçğıöşü]+)',
-            r'([a-zA-ZçğıöşüÇĞİÖŞÜ]+\s+[a-zA-ZçğıöşüÇĞİÖŞÜ]+)',
-            r'isim.*?([a-zA-ZçğıöşüÇĞİÖŞÜ\s]+)',
-            r'ben\s+([a-zA-ZçğıöşüÇĞİÖŞÜ\s]+)',
-        ]
-        
-        # Önce mesajın başındaki kelimelerden isim arama
-        words = message.split()
-        if len(words) >= 2:
-            first_two_words = f"{words[0]} {words[1]}"
-            car_words = ['toyota', 'honda', 'volkswagen', 'mercedes', 'civic', 'corolla', 'golf', 'otomobil', 'suv', 'karavan', 'randevu', 'telefon', 'saat', 'yarın', 'pazartesi', 'salı', 'çarşamba', 'perşembe', 'cuma', 'cumartesi', 'pazar']
-            
-            # İlk iki kelime araba kelimesi değilse ve sadece harfse isim olabilir
-            if (not any(car in first_two_words.lower() for car in car_words) and 
-                re.match(r'^[a-zA-ZçğıöşüÇĞİÖŞÜ]+\s+[a-zA-ZçğıöşüÇĞİÖŞÜ]+$', first_two_words) and
-                len(first_two_words) > 4):
-                appointment_info['name'] = first_two_words.title()
-                print(f"👤 DEBUG - İsim bulundu (başta): {appointment_info['name']}")
-        
-        # Eğer bulunamadıysa pattern'lerle ara
-        if not appointment_info['name']:
-            for pattern in name_patterns:
-                matches = re.findall(pattern, message)
-                for match in matches:
-                    name = str(match).strip()
-                    car_words = ['toyota', 'honda', 'volkswagen', 'mercedes', 'civic', 'corolla', 'golf', 'otomobil', 'suv', 'karavan', 'randevu', 'telefon']
-                    
-                    if name and len(name) > 2 and len(name) < 30 and not any(car in name.lower() for car in car_words):
-                        if re.match(r'^[a-zA-ZçğıöşüÇĞİÖŞÜ\s]+$', name):
-                            appointment_info['name'] = name.title()
-                            print(f"👤 DEBUG - İsim bulundu (pattern): {appointment_info['name']}")
-                            break
-                if appointment_info['name']:
-                    break
-        
-        # TELEFON TESPİTİ
-        phone_patterns = [
-            r'(05\d{9})',
-            r'(5\d{9})',
-            r'(\d{11})',
-            r'(\d{10})',
-        ]
-        
-        for pattern in phone_patterns:
-            matches = re.findall(pattern, message)
-            for match in matches:
-                phone = str(match).strip()
-                if phone.isdigit() and len(phone) >= 10:
-                    appointment_info['phone'] = phone
-                    print(f"📞 DEBUG - Telefon bulundu: {appointment_info['phone']}")
-                    break
-            if appointment_info['phone']:
-                break
-        
-        # ARAÇ TİPİ TESPİTİ
-        vehicle_keywords = {
-            'otomobil': ['otomobil', 'sedan', 'araba'],
-            'suv': ['suv'],
-            'karavan': ['karavan', 'kamper']
-        }
-        
-        for vehicle_type, keywords in vehicle_keywords.items():
-            for keyword in keywords:
-                if keyword in message_lower:
-                    appointment_info['vehicle_type'] = vehicle_type
-                    print(f"🚗 DEBUG - Araç tipi bulundu: {vehicle_type}")
-                    break
-            if appointment_info['vehicle_type']:
-                break
-        
-        # TARİH TESPİTİ
-        if 'yarın' in message_lower:
-            tomorrow = datetime.now() + timedelta(days=1)
-            appointment_info['date'] = tomorrow.strftime('%Y-%m-%d')
-            print(f"📅 DEBUG - Yarın tarihi: {appointment_info['date']}")
-        else:
-            days = {
-                'pazartesi': 0, 'salı': 1, 'çarşamba': 2, 'perşembe': 3, 
-                'cuma': 4, 'cumartesi': 5, 'pazar': 6
-            }
-            
-            for day_name, day_num in days.items():
-                if day_name in message_lower:
-                    today = datetime.now()
-                    current_weekday = today.weekday()
-                    days_ahead = (day_num - current_weekday) % 7
-                    if days_ahead == 0:
-                        days_ahead = 7
-                    target_date = today + timedelta(days=days_ahead)
-                    appointment_info['date'] = target_date.strftime('%Y-%m-%d')
-                    print(f"📅 DEBUG - Gün ismi ile tarih: {day_name} -> {appointment_info['date']}")
-                    break
-        
-        # SAAT TESPİTİ
-        time_patterns = [
-            r'(\d{1,2}):(\d{2})',
-            r'saat\s*(\d{1,2})',
-            r'(\d{1,2})\s*saat'
-        ]
-        
-        for pattern in time_patterns:
-            matches = re.findall(pattern, message)
-            for match in matches:
-                try:
-                    if isinstance(match, tuple) and len(match) >= 2:
-                        hour = int(match[0])
-                        minute = int(match[1])
-                    else:
-                        hour = int(match)
-                        minute = 0
-                    
-                    if 8 <= hour <= 18:
-                        appointment_info['time'] = f"{hour:02d}:{minute:02d}"
-                        print(f"🕐 DEBUG - Saat bulundu: {appointment_info['time']}")
-                        break
-                except (ValueError, IndexError):
-                    continue
-            if appointment_info['time']:
-                break
-        
-        print(f"📋 DEBUG - FINAL tek mesaj bilgileri: {appointment_info}")
+        appointment_info = dict.fromkeys(APPOINTMENT_FIELDS)
+        with stage_timer('extraction'):
+            appointment_info.update(message_extractor.extract(message))
+
+        logger.debug("Tek mesaj: %r çıkarılan=%s", message, appointment_info)
         return appointment_info
-        
-    except Exception as e:
-        print(f"❌ DEBUG - Tek mesaj analiz hatası: {e}")
+
+    except Exception:
+        logger.exception("Tek mesaj analiz hatası")
         return None
 
 def check_single_message_completeness(appointment_info):
@@ -1075,15 +1235,18 @@ def check_single_message_completeness(appointment_info):
     has_date = appointment_info.get('date') and appointment_info.get('date') != None
     has_time = appointment_info.get('time') and appointment_info.get('time') != None
     
-    print(f"📊 DEBUG - Tek mesaj kontrol:")
-    print(f"  👤 İsim: {has_name} ({appointment_info.get('name')})")
-    print(f"  📞 Telefon: {has_phone} ({appointment_info.get('phone')})")
-    print(f"  🚗 Araç: {has_vehicle} ({appointment_info.get('vehicle_type')})")
-    print(f"  📅 Tarih: {has_date} ({appointment_info.get('date')})")
-    print(f"  🕐 Saat: {has_time} ({appointment_info.get('time')})")
+    logger.debug("Tek mesaj kontrol: isim=%s telefon=%s araç=%s tarih=%s saat=%s",
+                 bool(has_name), bool(has_phone), bool(has_vehicle), bool(has_date), bool(has_time))
     
     return has_name and has_phone and has_vehicle and has_date and has_time
 
+# Arama worker'ları uygulama yüklenince başlar: gunicorn'da ve lifespan'sız ASGI'de de önceki
+# çalışmadan kalan aramalar ilk yeni aramayı beklemez. app.run(debug=True) ile reloader'ın
+# dosya izleyen ana process'i worker başlatmaz, sadece istekleri sunan çocuk process başlatır.
+CALL_QUEUE_AUTOSTART = os.getenv('CALL_QUEUE_AUTOSTART', 'true').lower() == 'true'
+if CALL_QUEUE_AUTOSTART and not (__name__ == '__main__' and os.environ.get('WERKZEUG_RUN_MAIN') != 'true'):
+    call_queue.start()
+
 if __name__ == '__main__':
     init_database()
     app.run(host='0.0.0.0', debug=True) 
\ No newline at end of file
@@ -0,0 +1,381 @@
+"""
+Galeri AI Asistan - ASGI Giriş Noktası
+/test-ai asyncio üzerinde çalışır: LLM yanıtı beklenirken worker bloklanmaz,
+tek process yüzlerce açık konuşmayı taşıyabilir. Giden Twilio aramaları
+zaten arka plandaki iş kuyruğunda yapıldığından Flask route'larında kalır. Randevu değişiklik akışı da burada sunulur; açık
+dashboard sekmeleri thread tutmaz. Diğer tüm route'lar Flask uygulamasına
+devredilir.
+
+Çalıştırma:
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+"""
+
+import asyncio
+import io
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+import aiohttp
+
+import app as galeri
+from llm_client import AsyncLLMClient
+
+logger = logging.getLogger(__name__)
+
+
+def build_environ(scope, body):
+    """ASGI http scope'undan WSGI environ"""
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1')
+        if name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        elif name == 'content-type':
+            key = 'CONTENT_TYPE'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin-1')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+class ThreadPoolWsgiToAsgi:
+    """Flask route'larını ayrı bir thread havuzunda paralel çalıştıran WSGI -> ASGI köprüsü
+
+    asgiref'in WsgiToAsgi'si yerine kullanılır: WsgiToAsgi istekleri tek thread'de sıraya
+    sokar, istek başına ThreadSensitiveContext ile de keep-alive bağlantılarda
+    "CurrentThreadExecutor already quit" hatası verir. Yanıt parçaları loop'a
+    run_coroutine_threadsafe ile gönderilir; asyncio.to_thread çağrıları bu havuzu beklemez.
+    """
+
+    def __init__(self, wsgi_application, max_workers=40):
+        self.wsgi_application = wsgi_application
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='wsgi')
+
+    async def __call__(self, scope, receive, send):
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+
+        loop = asyncio.get_running_loop()
+
+        def sync_send(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        await loop.run_in_executor(self.executor, self.run, scope, bytes(body), sync_send)
+
+    def run(self, scope, body, sync_send):
+        """Executor thread'inde: WSGI uygulamasını çalıştır, yanıtı parça parça gönder"""
+        response_start = {}
+        started = False
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and started:
+                raise exc_info[1].with_traceback(exc_info[2])
+            response_start.update({
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+            })
+
+        result = self.wsgi_application(build_environ(scope, body), start_response)
+        try:
+            for chunk in result:
+                if not started:
+                    sync_send(response_start)
+                    started = True
+                if chunk:
+                    sync_send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            if not started:
+                sync_send(response_start)
+            sync_send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+
+wsgi_application = ThreadPoolWsgiToAsgi(galeri.app, max_workers=int(os.getenv('ASGI_WSGI_THREADS', '40')))
+
+async_llm_client = AsyncLLMClient(
+    galeri.OPENROUTER_URL,
+    headers=galeri.OPENROUTER_HEADERS,
+    pool_size=int(os.getenv('LLM_ASYNC_POOL_SIZE', '100')),
+    max_retries=int(os.getenv('LLM_MAX_RETRIES', '2')),
+    backoff=float(os.getenv('LLM_RETRY_BACKOFF', '0.5')),
+    timeout=float(os.getenv('LLM_TIMEOUT', '30')),
+    connect_timeout=float(os.getenv('LLM_CONNECT_TIMEOUT', '5'))
+)
+
+
+# =============================================
+# ASGI YARDIMCILARI
+# =============================================
+
+async def read_json(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            break
+    try:
+        return json.loads(body) if body else None
+    except ValueError:
+        return None
+
+
+async def send_json(send, data, status=200):
+    body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json; charset=utf-8'),
+            (b'content-length', str(len(body)).encode())
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def header(scope, name):
+    for key, value in scope.get('headers', []):
+        if key == name:
+            return value.decode('latin-1')
+    return ''
+
+
+# =============================================
+# ASYNC ROUTE'LAR
+# =============================================
+
+async def stream_ai_response(send, user_id, payload, cache_turns=None):
+    """OpenRouter token'larını SSE olarak aktar (app.stream_ai_response'un async hali)"""
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no')
+        ]
+    })
+
+    async def emit(data):
+        await send({'type': 'http.response.body', 'body': galeri.sse_event(data).encode('utf-8'), 'more_body': True})
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    first_token_ms = None
+    parts = []
+    pending = ""
+
+    try:
+        with galeri.stage_timer('llm'):
+            async with async_llm_client.post({**payload, "stream": True}) as response:
+                if response.status != 200:
+                    await emit({'error': 'AI servisi hatası.'})
+                else:
+                    async for line in response.content:
+                        done, token = galeri.parse_stream_line(line.strip())
+                        if done:
+                            break
+                        if not token:
+                            continue
+
+                        if first_token_ms is None:
+                            first_token_ms = round((loop.time() - started) * 1000, 1)
+                        parts.append(token)
+                        visible, pending = galeri.strip_trigger_for_stream(pending + token)
+                        if visible:
+                            await emit({'token': visible})
+
+                    if parts:
+                        await asyncio.to_thread(galeri.remember_ai_response, cache_turns, "".join(parts))
+                        response_data = await asyncio.to_thread(galeri.finalize_ai_response, user_id, "".join(parts))
+                        await emit({'done': True, 'ttft_ms': first_token_ms, **response_data})
+                    else:
+                        await emit({'error': 'AI yanıt alınamadı.'})
+
+    except asyncio.TimeoutError:
+        await emit({'error': 'AI servisi yanıt vermiyor.'})
+    except aiohttp.ClientError:
+        await emit({'error': 'AI servisine bağlanılamıyor.'})
+    except Exception:
+        logger.exception("Stream hatası")
+        await emit({'error': 'Bir hata oluştu.'})
+
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def test_ai(scope, receive, send):
+    data = await read_json(receive)
+    if not data or 'message' not in data:
+        return await send_json(send, {'error': 'Mesaj bulunamadı'}, 400)
+
+    client_host = (scope.get('client') or ('',))[0]
+    user_id = client_host + header(scope, b'user-agent')
+    try:
+        fast_response = await asyncio.to_thread(galeri.answer_without_llm, user_id, data['message'])
+        if fast_response is not None:
+            return await send_json(send, fast_response)
+        payload, cache_turns = await asyncio.to_thread(galeri.build_chat_request, user_id, data['message'])
+        cached = await asyncio.to_thread(galeri.cached_ai_response, cache_turns)
+        if cached is not None:
+            response_data = await asyncio.to_thread(galeri.finalize_ai_response, user_id, cached)
+            return await send_json(send, {**response_data, 'cached': True})
+        galeri.chat_turns.inc('llm', 'open')
+
+        if data.get('stream'):
+            return await stream_ai_response(send, user_id, payload, cache_turns)
+
+        with galeri.stage_timer('llm'):
+            async with async_llm_client.post(payload) as response:
+                if response.status != 200:
+                    return await send_json(send, {'error': 'AI servisi hatası.'}, 500)
+                result = await response.json(content_type=None)
+
+        if not result.get('choices'):
+            return await send_json(send, {'error': 'AI yanıt alınamadı.'}, 500)
+
+        ai_response = result['choices'][0]['message']['content']
+        await asyncio.to_thread(galeri.remember_ai_response, cache_turns, ai_response)
+        response_data = await asyncio.to_thread(galeri.finalize_ai_response, user_id, ai_response)
+        await send_json(send, response_data)
+
+    except asyncio.TimeoutError:
+        return await send_json(send, {'error': 'AI servisi yanıt vermiyor.'}, 500)
+    except aiohttp.ClientError:
+        return await send_json(send, {'error': 'AI servisine bağlanılamıyor.'}, 500)
+    except Exception:
+        logger.exception("Genel hata")
+        return await send_json(send, {'error': 'Bir hata oluştu.'}, 500)
+
+
+async def appointment_changes(scope, receive, send):
+    """Randevu değişiklik akışı (app.appointment_changes'in async hali) - sürüm sayacı yoklanır"""
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    try:
+        since = await asyncio.to_thread(galeri.parse_change_cursor,
+                                        header(scope, b'last-event-id') or query.get('since', [''])[0])
+    except ValueError:
+        return await send_json(send, {'error': 'Geçersiz imleç'}, 400)
+
+    disconnected = asyncio.Event()
+
+    async def watch_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        disconnected.set()
+
+    async def emit(text):
+        await send({'type': 'http.response.body', 'body': text.encode('utf-8'), 'more_body': True})
+
+    watcher = asyncio.create_task(watch_disconnect())
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no')
+        ]
+    })
+
+    store = galeri.appointment_store
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + galeri.CHANGE_FEED_MAX_AGE
+    last_sent = loop.time()
+    try:
+        await emit("retry: 3000\n\n")
+        while not disconnected.is_set() and loop.time() < deadline:
+            # version log'u senkronlar (os.stat, kuyruk okuma, kilit) - loop'ta çalışmamalı
+            if await asyncio.to_thread(getattr, store, 'version') != since:
+                text, since = await asyncio.to_thread(galeri.appointment_changes_since, since)
+                if text:
+                    await emit(text)
+                    last_sent = loop.time()
+            elif loop.time() - last_sent >= galeri.CHANGE_FEED_HEARTBEAT:
+                await emit(": ping\n\n")
+                last_sent = loop.time()
+            try:
+                await asyncio.wait_for(disconnected.wait(), store.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        watcher.cancel()
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+ASYNC_ROUTES = {
+    ('GET', '/api/appointments/changes'): appointment_changes,
+    ('POST', '/test-ai'): test_ai,
+}
+
+
+async def timed(handler, scope, receive, send):
+    """Async route'ları Flask route'larıyla aynı HTTP metriklerine yaz"""
+    started = time.perf_counter()
+
+    async def send_and_record(message):
+        await send(message)
+        if message['type'] == 'http.response.start':
+            galeri.record_request(scope['method'], scope['path'], message['status'], time.perf_counter() - started)
+
+    await handler(scope, receive, send_and_record)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            galeri.init_database()
+            galeri.call_queue.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await async_llm_client.close()
+            await asyncio.to_thread(galeri.call_queue.stop)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+
+    handler = ASYNC_ROUTES.get((scope.get('method'), scope.get('path')))
+    if handler is not None:
+        return await timed(handler, scope, receive, send)
+
+    await wsgi_application(scope, receive, send)
@@ -0,0 +1,145 @@
+"""
+Galeri AI Asistan - ASGI /test-ai Testleri
+LLM istemcisi sahte bir nesneyle değiştirilir; ağ bağlantısı gerekmez.
+"""
+
+import asyncio
+import contextlib
+import http.client
+import importlib
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+ENVIRONMENT = {
+    'OPENROUTER_API_KEY': 'test', 'TWILIO_ACCOUNT_SID': 'AC' + '0' * 32, 'TWILIO_AUTH_TOKEN': 'test',
+    'TWILIO_PHONE_NUMBER': 'test', 'MY_PHONE_NUMBER': 'test', 'LOG_LEVEL': 'WARNING',
+    'CHAT_FAST_PATH': 'false', 'RESPONSE_CACHE': 'false', 'CALL_QUEUE_AUTOSTART': 'false',
+}
+
+
+class FakeResponse:
+    def __init__(self, status=200, body=None, lines=()):
+        self.status = status
+        self.body = body
+        self.lines = lines
+
+    async def json(self, content_type=None):
+        return self.body
+
+    @property
+    def content(self):
+        async def iterate():
+            for line in self.lines:
+                yield line
+        return iterate()
+
+
+class FakeLLMClient:
+    def __init__(self, response):
+        self.response = response
+        self.payloads = []
+
+    @contextlib.asynccontextmanager
+    async def post(self, payload):
+        self.payloads.append(payload)
+        yield self.response
+
+
+@pytest.fixture(scope='module')
+def asgi(tmp_path_factory):
+    """app modülü geçici dizinde, sahte anahtarlarla yüklenir"""
+    saved_env, saved_cwd = dict(os.environ), os.getcwd()
+    os.environ.update(ENVIRONMENT)
+    os.chdir(tmp_path_factory.mktemp('galeri'))
+    try:
+        module = importlib.import_module('asgi')
+        module.galeri.init_database()
+        yield module
+    finally:
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+
+def call(asgi, body, user_agent):
+    """/test-ai'ye POST at, (durum, gövde) döndür"""
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': json.dumps(body).encode(), 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {'type': 'http', 'method': 'POST', 'path': '/test-ai', 'client': ('127.0.0.1', 1000),
+             'headers': [(b'user-agent', user_agent.encode())]}
+    asyncio.run(asgi.application(scope, receive, send))
+    return messages[0]['status'], b''.join(m.get('body', b'') for m in messages[1:]).decode()
+
+
+def test_json_response(asgi, monkeypatch):
+    """Test: Model yanıtı JSON olarak döner ve geçmişe yazılır"""
+    client = FakeLLMClient(FakeResponse(body={'choices': [{'message': {'content': 'Merhaba!'}}]}))
+    monkeypatch.setattr(asgi, 'async_llm_client', client)
+
+    status, body = call(asgi, {'message': 'Selam'}, 'json-test')
+    assert status == 200
+    assert json.loads(body)['response'] == 'Merhaba!'
+    assert client.payloads[0]['messages'][-1] == {'role': 'user', 'content': 'Selam'}
+
+
+def test_stream_response(asgi, monkeypatch):
+    """Test: Token'lar SSE olayları olarak akar, son olay done içerir"""
+    lines = [b'data: ' + json.dumps({'choices': [{'delta': {'content': token}}]}).encode() + b'\n'
+             for token in ('Mer', 'haba')] + [b'data: [DONE]\n']
+    monkeypatch.setattr(asgi, 'async_llm_client', FakeLLMClient(FakeResponse(lines=lines)))
+
+    status, body = call(asgi, {'message': 'Selam', 'stream': True}, 'stream-test')
+    events = [json.loads(line[6:]) for line in body.splitlines() if line.startswith('data: ')]
+    assert status == 200
+    assert [event.get('token') for event in events[:-1]] == ['Mer', 'haba']
+    assert events[-1]['done'] and events[-1]['response'] == 'Merhaba'
+
+
+def test_errors_end_with_error_event(asgi, monkeypatch):
+    """Test: Bozuk yanıt JSON'da 500, stream'de son error olayı olarak döner"""
+    monkeypatch.setattr(asgi, 'async_llm_client', FakeLLMClient(FakeResponse(body={'choices': [{}]})))
+    status, body = call(asgi, {'message': 'Selam'}, 'error-test')
+    assert status == 500 and 'error' in json.loads(body)
+
+    monkeypatch.setattr(asgi, 'async_llm_client', FakeLLMClient(FakeResponse(lines=[b'data: {bozuk\n'])))
+    status, body = call(asgi, {'message': 'Selam', 'stream': True}, 'error-test')
+    events = [json.loads(line[6:]) for line in body.splitlines() if line.startswith('data: ')]
+    assert status == 200 and 'error' in events[-1]
+
+
+def test_flask_routes_over_keep_alive(asgi):
+    """Test: Flask'a devredilen route'a tek keep-alive bağlantıdan ardışık istekler hatasız döner"""
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(asgi.application, host='127.0.0.1', port=port,
+                                           log_level='warning', lifespan='off'))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    try:
+        for _ in range(20):
+            connection.request('GET', '/api/appointments?limit=5')
+            response = connection.getresponse()
+            assert response.status == 200
+            assert 'items' in json.loads(response.read())
+    finally:
+        connection.close()
+        server.should_exit = True
+        thread.join(5)
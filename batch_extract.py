@@ -0,0 +1,160 @@
+"""
+Galeri AI Asistan - Toplu Randevu Bilgisi Çıkarımı
+Arşivlenmiş sohbet kayıtları ve arama dökümleri üzerinden randevu
+bilgilerini yeniden çıkarır. Girdi satır satır okunur, process havuzunda
+paralel işlenir ve sonuçlar girdi sırasıyla akış halinde yazılır; havuzda
+bekleyen kayıt sayısı sınırlı olduğundan dosyanın tamamı belleğe alınmaz.
+
+Girdi (JSONL, satır başına bir kayıt):
+    {"id": 1, "message": "Ahmet Yılmaz 0532... yarın saat 14 suv"}
+    {"id": 2, "conversation": [{"role": "user", "content": "..."}, ...]}
+    {"id": 3, "transcript": "saat 14", "existing": {"name": "Ahmet Yılmaz"}}
+İsteğe bağlı "timestamp" (ISO) alanı 'yarın', 'cuma' gibi göreli
+tarihlerin o güne göre çözülmesini sağlar.
+
+Çıktı (JSONL):
+    {"id": 1, "kind": "message", "fields": {...}, "missing": [], "complete": true}
+    {"line": 7, "error": "..."}
+
+Çalıştırma:
+    python batch_extract.py arsiv.jsonl -o sonuc.jsonl --processes 4
+    cat arsiv.jsonl | python batch_extract.py - > sonuc.jsonl
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from extractor import (APPOINTMENT_FIELDS, conversation_extractor, conversation_text, message_extractor,
+                       missing_fields, voice_extractor)
+
+VOICE_REQUIRED = ('name', 'vehicle_type', 'date', 'time')
+
+
+def record_kind(record):
+    if record.get('kind'):
+        return record['kind']
+    if 'conversation' in record:
+        return 'conversation'
+    if 'transcript' in record:
+        return 'voice'
+    return 'message'
+
+
+def extract_record(record, now=None):
+    """Tek kaydı çıkarıcıdan geçir, sonuç sözlüğü döndür"""
+    kind = record_kind(record)
+    if record.get('timestamp'):
+        now = datetime.fromisoformat(record['timestamp'].replace('Z', '+00:00'))
+
+    known = {}
+    required = APPOINTMENT_FIELDS
+    if kind == 'message':
+        fields = message_extractor.extract(record['message'], now=now)
+    elif kind == 'conversation':
+        history = [turn if isinstance(turn, dict) else {'role': 'user', 'content': turn}
+                   for turn in record['conversation']]
+        fields = conversation_extractor.extract(conversation_text(history), now=now)
+    elif kind == 'voice':
+        known = record.get('existing') or {}
+        fields = voice_extractor.extract(record['transcript'], skip=known, now=now)
+        required = VOICE_REQUIRED
+    else:
+        raise ValueError(f"bilinmeyen kayıt türü: {kind}")
+
+    missing = missing_fields({**known, **fields}, required)
+    return {'id': record.get('id'), 'kind': kind, 'fields': fields, 'missing': missing, 'complete': not missing}
+
+
+def _process_line(item):
+    """Havuz worker'ı: (satır no, ham satır, referans tarih) -> sonuç"""
+    line_no, line, now = item
+    try:
+        return extract_record(json.loads(line), now=now)
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        return {'line': line_no, 'error': f"{type(e).__name__}: {e}"}
+
+
+def _numbered(lines, now, gate=None, stop=None):
+    for line_no, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        if gate is not None:
+            gate.acquire()  # havuzda bekleyen kayıt sınırı - girdi okuması burada durur
+            if stop.is_set():
+                return
+        yield line_no, line, now
+
+
+def batch_extract(lines, processes=None, chunksize=64, now=None):
+    """JSONL satırlarını çıkarıcıdan geçir, sonuçları girdi sırasıyla üret
+
+    processes=1 ise havuz açılmaz. Aksi halde en fazla
+    processes * chunksize * 4 kayıt aynı anda bellekte bekler.
+    """
+    processes = processes or multiprocessing.cpu_count()
+    if processes == 1:
+        for item in _numbered(lines, now):
+            yield _process_line(item)
+        return
+
+    gate = threading.Semaphore(processes * chunksize * 4)
+    stop = threading.Event()
+    with multiprocessing.Pool(processes) as pool:
+        try:
+            for result in pool.imap(_process_line, _numbered(lines, now, gate, stop), chunksize):
+                gate.release()
+                yield result
+        finally:
+            # Erken çıkışta girdiyi besleyen thread'i serbest bırak, havuz kapanabilsin
+            stop.set()
+            gate.release()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='JSONL sohbet/arama kayıtlarından toplu randevu bilgisi çıkarımı')
+    parser.add_argument('input', help="girdi JSONL dosyası ('-' ise stdin)")
+    parser.add_argument('-o', '--output', help='çıktı JSONL dosyası (varsayılan stdout)')
+    parser.add_argument('--processes', type=int, default=None, help='worker process sayısı (varsayılan: çekirdek sayısı)')
+    parser.add_argument('--chunksize', type=int, default=64, help="worker'a tek seferde gönderilen kayıt sayısı")
+    parser.add_argument('--reference-date', help="timestamp'i olmayan kayıtlarda göreli tarihler için gün (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    now = datetime.fromisoformat(args.reference_date) if args.reference_date else None
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    target = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+
+    counts = {'records': 0, 'complete': 0, 'errors': 0}
+    started = time.perf_counter()
+    try:
+        for result in batch_extract(source, args.processes, args.chunksize, now):
+            counts['records'] += 1
+            if 'error' in result:
+                counts['errors'] += 1
+            elif result['complete']:
+                counts['complete'] += 1
+            target.write(json.dumps(result, ensure_ascii=False) + '\n')
+    except BrokenPipeError:
+        # Çıktı okuyan taraf kapandı (ör. '| head'); çıkışta tekrar hata verilmesin
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    elapsed = time.perf_counter() - started
+    rate = counts['records'] / elapsed if elapsed else 0.0
+    print(f"{counts['records']} kayıt, {counts['complete']} tam randevu, {counts['errors']} hata "
+          f"- {elapsed:.2f} sn ({rate:.0f} kayıt/sn)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
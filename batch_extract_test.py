@@ -0,0 +1,47 @@
+"""
+Galeri AI Asistan - Toplu Çıkarım Testleri
+"""
+
+import json
+
+from batch_extract import batch_extract, main
+
+RECORDS = [
+    {'id': 1, 'message': 'Ahmet Yılmaz 05321234567 yarın saat 14:00 suv', 'timestamp': '2025-06-11T10:00:00'},
+    {'id': 2, 'conversation': ['Mehmet Kaya', 'karavan istiyorum', '05059998877', 'cuma 11:30'],
+     'timestamp': '2025-06-11T10:00:00'},
+    {'id': 3, 'transcript': 'saat 14', 'existing': {'name': 'Ali Can', 'vehicle_type': 'suv', 'date': '2025-06-12'}},
+]
+
+
+def lines():
+    return [json.dumps(record, ensure_ascii=False) + '\n' for record in RECORDS] + ['\n', '{bozuk\n']
+
+
+def test_batch_results_in_order():
+    """Test: Sonuçlar girdi sırasıyla gelir, bozuk satır hata kaydı olur"""
+    results = list(batch_extract(lines(), processes=1))
+
+    assert [result.get('id') for result in results[:3]] == [1, 2, 3]
+    assert results[0]['fields']['date'] == '2025-06-12'
+    assert results[0]['complete'] is True
+    assert results[1]['fields']['date'] == '2025-06-13'
+    assert results[2] == {'id': 3, 'kind': 'voice', 'fields': {'time': '14:00'}, 'missing': [], 'complete': True}
+    assert results[3]['line'] == 5 and 'error' in results[3]
+
+
+def test_process_pool_matches_serial():
+    """Test: Process havuzu ile tek process aynı sonucu verir"""
+    many = lines()[:3] * 50
+    assert list(batch_extract(many, processes=2, chunksize=4)) == list(batch_extract(many, processes=1))
+
+
+def test_cli_writes_jsonl(tmp_path):
+    """Test: CLI girdi dosyasını okuyup JSONL çıktı yazar"""
+    source = tmp_path / 'arsiv.jsonl'
+    source.write_text(''.join(lines()), encoding='utf-8')
+    target = tmp_path / 'sonuc.jsonl'
+
+    assert main([str(source), '-o', str(target), '--processes', '1']) == 0
+    results = [json.loads(line) for line in target.read_text(encoding='utf-8').splitlines()]
+    assert len(results) == 4
@@ -0,0 +1,260 @@
+"""
+Galeri AI Asistan - Randevu Bilgisi Çıkarım Benchmark'ı
+Sohbet, tek mesaj ve sesli arama çıkarıcılarını etiketli bir derlem üzerinde
+çalıştırır. Her çıkarıcı için mesaj/sn, tracemalloc ile mesaj başına tepe
+bellek ve alan bazında doğruluk raporlanır. --baseline ile aynı derlem
+extractor.py öncesi kelime kelime arayan eski fonksiyonlardan
+(legacy_extraction.py) da geçirilir; eski satırlar '/eski' ekiyle, yeni
+satırlar hızlanma oranıyla basılır.
+
+Derlem iki kaynaktan oluşur:
+  gerçek   - benchmarks/extraction_corpus.jsonl (elle etiketlenmiş, STT dökümleri dahil)
+  sentetik - şablonlardan üretilen etiketli mesajlar (--synthetic adet, sabit seed)
+
+Tarih etiketleri: 'YYYY-MM-DD', '*-MM-DD' (bu yıl), 'yarın' veya gün adı.
+Etiketlenmeyen alanlar puanlanmaz; null etiket "çıkarılmamalı" demektir.
+
+Çalıştırma (proje kökünden):
+    python benchmarks/extraction_bench.py
+    python benchmarks/extraction_bench.py --synthetic 5000 --repeat 3 --min-accuracy 0.8
+    python benchmarks/extraction_bench.py --baseline
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# app modülü bu değişkenler olmadan yüklenmez; benchmark dış servis çağırmaz
+for name in ('OPENROUTER_API_KEY', 'TWILIO_ACCOUNT_SID', 'TWILIO_AUTH_TOKEN',
+             'TWILIO_PHONE_NUMBER', 'MY_PHONE_NUMBER'):
+    os.environ.setdefault(name, 'benchmark')
+os.environ.setdefault('CALL_QUEUE_AUTOSTART', 'false')  # arama worker'ları gerekmez
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'extraction_corpus.jsonl')
+os.chdir(tempfile.mkdtemp(prefix='galeri-bench-'))
+
+import app  # noqa: E402
+import legacy_extraction  # noqa: E402
+from extractor import APPOINTMENT_FIELDS, WEEKDAYS  # noqa: E402
+
+KINDS = ('message', 'conversation', 'voice')
+
+
+def run_entry(entry, module=app):
+    """Kaydı ilgili çıkarım fonksiyonundan geçir (app ya da legacy_extraction)"""
+    if entry['kind'] == 'message':
+        return module.extract_appointment_from_single_message(entry['text']) or {}
+    if entry['kind'] == 'conversation':
+        history = [{'role': 'user', 'content': turn} for turn in entry['turns']]
+        return module.extract_appointment_from_conversation(history) or {}
+    return module.extract_voice_info(entry['text'], entry.get('existing', {}))
+
+
+# =============================================
+# DERLEM
+# =============================================
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+FIRST_NAMES = ['Ahmet', 'Mehmet', 'Ayşe', 'Fatma', 'Zeynep', 'Emre', 'Can', 'Elif', 'Burak', 'Selin',
+               'Hakan', 'Merve', 'Deniz', 'Gökhan', 'Şule', 'Özge', 'İbrahim', 'Çağla']
+LAST_NAMES = ['Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Yıldız', 'Öztürk', 'Aydın', 'Arslan',
+              'Doğan', 'Koç', 'Kurt', 'Özkan', 'Polat', 'Güneş', 'Acar']
+VEHICLE_WORDS = {'otomobil': ['otomobil', 'sedan', 'araba'], 'suv': ['suv'], 'karavan': ['karavan', 'kamper']}
+VOICE_VEHICLE_WORDS = {'otomobil': ['araba', 'otomobil', 'binek'], 'suv': ['es u vi', 'jeep', 'suv'],
+                       'karavan': ['karavan', 'motorhome']}
+MESSAGE_TEMPLATES = [
+    "{name} {phone} {day} saat {hm} {vehicle} randevu",
+    "{name}, {phone}, {vehicle} için {day} {hm}",
+    "Randevu istiyorum: {name} {phone} {vehicle} {day} saat {hm}",
+    "{name} {phone} {vehicle} {day} {hm} uygun mu?",
+]
+CONVERSATION_TEMPLATES = [
+    ["{vehicle} modellerine bakıyorum", "{name}", "{phone}", "{day} {hm} olur"],
+    ["{name}", "{vehicle} için randevu", "telefonum {phone}", "{day} saat {hm}"],
+]
+VOICE_TURNS = [
+    ('name', "{name}"),
+    ('vehicle_type', "{vehicle} istiyorum"),
+    ('date', "{day} gelirim"),
+    ('time', "saat {hour}"),
+]
+
+
+def synthetic_corpus(count, seed=42):
+    """Şablonlardan etiketli mesajlar üret"""
+    rng = random.Random(seed)
+    corpus = []
+    while len(corpus) < count:
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        phone = '05' + ''.join(rng.choice('0123456789') for _ in range(9))
+        vehicle_type = rng.choice(list(VEHICLE_WORDS))
+        day = rng.choice(WEEKDAYS + ['yarın'])
+        hour, minute = rng.randint(8, 18), rng.choice([0, 15, 30, 45])
+        expected = {'name': name, 'phone': phone, 'vehicle_type': vehicle_type,
+                    'date': day, 'time': f"{hour:02d}:{minute:02d}"}
+        values = {'name': name, 'phone': phone, 'day': day, 'hm': f"{hour}:{minute:02d}", 'hour': hour}
+
+        values['vehicle'] = rng.choice(VEHICLE_WORDS[vehicle_type])
+        corpus.append({'kind': 'message', 'source': 'sentetik', 'expected': expected,
+                       'text': rng.choice(MESSAGE_TEMPLATES).format(**values)})
+        corpus.append({'kind': 'conversation', 'source': 'sentetik', 'expected': expected,
+                       'turns': [turn.format(**values) for turn in rng.choice(CONVERSATION_TEMPLATES)]})
+
+        # Sesli arama: her adımda bir alan sorulur, önceki alanlar biliniyor
+        values['vehicle'] = rng.choice(VOICE_VEHICLE_WORDS[vehicle_type])
+        existing = {}
+        for field, template in VOICE_TURNS:
+            value = expected[field] if field != 'time' else f"{hour:02d}:00"
+            corpus.append({'kind': 'voice', 'source': 'sentetik', 'text': template.format(**values),
+                           'existing': dict(existing), 'expected': {field: value}})
+            existing[field] = value
+    return corpus
+
+
+# =============================================
+# PUANLAMA
+# =============================================
+
+def resolve_date(label, now):
+    """Göreli tarih etiketini bugüne göre YYYY-MM-DD'ye çevir"""
+    if label is None or label[0].isdigit():
+        return label
+    if label.startswith('*-'):
+        return f"{now.year}{label[1:]}"
+    if label == 'yarın':
+        return (now + timedelta(days=1)).strftime('%Y-%m-%d')
+    days_ahead = (WEEKDAYS.index(label) - now.weekday()) % 7 or 7
+    return (now + timedelta(days=days_ahead)).strftime('%Y-%m-%d')
+
+
+def score(entries, predictions, now):
+    """Alan bazında doğru/toplam"""
+    fields = {field: [0, 0] for field in APPOINTMENT_FIELDS}
+    for entry, predicted in zip(entries, predictions):
+        for field, expected in entry['expected'].items():
+            if field == 'date':
+                expected = resolve_date(expected, now)
+            fields[field][1] += 1
+            if predicted.get(field) == expected:
+                fields[field][0] += 1
+    return {field: (correct / total if total else None, total) for field, (correct, total) in fields.items()}
+
+
+# =============================================
+# ÖLÇÜM
+# =============================================
+
+def measure_throughput(entries, repeat, module=app):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for entry in entries:
+            run_entry(entry, module)
+    elapsed = time.perf_counter() - started
+    return len(entries) * repeat / elapsed
+
+
+def measure_allocations(entries, module=app):
+    """Mesaj başına tracemalloc tepe belleği (ortalama, en yüksek) - byte"""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for entry in entries:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            run_entry(entry, module)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks), max(peaks)
+
+
+def measure(entries, repeat, now, module=app):
+    """Bir derlem diliminde doğruluk, throughput ve bellek ölçümü"""
+    predictions = [run_entry(entry, module) for entry in entries]
+    avg_peak, max_peak = measure_allocations(entries, module)
+    return {
+        'accuracy': score(entries, predictions, now),
+        'rate': measure_throughput(entries, repeat, module),
+        'avg_peak': avg_peak, 'max_peak': max_peak,
+    }
+
+
+def format_accuracy(value):
+    accuracy, total = value
+    return '-' if accuracy is None else f"{accuracy * 100:.0f}% ({total})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Randevu bilgisi çıkarım benchmark\'ı')
+    parser.add_argument('--synthetic', type=int, default=2000, help='üretilecek sentetik kayıt sayısı (yaklaşık)')
+    parser.add_argument('--repeat', type=int, default=3, help='throughput ölçümünde derlem tekrar sayısı')
+    parser.add_argument('--min-accuracy', type=float, default=0.0,
+                        help='gerçek derlemde herhangi bir alan bu oranın altındaysa çıkış kodu 1')
+    parser.add_argument('--json', help='sonuçları bu dosyaya JSON olarak yaz')
+    parser.add_argument('--baseline', action='store_true',
+                        help='eski kelime kelime arayan çıkarıcıları da ölç ve hızlanmayı raporla')
+    args = parser.parse_args()
+    output_path = os.path.abspath(os.path.join(ROOT, args.json)) if args.json else None
+
+    now = datetime.now()
+    corpus = [dict(entry, source='gerçek') for entry in load_corpus()] + synthetic_corpus(args.synthetic)
+    results = []
+    failed = False
+
+    implementations = [('yeni', app)] + ([('eski', legacy_extraction)] if args.baseline else [])
+    header = f"{'çıkarıcı':<18} {'kaynak':<9} {'kayıt':>6} {'mesaj/sn':>9} {'ort. KiB':>8} {'max KiB':>8}  "
+    print(header + '  '.join(f"{field:>12}" for field in APPOINTMENT_FIELDS)
+          + (f"  {'hızlanma':>8}" if args.baseline else ''))
+    for kind in KINDS:
+        for source in ('gerçek', 'sentetik'):
+            entries = [entry for entry in corpus if entry['kind'] == kind and entry['source'] == source]
+            if not entries:
+                continue
+            measured = {label: measure(entries, args.repeat, now, module) for label, module in implementations}
+            for label, _ in implementations:
+                row = measured[label]
+                accuracy = row['accuracy']
+                speedup = row['rate'] / measured['eski']['rate'] if args.baseline and label == 'yeni' else None
+                name = kind if label == 'yeni' else f"{kind}/{label}"
+
+                print(f"{name:<18} {source:<9} {len(entries):>6} {row['rate']:>9.0f} "
+                      f"{row['avg_peak'] / 1024:>8.1f} {row['max_peak'] / 1024:>8.1f}  "
+                      + '  '.join(f"{format_accuracy(accuracy[field]):>12}" for field in APPOINTMENT_FIELDS)
+                      + (f"  {speedup:>7.1f}x" if speedup else ''))
+                result = {
+                    'extractor': kind, 'implementation': label, 'source': source, 'entries': len(entries),
+                    'messages_per_sec': round(row['rate'], 1),
+                    'peak_bytes_avg': round(row['avg_peak']), 'peak_bytes_max': row['max_peak'],
+                    'accuracy': {field: value[0] for field, value in accuracy.items()}
+                }
+                if speedup:
+                    result['speedup'] = round(speedup, 2)
+                results.append(result)
+            # Doğruluk eşiği yalnızca yeni çıkarıcı için uygulanır
+            if source == 'gerçek' and any(value[0] is not None and value[0] < args.min_accuracy
+                                          for value in measured['yeni']['accuracy'].values()):
+                failed = True
+
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if failed:
+        print(f"HATA: gerçek derlemde doğruluğu %{args.min_accuracy * 100:.0f} altında kalan alan var")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
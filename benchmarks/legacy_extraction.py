@@ -0,0 +1,507 @@
+"""
+Galeri AI Asistan - Eski Randevu Çıkarıcıları (karşılaştırma için)
+extractor.py'ye geçilmeden önceki app.py fonksiyonları: kalıplar her çağrıda
+yeniden kurulur, araç ve gün kelimeleri tek tek 'kelime in metin' döngüsüyle
+aranır. Yalnızca extraction_bench.py --baseline tarafından kullanılır.
+Mantık aynen korunmuştur; sadece DEBUG print'leri çıkarıldı ki ölçüm stdout
+yazımını değil çıkarımı karşılaştırsın.
+"""
+
+import re
+
+
+def extract_appointment_from_conversation(conversation_history):
+    """Konuşma geçmişinden randevu bilgilerini çıkar"""
+    try:
+        import re
+        from datetime import datetime, timedelta
+
+        appointment_info = {
+            'name': None,
+            'phone': None,
+            'vehicle_type': None,
+            'date': None,
+            'time': None
+        }
+
+        # SADECE kullanıcı mesajlarını al - AI mesajlarını filtrele
+        user_messages = []
+        all_user_text = ""
+
+        for msg in conversation_history:
+            if msg.get('role') == 'user':
+                user_messages.append(msg['content'])
+                all_user_text += " " + msg['content'].lower()
+
+        # İSİM TESPİTİ
+        name_patterns = [
+            r'([A-ZÇĞİÖŞÜ][a-zçğıöşü]+\s+[A-ZÇĞİÖŞÜ][a-zçğıöşü]+)',
+            r'([a-zA-ZçğıöşüÇĞİÖŞÜ]+\s+[a-zA-ZçğıöşüÇĞİÖŞÜ]+)',
+            r'isim.*?([a-zA-ZçğıöşüÇĞİÖŞÜ\s]+)',
+            r'ben\s+([a-zA-ZçğıöşüÇĞİÖŞÜ\s]+)',
+        ]
+
+        # Önce mesajın başındaki kelimelerden isim arama
+        words = all_user_text.split()
+        if len(words) >= 2:
+            first_two_words = f"{words[0]} {words[1]}"
+            car_words = ['toyota', 'honda', 'volkswagen', 'mercedes', 'civic', 'corolla', 'golf', 'otomobil', 'suv', 'karavan', 'randevu', 'telefon', 'saat', 'yarın', 'pazartesi', 'salı', 'çarşamba', 'perşembe', 'cuma', 'cumartesi', 'pazar']
+
+            # İlk iki kelime araba kelimesi değilse ve sadece harfse isim olabilir
+            if (not any(car in first_two_words.lower() for car in car_words) and
+                re.match(r'^[a-zA-ZçğıöşüÇĞİÖŞÜ]+\s+[a-zA-ZçğıöşüÇĞİÖŞÜ]+$', first_two_words) and
+                len(first_two_words) > 4):
+                appointment_info['name'] = first_two_words.title()
+
+        # Eğer bulunamadıysa pattern'lerle ara
+        if not appointment_info['name']:
+            for pattern in name_patterns:
+                matches = re.findall(pattern, all_user_text)
+                for match in matches:
+                    name = str(match).strip()
+                    car_words = ['toyota', 'honda', 'volkswagen', 'mercedes', 'civic', 'corolla', 'golf', 'otomobil', 'suv', 'karavan', 'randevu', 'telefon']
+
+                    if name and len(name) > 2 and len(name) < 30 and not any(car in name.lower() for car in car_words):
+                        if re.match(r'^[a-zA-ZçğıöşüÇĞİÖŞÜ\s]+$', name):
+                            appointment_info['name'] = name.title()
+                            break
+                if appointment_info['name']:
+                    break
+
+        # TELEFON TESPİTİ - Kullanıcı mesajlarından
+        phone_patterns = [
+            r'\b(05\d{9})\b',
+            r'\b(5\d{9})\b',
+            r'\b(0\d{10})\b',
+            r'(\d{11})',
+            r'(\d{10})',
+            r'telefon.*?(\d{10,11})',
+            r'numara.*?(\d{10,11})',
+            r'(\d{3})\s*(\d{3})\s*(\d{4})',
+            r'(\d{3})\s*(\d{3})\s*(\d{2})\s*(\d{2})',
+        ]
+
+        for pattern in phone_patterns:
+            matches = re.findall(pattern, all_user_text)
+            for match in matches:
+                if isinstance(match, tuple):
+                    # Tuple ise birleştir
+                    phone = ''.join(match).strip()
+                else:
+                    phone = str(match).strip()
+
+                # Sadece rakamları al
+                phone = re.sub(r'[^\d]', '', phone)
+
+                if phone and phone.isdigit() and len(phone) >= 10:
+                    # 0 ile başlıyorsa 05 kontrolü
+                    if len(phone) == 11 and phone.startswith('0') and not phone.startswith('05'):
+                        continue
+                    # 10 haneli ise 5 ile başlamalı
+                    if len(phone) == 10 and not phone.startswith('5'):
+                        continue
+
+                    appointment_info['phone'] = phone
+                    break
+            if appointment_info['phone']:
+                break
+
+        # ARAÇ TİPİ TESPİTİ - Kullanıcı mesajlarından
+        vehicle_keywords = {
+            'otomobil': ['otomobil', 'sedan', 'corolla', 'civic', 'golf', 'araba', 'binek'],
+            'suv': ['suv', 'rav4', 'crv', 'cr-v', 'es u vi'],
+            'karavan': ['karavan', 'california', 'marco polo', 'kamper', 'marco', 'polo']
+        }
+
+        for vehicle_type, keywords in vehicle_keywords.items():
+            for keyword in keywords:
+                if keyword in all_user_text:
+                    appointment_info['vehicle_type'] = vehicle_type
+                    break
+            if appointment_info['vehicle_type']:
+                break
+
+        # TARİH TESPİTİ - Kullanıcı mesajlarından
+        date_patterns = [
+            r'\b(\d{1,2})[./](\d{1,2})[./](\d{4})\b',
+            r'\b(\d{4})[/-](\d{1,2})[/-](\d{1,2})\b'
+        ]
+
+        for pattern in date_patterns:
+            matches = re.findall(pattern, all_user_text)
+            for match in matches:
+                try:
+                    if len(str(match[2])) == 4:
+                        day, month, year = match
+                    else:
+                        year, month, day = match
+
+                    date_obj = datetime(int(year), int(month), int(day))
+                    appointment_info['date'] = date_obj.strftime('%Y-%m-%d')
+                    break
+                except ValueError:
+                    continue
+            if appointment_info['date']:
+                break
+
+        # Gün isimleri - Kullanıcı mesajlarından
+        if not appointment_info['date']:
+            days = {
+                'pazartesi': 0, 'salı': 1, 'çarşamba': 2, 'perşembe': 3,
+                'cuma': 4, 'cumartesi': 5, 'pazar': 6, 'yarın': 1
+            }
+
+            for day_name, day_num in days.items():
+                if day_name in all_user_text:
+                    today = datetime.now()
+                    if day_name == 'yarın':
+                        target_date = today + timedelta(days=1)
+                    else:
+                        current_weekday = today.weekday()
+                        days_ahead = (day_num - current_weekday) % 7
+                        if days_ahead == 0:
+                            days_ahead = 7
+                        target_date = today + timedelta(days=days_ahead)
+
+                    appointment_info['date'] = target_date.strftime('%Y-%m-%d')
+                    break
+
+        # SAAT TESPİTİ - Kullanıcı mesajlarından
+        time_patterns = [
+            r'\b(\d{1,2})[:.,-](\d{2})\b',
+            r'saat\s*(\d{1,2})\b',
+            r'\b(\d{1,2})\s*(?:saat|saatte)\b'
+        ]
+
+        for pattern in time_patterns:
+            matches = re.findall(pattern, all_user_text)
+            for match in matches:
+                try:
+                    if isinstance(match, tuple) and len(match) >= 2:
+                        hour = int(match[0])
+                        minute = int(match[1])
+                    else:
+                        hour = int(match)
+                        minute = 0
+
+                    if 8 <= hour <= 18:
+                        appointment_info['time'] = f"{hour:02d}:{minute:02d}"
+                        break
+                except (ValueError, IndexError):
+                    continue
+            if appointment_info['time']:
+                break
+
+        return appointment_info
+
+    except Exception:
+        return None
+
+
+def extract_voice_info(speech_text, existing_info):
+    """Sesli konuşmadan randevu bilgilerini çıkar - İYİLEŞTİRİLMİŞ"""
+    info = {}
+    speech_lower = speech_text.lower()
+
+    try:
+        # İSİM KONTROLÜ - BASIT VE ETKİLİ
+        if 'name' not in existing_info:
+            speech_clean = speech_text.strip()
+            words = speech_clean.split()
+
+            # 2 veya 3 kelimeli isim - direkt al
+            if 2 <= len(words) <= 3:
+                # Hepsi harf mi kontrol et
+                if all(word.replace("'", "").replace("ğ", "g").replace("ı", "i").replace("ş", "s").replace("ç", "c").replace("ö", "o").replace("ü", "u").isalpha() for word in words):
+                    # Her kelime en az 2 harf olsun
+                    if all(len(word) >= 2 for word in words):
+                        info['name'] = " ".join(word.title() for word in words)
+
+            # Tek kelime ama "ben mehmet" gibi pattern
+            elif len(words) > 3:
+                name_patterns = [
+                    r"(?:ben|ismim|adım)\s+([a-zA-ZçğıöşüÇĞİÖŞÜ\s]+)",
+                ]
+                for pattern in name_patterns:
+                    match = re.search(pattern, speech_text, re.IGNORECASE)
+                    if match:
+                        name_part = match.group(1).strip().split()[:3] # max 3 kelime
+                        if len(name_part) >= 2:
+                            info['name'] = " ".join(word.title() for word in name_part)
+                            break
+
+        # Araç tipi kontrolü
+        if 'vehicle_type' not in existing_info:
+            try:
+                vehicle_keywords = {
+                    'otomobil': ['otomobil', 'araba', 'sedan', 'hatchback', 'binek'],
+                    'suv': ['suv', 'es u vi', 'esuvi', 's u v', 'sav', 'jeep', 'crossover'],
+                    'karavan': ['karavan', 'kamper', 'rv', 'motorhome']
+                }
+
+                for vehicle_type, keywords in vehicle_keywords.items():
+                    for keyword in keywords:
+                        if keyword in speech_lower:
+                            info['vehicle_type'] = vehicle_type
+                            break
+                    if 'vehicle_type' in info:
+                        break
+            except Exception:
+                pass
+
+        # TARİH KONTROLÜ - SADECE GÜN İSİMLERİ VE NET TARİH FORMATLARI
+        if 'date' not in existing_info:
+            try:
+                # Önce gün isimlerine bak (güvenli)
+                days = {
+                    'pazartesi': 0, 'salı': 1, 'çarşamba': 2, 'perşembe': 3,
+                    'cuma': 4, 'cumartesi': 5, 'pazar': 6, 'yarın': -1
+                }
+
+                for day_name, day_num in days.items():
+                    if day_name in speech_lower:
+                        from datetime import datetime, timedelta
+                        today = datetime.now()
+
+                        if day_name == 'yarın':
+                            target_date = today + timedelta(days=1)
+                        else:
+                            current_weekday = today.weekday()
+                            days_ahead = (day_num - current_weekday) % 7
+                            if days_ahead == 0:
+                                days_ahead = 7
+                            target_date = today + timedelta(days=days_ahead)
+
+                        info['date'] = target_date.strftime('%Y-%m-%d')
+                        break
+
+                # Sadece net tarih formatları (çok spesifik)
+                if 'date' not in info:
+                    date_patterns = [
+                        r"(\d{1,2})[./](\d{1,2})[./](\d{4})",  # 15/06/2025
+                        r"(\d{4})[./](\d{1,2})[./](\d{1,2})",  # 2025/06/15
+                        r"(\d{1,2})[./](\d{1,2})",  # 15/06 (bu yıl)
+                        r"(\d{1,2})\s+(\d{1,2})\s+(\d{4})",  # 8 06 2025 (sesli)
+                        r"(\d{1,2})\s+(\d{1,2})",  # 8 06 (bu yıl, sesli)
+                    ]
+
+                    # Net tarih formatları
+                    for pattern in date_patterns:
+                        match = re.search(pattern, speech_text)
+                        if match:
+                            groups = match.groups()
+
+                            try:
+                                from datetime import datetime
+
+                                if len(groups) == 3:
+                                    # Yıl var
+                                    if len(groups[2]) == 4:  # Son grup yıl
+                                        day, month, year = int(groups[0]), int(groups[1]), int(groups[2])
+                                    else:  # İlk grup yıl
+                                        year, month, day = int(groups[0]), int(groups[1]), int(groups[2])
+                                else:
+                                    # Yıl yok - bu yılı kullan
+                                    day, month = int(groups[0]), int(groups[1])
+                                    year = datetime.now().year
+
+                                # Tarih geçerli mi kontrol et
+                                if 1 <= month <= 12 and 1 <= day <= 31:
+                                    date_obj = datetime(year, month, day)
+                                    info['date'] = date_obj.strftime('%Y-%m-%d')
+                                    break
+
+                            except (ValueError, IndexError):
+                                continue
+
+            except Exception:
+                pass
+
+        # SAAT KONTROLÜ - BASIT VE ETKİLİ
+        if 'time' not in existing_info:
+            try:
+                time_patterns = [
+                    r"(\d{4})",  # 1400, 1430 gibi
+                    r"(\d{1,2}):(\d{2})",  # 14:30
+                    r"saat\s*(\d{1,2})",  # saat 14, saat 2
+                    r"(\d{1,2})\s*saat",  # 14 saat
+                    r"(\d{1,2})\s*buçuk",  # 14 buçuk
+                ]
+
+                for pattern in time_patterns:
+                    match = re.search(pattern, speech_text)
+                    if match:
+                        try:
+                            groups = match.groups()
+
+                            # 4 haneli saat formatı (1400, 1430)
+                            if len(groups) == 1 and len(str(groups[0])) == 4:
+                                time_str = str(groups[0])
+                                hour = int(time_str[:2])
+                                minute = int(time_str[2:])
+                            # 2 gruplı format (14:30)
+                            elif len(groups) >= 2 and groups[1]:
+                                hour = int(groups[0])
+                                minute = int(groups[1])
+                            # Buçuk
+                            elif 'buçuk' in pattern:
+                                hour = int(groups[0])
+                                minute = 30
+                            # Tek saat (saat 14)
+                            else:
+                                hour = int(groups[0])
+                                minute = 0
+
+                            # Saat geçerli mi kontrol et (8-18 arası)
+                            if 8 <= hour <= 18 and 0 <= minute <= 59:
+                                info['time'] = f"{hour:02d}:{minute:02d}"
+                                break
+                        except (ValueError, IndexError):
+                            continue
+            except Exception:
+                pass
+
+    except Exception:
+        speech_clean = speech_text.strip()
+        if len(speech_clean) > 1 and len(speech_clean) < 20:
+            if all(c.isalpha() or c.isspace() for c in speech_clean):
+                info['name'] = speech_clean.title()
+
+    return info
+
+
+def extract_appointment_from_single_message(message):
+    """Tek mesajdan randevu bilgilerini çıkar - ESKİ BİLGİLERİ KULLANMA"""
+    try:
+        import re
+        from datetime import datetime, timedelta
+
+        appointment_info = {
+            'name': None,
+            'phone': None,
+            'vehicle_type': None,
+            'date': None,
+            'time': None
+        }
+
+        message_lower = message.lower()
+
+        # İSİM TESPİTİ
+        name_patterns = [
+            r'([A-ZÇĞİÖŞÜ][a-zçğıöşü]+\s+[A-ZÇĞİÖŞÜ][a-zçğıöşü]+)',
+            r'([a-zA-ZçğıöşüÇĞİÖŞÜ]+\s+[a-zA-ZçğıöşüÇĞİÖŞÜ]+)',
+            r'isim.*?([a-zA-ZçğıöşüÇĞİÖŞÜ\s]+)',
+            r'ben\s+([a-zA-ZçğıöşüÇĞİÖŞÜ\s]+)',
+        ]
+
+        # Önce mesajın başındaki kelimelerden isim arama
+        words = message.split()
+        if len(words) >= 2:
+            first_two_words = f"{words[0]} {words[1]}"
+            car_words = ['toyota', 'honda', 'volkswagen', 'mercedes', 'civic', 'corolla', 'golf', 'otomobil', 'suv', 'karavan', 'randevu', 'telefon', 'saat', 'yarın', 'pazartesi', 'salı', 'çarşamba', 'perşembe', 'cuma', 'cumartesi', 'pazar']
+
+            # İlk iki kelime araba kelimesi değilse ve sadece harfse isim olabilir
+            if (not any(car in first_two_words.lower() for car in car_words) and
+                re.match(r'^[a-zA-ZçğıöşüÇĞİÖŞÜ]+\s+[a-zA-ZçğıöşüÇĞİÖŞÜ]+$', first_two_words) and
+                len(first_two_words) > 4):
+                appointment_info['name'] = first_two_words.title()
+
+        # Eğer bulunamadıysa pattern'lerle ara
+        if not appointment_info['name']:
+            for pattern in name_patterns:
+                matches = re.findall(pattern, message)
+                for match in matches:
+                    name = str(match).strip()
+                    car_words = ['toyota', 'honda', 'volkswagen', 'mercedes', 'civic', 'corolla', 'golf', 'otomobil', 'suv', 'karavan', 'randevu', 'telefon']
+
+                    if name and len(name) > 2 and len(name) < 30 and not any(car in name.lower() for car in car_words):
+                        if re.match(r'^[a-zA-ZçğıöşüÇĞİÖŞÜ\s]+$', name):
+                            appointment_info['name'] = name.title()
+                            break
+                if appointment_info['name']:
+                    break
+
+        # TELEFON TESPİTİ
+        phone_patterns = [
+            r'(05\d{9})',
+            r'(5\d{9})',
+            r'(\d{11})',
+            r'(\d{10})',
+        ]
+
+        for pattern in phone_patterns:
+            matches = re.findall(pattern, message)
+            for match in matches:
+                phone = str(match).strip()
+                if phone.isdigit() and len(phone) >= 10:
+                    appointment_info['phone'] = phone
+                    break
+            if appointment_info['phone']:
+                break
+
+        # ARAÇ TİPİ TESPİTİ
+        vehicle_keywords = {
+            'otomobil': ['otomobil', 'sedan', 'araba'],
+            'suv': ['suv'],
+            'karavan': ['karavan', 'kamper']
+        }
+
+        for vehicle_type, keywords in vehicle_keywords.items():
+            for keyword in keywords:
+                if keyword in message_lower:
+                    appointment_info['vehicle_type'] = vehicle_type
+                    break
+            if appointment_info['vehicle_type']:
+                break
+
+        # TARİH TESPİTİ
+        if 'yarın' in message_lower:
+            tomorrow = datetime.now() + timedelta(days=1)
+            appointment_info['date'] = tomorrow.strftime('%Y-%m-%d')
+        else:
+            days = {
+                'pazartesi': 0, 'salı': 1, 'çarşamba': 2, 'perşembe': 3,
+                'cuma': 4, 'cumartesi': 5, 'pazar': 6
+            }
+
+            for day_name, day_num in days.items():
+                if day_name in message_lower:
+                    today = datetime.now()
+                    current_weekday = today.weekday()
+                    days_ahead = (day_num - current_weekday) % 7
+                    if days_ahead == 0:
+                        days_ahead = 7
+                    target_date = today + timedelta(days=days_ahead)
+                    appointment_info['date'] = target_date.strftime('%Y-%m-%d')
+                    break
+
+        # SAAT TESPİTİ
+        time_patterns = [
+            r'(\d{1,2}):(\d{2})',
+            r'saat\s*(\d{1,2})',
+            r'(\d{1,2})\s*saat'
+        ]
+
+        for pattern in time_patterns:
+            matches = re.findall(pattern, message)
+            for match in matches:
+                try:
+                    if isinstance(match, tuple) and len(match) >= 2:
+                        hour = int(match[0])
+                        minute = int(match[1])
+                    else:
+                        hour = int(match)
+                        minute = 0
+
+                    if 8 <= hour <= 18:
+                        appointment_info['time'] = f"{hour:02d}:{minute:02d}"
+                        break
+                except (ValueError, IndexError):
+                    continue
+            if appointment_info['time']:
+                break
+
+        return appointment_info
+
+    except Exception:
+        return None
@@ -0,0 +1,248 @@
+"""
+Galeri AI Asistan - Yük Testi
+Uygulamayı yerel sahte OpenRouter ve Twilio sunucularına bağlı olarak
+başlatır, artan eşzamanlılıkta hot path'leri çalıştırır ve her senaryo için
+throughput ile p50/p95/p99 gecikmesini raporlar. İnternet bağlantısı ya da
+gerçek API anahtarı gerekmez; veriler geçici bir dizine yazılır.
+
+Çalıştırma (proje kökünden):
+    python benchmarks/load_bench.py
+    python benchmarks/load_bench.py --server asgi --concurrency 1,8,32 --requests 300
+    python benchmarks/load_bench.py --scenarios voice,appointments --json sonuc.json
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import mock_services  # noqa: E402
+
+CHAT_MESSAGES = [
+    "Merhaba, SUV modelleriniz neler?",
+    "Toyota Corolla'nın fiyatı ne kadar?",
+    "Ahmet Yılmaz 05321234567 yarın saat 14:00 otomobil için randevu istiyorum",
+]
+VOICE_SCRIPT = ["", "Ahmet Yılmaz", "suv istiyorum", "yarın gelirim", "saat 14"]
+
+
+# =============================================
+# UYGULAMAYI BAŞLATMA
+# =============================================
+
+def configure_environment(openrouter, twilio):
+    """app modülü yüklenmeden önce sahte servis adreslerini ayarla"""
+    os.environ['OPENROUTER_API_URL'] = f'http://127.0.0.1:{openrouter.server_port}/api/v1/chat/completions'
+    os.environ['TWILIO_API_URL'] = f'http://127.0.0.1:{twilio.server_port}'
+    for name in ('OPENROUTER_API_KEY', 'TWILIO_AUTH_TOKEN', 'TWILIO_PHONE_NUMBER', 'MY_PHONE_NUMBER'):
+        os.environ.setdefault(name, 'loadtest')
+    os.environ.setdefault('TWILIO_ACCOUNT_SID', 'AC' + '0' * 32)
+    os.environ.setdefault('VOICE_WEBHOOK_URL', 'http://127.0.0.1/voice')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    # Örnek mesajlar kural yolundan veya yanıt önbelleğinden dönerdi - LLM yolu ölçülsün
+    os.environ.setdefault('CHAT_FAST_PATH', 'false')
+    os.environ.setdefault('RESPONSE_CACHE', 'false')
+    os.chdir(tempfile.mkdtemp(prefix='galeri-load-'))
+
+
+def start_wsgi():
+    from werkzeug.serving import make_server
+
+    import app as galeri
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)  # istek başına erişim logu yazma
+    galeri.init_database()
+    server = make_server('127.0.0.1', 0, galeri.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}'
+
+
+def start_asgi():
+    import socket
+
+    import uvicorn
+
+    import asgi
+
+    # Boş port bul; uvicorn'a hazır soket verilirse TCP_NODELAY ayarlanmıyor (+40 ms)
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(asgi.application, host='127.0.0.1', port=port,
+                                           log_level='warning', lifespan='on'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f'http://127.0.0.1:{port}'
+
+
+# =============================================
+# SENARYOLAR
+# =============================================
+
+class Worker:
+    """Eşzamanlı kullanıcılardan biri - kendi HTTP oturumu ve kimliği vardır"""
+
+    def __init__(self, base_url, worker_id):
+        self.base_url = base_url
+        self.worker_id = worker_id
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = f'loadtest-{worker_id}'
+        self.turns = itertools.cycle(VOICE_SCRIPT)
+        self.messages = itertools.cycle(CHAT_MESSAGES)
+        self.calls = itertools.count()
+        self.call_sid = None
+
+    def test_ai(self):
+        return self.session.post(f'{self.base_url}/test-ai', json={'message': next(self.messages)})
+
+    def test_ai_stream(self):
+        response = self.session.post(f'{self.base_url}/test-ai', json={'message': next(self.messages), 'stream': True},
+                                     stream=True)
+        for _ in response.iter_lines(chunk_size=None):
+            pass
+        return response
+
+    def voice(self):
+        """Twilio webhook'unu taklit et: her çağrı bir arama adımı"""
+        speech = next(self.turns)
+        if not speech:
+            self.call_sid = f'CA-load-{self.worker_id}-{next(self.calls)}'
+        return self.session.post(f'{self.base_url}/voice', data={
+            'CallSid': self.call_sid,
+            'From': '+905321234567',
+            'SpeechResult': speech
+        })
+
+    def appointments(self):
+        return self.session.get(f'{self.base_url}/api/appointments')
+
+    def request_callback(self):
+        return self.session.post(f'{self.base_url}/request-callback', json={
+            'name': 'Yük Testi',
+            'phone': '0532 123 45 67',
+            'vehicle_type': 'suv'
+        })
+
+
+SCENARIOS = {
+    'test-ai': Worker.test_ai,
+    'test-ai-stream': Worker.test_ai_stream,
+    'voice': Worker.voice,
+    'appointments': Worker.appointments,
+    'request-callback': Worker.request_callback,
+}
+
+
+# =============================================
+# ÖLÇÜM
+# =============================================
+
+def percentile(sorted_values, pct):
+    """En yakın sıra yöntemiyle yüzdelik"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def run_level(base_url, scenario, concurrency, total):
+    """total isteği concurrency kadar worker'a dağıt, sonuç özetini döndür"""
+    action = SCENARIOS[scenario]
+    workers = [Worker(base_url, f'{scenario}-{concurrency}-{i}') for i in range(concurrency)]
+    per_worker = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def run(worker, count):
+        local, failed = [], 0
+        for _ in range(count):
+            started = time.perf_counter()
+            try:
+                response = action(worker)
+                if response.status_code >= 400:
+                    failed += 1
+            except requests.RequestException:
+                failed += 1
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for worker, count in zip(workers, per_worker):
+            pool.submit(run, worker, count)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'scenario': scenario,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors[0],
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+    }
+
+
+def print_row(result):
+    print(f"{result['scenario']:<17} {result['concurrency']:>5} {result['requests']:>6} {result['errors']:>5} "
+          f"{result['throughput_rps']:>9} {result['p50_ms']:>9} {result['p95_ms']:>9} {result['p99_ms']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Galeri AI Asistan yük testi')
+    parser.add_argument('--server', choices=['wsgi', 'asgi'], default='wsgi')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--concurrency', default='1,4,16,32', help='virgülle ayrılmış eşzamanlılık seviyeleri')
+    parser.add_argument('--requests', type=int, default=200, help='her seviyede toplam istek')
+    parser.add_argument('--llm-latency', type=float, default=0.2, help='sahte LLM ilk yanıt gecikmesi (sn)')
+    parser.add_argument('--token-rate', type=float, default=200.0, help='sahte LLM token/sn')
+    parser.add_argument('--twilio-latency', type=float, default=0.05, help='sahte Twilio API gecikmesi (sn)')
+    parser.add_argument('--json', help='sonuçları bu dosyaya JSON olarak yaz')
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"bilinmeyen senaryo: {', '.join(unknown)}")
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    openrouter = mock_services.start_openrouter(args.llm_latency, args.token_rate)
+    twilio = mock_services.start_twilio(args.twilio_latency)
+    output_path = os.path.abspath(args.json) if args.json else None
+    configure_environment(openrouter, twilio)
+    base_url = start_asgi() if args.server == 'asgi' else start_wsgi()
+
+    print(f"sunucu={args.server} llm_gecikme={args.llm_latency}s token_hızı={args.token_rate}/s "
+          f"twilio_gecikme={args.twilio_latency}s")
+    print(f"{'senaryo':<17} {'eşz.':>5} {'istek':>6} {'hata':>5} {'istek/sn':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+
+    results = []
+    for scenario in scenarios:
+        for level in levels:
+            result = run_level(base_url, scenario, level, max(args.requests, level))
+            print_row(result)
+            results.append(result)
+
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({'server': args.server, 'args': vars(args), 'results': results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Galeri AI Asistan - Loglama Mikro Benchmark'ı
+Randevu çıkarım yolunu (tek mesaj + tamamlanma kontrolü) üç şekilde ölçer:
+  legacy   - eski print(f"... DEBUG ...") satırları (stdout /dev/null'a)
+  info     - LOG_LEVEL=INFO: debug çağrıları kayıt bile oluşturmaz
+  debug    - LOG_LEVEL=DEBUG: kayıtlar kuyruğa atılır, yazma ayrı thread'de
+
+Çalıştırma (proje kökünden):
+    python benchmarks/logging_bench.py [tekrar]
+"""
+
+import contextlib
+import logging
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# app modülü bu değişkenler olmadan yüklenmez; benchmark dış servis çağırmaz
+for name in ('OPENROUTER_API_KEY', 'TWILIO_ACCOUNT_SID', 'TWILIO_AUTH_TOKEN',
+             'TWILIO_PHONE_NUMBER', 'MY_PHONE_NUMBER'):
+    os.environ.setdefault(name, 'benchmark')
+os.environ.setdefault('CALL_QUEUE_AUTOSTART', 'false')  # arama worker'ları gerekmez
+os.chdir(tempfile.mkdtemp(prefix='galeri-bench-'))
+
+import app  # noqa: E402
+from extractor import APPOINTMENT_FIELDS, message_extractor  # noqa: E402
+from logging_config import setup_logging, stop_logging  # noqa: E402
+
+MESSAGE = "Ahmet Yılmaz 05321234567 yarın saat 14:00 suv randevu istiyorum"
+
+
+def legacy_extract(message):
+    """Eski sürümdeki print satırlarıyla aynı çıkarım"""
+    print(f"🔍 DEBUG - Tek mesaj analizi: '{message}'")
+    info = dict.fromkeys(APPOINTMENT_FIELDS)
+    info.update(message_extractor.extract(message))
+    print(f"📞 DEBUG - Telefon bulundu: {info['phone']}")
+    print(f"🚗 DEBUG - Araç tipi bulundu: {info['vehicle_type']}")
+    print(f"📅 DEBUG - Yarın tarihi: {info['date']}")
+    print(f"🕐 DEBUG - Saat bulundu: {info['time']}")
+    print(f"📋 DEBUG - FINAL tek mesaj bilgileri: {info}")
+    print("📊 DEBUG - Tek mesaj kontrol:")
+    for field in APPOINTMENT_FIELDS:
+        print(f"  {field}: {bool(info[field])} ({info[field]})")
+    return info
+
+
+def current_extract(message):
+    info = app.extract_appointment_from_single_message(message)
+    app.check_single_message_completeness(info)
+    return info
+
+
+def measure(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(MESSAGE)
+    return time.perf_counter() - started
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    records = [0]
+    factory = logging.getLogRecordFactory()
+
+    def counting_factory(*args, **kwargs):
+        records[0] += 1
+        return factory(*args, **kwargs)
+
+    logging.setLogRecordFactory(counting_factory)
+    devnull = open(os.devnull, 'w')
+    results = []
+
+    with contextlib.redirect_stdout(devnull):
+        results.append(('legacy', measure(legacy_extract, repeat), None))
+
+    for level in ('INFO', 'DEBUG'):
+        setup_logging(level=level, stream=devnull)
+        records[0] = 0
+        elapsed = measure(current_extract, repeat)
+        stop_logging()
+        results.append((level.lower(), elapsed, records[0]))
+
+    baseline = results[0][1]
+    print(f"{'mod':<8} {'µs/çağrı':>10} {'oran':>7} {'log kaydı':>10}")
+    for name, elapsed, count in results:
+        per_call = elapsed / repeat * 1e6
+        print(f"{name:<8} {per_call:>10.1f} {baseline / elapsed:>6.2f}x {'-' if count is None else count:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Galeri AI Asistan - Benchmark için Yerel Servisler
+OpenRouter ve Twilio REST API'sinin yerine geçen küçük HTTP sunucuları.
+Gerçek servise hiç istek gitmez; gecikme ve token hızı ayarlanabilir.
+"""
+
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BOOKING_REPLY = "Tüm bilgilerinizi aldım! RANDEVU_OLUSTUR"
+CHAT_REPLY = ("Toyota Corolla 2023 modelimiz 850.000 TL, hibrit motor ve otomatik vites ile geliyor. "
+              "SUV arıyorsanız Honda CR-V'yi de öneririm, isterseniz randevu oluşturabiliriz.")
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # başlık ve gövde ayrı yazılıyor, gecikmeli ACK beklenmesin
+
+    def log_message(self, *args):
+        pass
+
+    def read_body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+    def send_body(self, status, body, content_type='application/json'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockOpenRouterHandler(QuietHandler):
+    """Chat completion - son kullanıcı mesajında 'randevu' ve rakam varsa tetikleyici döner"""
+
+    def reply_for(self, payload):
+        last_user = next((m['content'] for m in reversed(payload.get('messages', []))
+                          if m.get('role') == 'user'), '')
+        if 'randevu' in last_user.lower() and any(c.isdigit() for c in last_user):
+            return BOOKING_REPLY
+        return CHAT_REPLY
+
+    def do_POST(self):
+        settings = self.server.settings
+        payload = json.loads(self.read_body())
+        reply = self.reply_for(payload)
+        tokens = [reply[i:i + 4] for i in range(0, len(reply), 4)]
+        time.sleep(settings['latency'])
+
+        if not payload.get('stream'):
+            time.sleep(len(tokens) / settings['token_rate'])
+            body = json.dumps({'choices': [{'message': {'role': 'assistant', 'content': reply}}]})
+            return self.send_body(200, body.encode('utf-8'))
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        def chunk(data):
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+            self.wfile.flush()
+
+        chunk(b': OPENROUTER PROCESSING\n\n')
+        for token in tokens:
+            event = {'choices': [{'delta': {'content': token}}]}
+            chunk(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode('utf-8'))
+            time.sleep(1 / settings['token_rate'])
+        chunk(b'data: [DONE]\n\n')
+        chunk(b'')
+
+
+class MockTwilioHandler(QuietHandler):
+    """Calls.json - arama oluşturuldu yanıtı"""
+
+    def do_POST(self):
+        self.read_body()
+        time.sleep(self.server.settings['latency'])
+        self.server.calls += 1
+        body = json.dumps({
+            'sid': 'CA' + uuid.uuid4().hex,
+            'status': 'queued',
+            'direction': 'outbound-api'
+        })
+        self.send_body(201, body.encode('utf-8'))
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # varsayılan 5; yüksek eşzamanlılıkta SYN düşmesin
+
+    def handle_error(self, request, client_address):
+        pass  # istemcinin havuzdaki bağlantıyı kapatması hata değildir
+
+
+def start_server(handler, **settings):
+    """Arka plan thread'inde sunucu başlat - adres: http://127.0.0.1:<server.server_port>"""
+    server = MockServer(('127.0.0.1', 0), handler)
+    server.settings = settings
+    server.calls = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_openrouter(latency=0.2, token_rate=50.0):
+    return start_server(MockOpenRouterHandler, latency=latency, token_rate=token_rate)
+
+
+def start_twilio(latency=0.05):
+    return start_server(MockTwilioHandler, latency=latency)
@@ -0,0 +1,115 @@
+"""
+Galeri AI Asistan - Oturum Belleği Benchmark'ı
+N eşzamanlı sohbet ve sesli arama oturumunun bellek deposunda tuttuğu alanı
+(tracemalloc) üç modelle ölçer:
+  legacy   - her sohbetin başında katalog sistem mesajının kopyası, dict mesajlar,
+             sesli oturum için dict içinde dict
+  dicts    - sistem mesajı istekte eklenir, mesajlar hâlâ dict
+  compact  - __slots__ Message / VoiceSession, paylaşılan rol metinleri
+
+Depodaki (compact) modelin tahmini boyutu ölçümden ESTIMATE_TOLERANCE'tan fazla
+saparsa çıkış kodu 1'dir: SESSION_MAX_BYTES tavanı bu tahmine dayanır. dict
+modellerinde alan adları ve roller paylaşılan literal metinlerdir; tahmin orada
+üst sınır olarak kalır.
+
+Çalıştırma (proje kökünden):
+    python benchmarks/session_memory_bench.py [oturum sayısı]
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# app modülü bu değişkenler olmadan yüklenmez; benchmark dış servis çağırmaz
+for name in ('OPENROUTER_API_KEY', 'TWILIO_ACCOUNT_SID', 'TWILIO_AUTH_TOKEN',
+             'TWILIO_PHONE_NUMBER', 'MY_PHONE_NUMBER'):
+    os.environ.setdefault(name, 'benchmark')
+os.environ.setdefault('CALL_QUEUE_AUTOSTART', 'false')  # arama worker'ları gerekmez
+os.chdir(tempfile.mkdtemp(prefix='galeri-bench-'))
+
+import app  # noqa: E402
+from sessions import Message, SessionStore, VoiceSession  # noqa: E402
+
+ESTIMATE_TOLERANCE = 0.15
+
+TURNS = [
+    ("user", "Merhaba, SUV modelleriniz neler?"),
+    ("assistant", "SUV kategorisinde Toyota RAV4 ve Honda CR-V var. Hangisiyle ilgileniyorsunuz?"),
+    ("user", "RAV4 hibrit mi, fiyatı nedir?"),
+    ("assistant", "Toyota RAV4 2023 hibrit, fiyatı 1.450.000 TL. İncelemek için randevu alabilirsiniz."),
+    ("user", "Yarın öğleden sonra gelebilir miyim?"),
+    ("assistant", "Tabii, randevu için isim, telefon ve saat bilgilerinizi yazabilir misiniz?"),
+]
+
+
+def text(value, i):
+    # Her oturumun metni kendine ait - gerçek sohbetlerde içerik paylaşılmaz
+    return f"{value} #{i}"
+
+
+def legacy_session(i, system_prompt):
+    history = [{"role": "system", "content": system_prompt.encode().decode()}]  # oturum başına kopya
+    history += [{"role": role, "content": text(content, i)} for role, content in TURNS]
+    voice = {'conversation_history': [text("Ahmet Yılmaz", i)], 'collected_info': {'name': text("Ahmet Yılmaz", i)},
+             'step': 'waiting_phone', 'caller': text("+90555", i)}
+    return history, voice
+
+
+def dict_session(i, system_prompt):
+    history = [{"role": role, "content": text(content, i)} for role, content in TURNS]
+    voice = {'conversation_history': [text("Ahmet Yılmaz", i)], 'collected_info': {'name': text("Ahmet Yılmaz", i)},
+             'step': 'waiting_phone', 'caller': text("+90555", i)}
+    return history, voice
+
+
+def compact_session(i, system_prompt):
+    # JSON/HTTP'den gelen rol metni her seferinde yeni nesnedir; Message onu paylaşılana çevirir
+    history = [Message(''.join(role), text(content, i)) for role, content in TURNS]
+    voice = VoiceSession(text("+90555", i), step='waiting_phone',
+                         collected_info={'name': text("Ahmet Yılmaz", i)},
+                         conversation_history=[text("Ahmet Yılmaz", i)])
+    return history, voice
+
+
+def measure(build, sessions, system_prompt):
+    conversations = SessionStore(max_entries=sessions, max_bytes=1 << 40)
+    voice_sessions = SessionStore(max_entries=sessions, max_bytes=1 << 40)
+    gc.collect()
+    tracemalloc.start()
+    for i in range(sessions):
+        history, voice = build(i, system_prompt)
+        conversations[str(i)] = history
+        voice_sessions[str(i)] = voice
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used, conversations.stats()['bytes'] + voice_sessions.stats()['bytes']
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    system_prompt = app.get_system_prompt()
+    results = [(name, *measure(build, sessions, system_prompt)) for name, build in
+               (('legacy', legacy_session), ('dicts', dict_session), ('compact', compact_session))]
+
+    baseline = results[0][1]
+    print(f"{sessions} sohbet + {sessions} sesli oturum, sistem mesajı {len(system_prompt)} karakter")
+    print(f"{'model':<8} {'toplam MB':>10} {'byte/oturum':>12} {'oran':>7} {'tahmini byte/oturum':>20}")
+    for name, used, estimated in results:
+        print(f"{name:<8} {used / 1e6:>10.1f} {used / sessions:>12.0f} {baseline / used:>6.2f}x "
+              f"{estimated / sessions:>20.0f}")
+
+    _, used, estimated = results[-1]
+    error = (estimated - used) / used
+    print(f"compact tahmin sapması: {error:+.1%} (sınır ±{ESTIMATE_TOLERANCE:.0%})")
+    if abs(error) > ESTIMATE_TOLERANCE:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Galeri AI Asistan - Okuma Önbelleği
+JSON dosyaları ve depo görüntüleri parse edilmiş halde bellekte tutulur.
+Dosyalar mtime/boyut/inode değişince, depolar sürüm sayacı değişince yenilenir.
+Dönen nesneler paylaşılır - çağıranlar değiştirmemelidir.
+"""
+
+import os
+import threading
+
+
+class ReadCache:
+    """Dosya ve sürüm tabanlı okuma önbelleği, isabet/ıska sayaçlarıyla"""
+
+    def __init__(self):
+        self._entries = {}  # anahtar -> (damga, değer)
+        self._counters = {}  # anahtar -> [hits, misses]
+        self._lock = threading.Lock()
+
+    def _count(self, key, hit):
+        with self._lock:
+            counters = self._counters.setdefault(key, [0, 0])
+            counters[0 if hit else 1] += 1
+
+    @staticmethod
+    def file_stamp(path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def get_file(self, path, loader):
+        """Dosya değişmediyse önbellekteki değeri, değiştiyse loader(path) sonucunu döndür"""
+        stamp = self.file_stamp(path)
+        entry = self._entries.get(path)
+        if entry is not None and stamp is not None and entry[0] == stamp:
+            self._count(path, True)
+            return entry[1]
+
+        self._count(path, False)
+        value = loader(path)
+        self._entries[path] = (stamp, value)
+        return value
+
+    def put_file(self, path, value):
+        """Yazma sonrası önbelleği doğrudan güncelle (write-through)"""
+        self._entries[path] = (self.file_stamp(path), value)
+
+    def get_versioned(self, key, version, loader):
+        """Sürüm değişmediyse önbellekteki değeri döndür"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self._count(key, True)
+            return entry[1]
+
+        self._count(key, False)
+        value = loader()
+        self._entries[key] = (version, value)
+        return value
+
+    def invalidate(self, key=None):
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self):
+        """Anahtar bazında isabet/ıska sayıları"""
+        with self._lock:
+            result = {}
+            for key, (hits, misses) in self._counters.items():
+                total = hits + misses
+                result[key] = {
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_rate': round(hits / total, 4) if total else 0.0
+                }
+            return result
@@ -0,0 +1,55 @@
+"""
+Galeri AI Asistan - Okuma Önbelleği Testleri
+"""
+
+import json
+import os
+
+from cache import ReadCache
+
+
+def test_file_cache_hits_until_file_changes(tmp_path):
+    """Test: Dosya değişmedikçe tekrar parse edilmez"""
+    path = tmp_path / 'vehicles.json'
+    path.write_text(json.dumps({'suv': []}), encoding='utf-8')
+    loads = []
+
+    def loader(p):
+        loads.append(p)
+        with open(p, encoding='utf-8') as f:
+            return json.load(f)
+
+    cache = ReadCache()
+    assert cache.get_file(str(path), loader) == {'suv': []}
+    assert cache.get_file(str(path), loader) == {'suv': []}
+    assert len(loads) == 1
+
+    path.write_text(json.dumps({'suv': [], 'karavan': []}), encoding='utf-8')
+    os.utime(path, ns=(1, 1))
+    assert 'karavan' in cache.get_file(str(path), loader)
+    assert len(loads) == 2
+    assert cache.stats()[str(path)] == {'hits': 1, 'misses': 2, 'hit_rate': 0.3333}
+
+
+def test_versioned_cache(tmp_path):
+    """Test: Sürüm aynı kaldıkça loader çağrılmaz"""
+    cache = ReadCache()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return [len(calls)]
+
+    assert cache.get_versioned('appointments', 1, loader) == [1]
+    assert cache.get_versioned('appointments', 1, loader) == [1]
+    assert cache.get_versioned('appointments', 2, loader) == [2]
+    assert cache.stats()['appointments']['hits'] == 1
+
+
+def test_write_through(tmp_path):
+    """Test: put_file sonrası dosya tekrar okunmaz"""
+    path = tmp_path / 'vehicles.json'
+    path.write_text('{}', encoding='utf-8')
+    cache = ReadCache()
+    cache.put_file(str(path), {'otomobil': []})
+    assert cache.get_file(str(path), lambda p: 1 / 0) == {'otomobil': []}
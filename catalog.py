@@ -0,0 +1,133 @@
+"""
+Galeri AI Asistan - İndeksli Araç Kataloğu
+vehicles.json ({kategori: [araç]}) açılışta düz bir listeye çevrilir ve
+indekslenir; filtreli sorgular tüm kataloğu taramaz.
+
+- Eşitlik indeksleri: kategori, marka, model, yıl -> araç id kümeleri
+- Özellik indeksi (ters indeks): özellik -> araç id kümesi
+- Fiyat indeksi: fiyata göre sıralı id listesi, aralıklar bisect ile bulunur
+
+Sorgu en küçük aday kümeden başlar, diğer koşullar üyelik kontrolüyle
+uygulanır. Fiyat aralığı en dar kaynaksa fiyat sırası indeksten hazır
+gelir, ayrıca sıralama yapılmaz.
+"""
+
+import bisect
+
+SORT_KEYS = {
+    'price': ('fiyat', False),
+    '-price': ('fiyat', True),
+    'year': ('yil', False),
+    '-year': ('yil', True),
+}
+
+
+def turkish_lower(text):
+    return text.replace('I', 'ı').replace('İ', 'i').lower()
+
+
+def format_vehicle(vehicle):
+    line = f"{vehicle['marka']} {vehicle['model']} ({vehicle['yil']}) - ₺{vehicle['fiyat']:,} TL"
+    if vehicle.get('ozellikler'):
+        line += f" - {', '.join(vehicle['ozellikler'])}"
+    return line
+
+
+class VehicleCatalog:
+    """Kategori listelerinden kurulan, salt okunur indeksli katalog
+
+    Dönen araç sözlükleri paylaşılır - çağıranlar değiştirmemelidir.
+    """
+
+    def __init__(self, vehicles):
+        self.categories = list(vehicles)
+        self.vehicles = []
+        self._indexes = {'kategori': {}, 'marka': {}, 'model': {}, 'yil': {}}
+        self._features = {}
+        self._feature_names = {}  # normalize ad -> katalogdaki yazım
+        for category, vehicle_list in vehicles.items():
+            for vehicle in vehicle_list:
+                vehicle_id = len(self.vehicles)
+                record = {**vehicle, 'kategori': category}
+                self.vehicles.append(record)
+                for field, index in self._indexes.items():
+                    index.setdefault(self._normalize(record[field]), set()).add(vehicle_id)
+                for feature in record.get('ozellikler', []):
+                    self._features.setdefault(turkish_lower(feature), set()).add(vehicle_id)
+                    self._feature_names.setdefault(turkish_lower(feature), feature)
+
+        self._by_price = sorted(range(len(self.vehicles)), key=lambda i: (self.vehicles[i]['fiyat'], i))
+        self._prices = [self.vehicles[i]['fiyat'] for i in self._by_price]
+
+    @staticmethod
+    def _normalize(value):
+        return turkish_lower(value) if isinstance(value, str) else value
+
+    def __len__(self):
+        return len(self.vehicles)
+
+    def by_category(self, category):
+        return [self.vehicles[i] for i in sorted(self._indexes['kategori'].get(category, ()))]
+
+    def values(self, field):
+        """İndeksli alanın katalogdaki değerleri - 'marka', 'model', 'ozellikler'..."""
+        if field == 'ozellikler':
+            return list(self._feature_names.values())
+        return sorted({vehicle[field] for vehicle in self.vehicles})
+
+    def _price_range(self, min_price, max_price):
+        lo = 0 if min_price is None else bisect.bisect_left(self._prices, min_price)
+        hi = len(self._prices) if max_price is None else bisect.bisect_right(self._prices, max_price)
+        return self._by_price[lo:hi]
+
+    def search(self, category=None, brand=None, model=None, year=None, min_price=None, max_price=None,
+               features=(), sort=None, limit=None, offset=0):
+        """Filtreli arama - (sayfadaki araçlar, toplam eşleşme)
+
+        features: hepsine sahip araçlar (VE). sort: price, -price, year, -year;
+        verilmezse katalog sırası.
+        """
+        if sort is not None and sort not in SORT_KEYS:
+            raise ValueError(f"sort {', '.join(SORT_KEYS)} değerlerinden biri olmalı")
+
+        sets = []
+        for field, value in (('kategori', category), ('marka', brand), ('model', model), ('yil', year)):
+            if value is not None:
+                sets.append(self._indexes[field].get(self._normalize(value), set()))
+        for feature in features:
+            sets.append(self._features.get(turkish_lower(feature), set()))
+
+        price_filtered = min_price is not None or max_price is not None
+        in_price_order = None  # fiyata göre sıralı id'ler
+        if price_filtered or sort in ('price', '-price'):
+            in_price_order = self._price_range(min_price, max_price)
+
+        if in_price_order is not None and (not sets or len(in_price_order) <= min(len(s) for s in sets)):
+            # Fiyat aralığı en dar kaynak: fiyat sırası hazır, kümeler sadece üyelik için
+            ids = [i for i in in_price_order if all(i in s for s in sets)] if sets else in_price_order
+            if sort == '-price':
+                # Ters çevirmek eşit fiyatlıların katalog sırasını da çevirirdi; kararlı
+                # sıralama diğer dal (_order) gibi eşitlerde katalog sırasını korur
+                ids = sorted(ids, key=lambda i: self.vehicles[i]['fiyat'], reverse=True)
+            elif sort != 'price':
+                ids = self._order(ids, sort)
+        else:
+            sets.sort(key=len)
+            candidates = sets[0] if sets else range(len(self.vehicles))
+            ids = [i for i in candidates if all(i in s for s in sets[1:])]
+            if price_filtered:
+                lo = -float('inf') if min_price is None else min_price
+                hi = float('inf') if max_price is None else max_price
+                ids = [i for i in ids if lo <= self.vehicles[i]['fiyat'] <= hi]
+            ids = self._order(ids, sort)
+
+        total = len(ids)
+        end = None if limit is None else offset + limit
+        return [self.vehicles[i] for i in ids[offset:end]], total
+
+    def _order(self, ids, sort):
+        ids = sorted(ids)  # katalog sırası; eşit değerlerde de korunur (sorted kararlıdır)
+        if sort is None:
+            return ids
+        field, reverse = SORT_KEYS[sort]
+        return sorted(ids, key=lambda i: self.vehicles[i][field], reverse=reverse)
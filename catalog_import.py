@@ -0,0 +1,226 @@
+"""
+Galeri AI Asistan - Toplu Katalog İçe Aktarma
+Bayi stok dosyalarını (CSV veya JSONL) satır satır okuyup doğrular ve
+vehicles.json formatında ({kategori: [araç]}) yazar. Geçerli satırlar
+kategori başına geçici dosyalara akıtılır; bellekte sadece tekrar kontrolü
+için (marka, model, yıl) anahtarları tutulur. Yeni dosya önce geçici adla
+yazılır, sonra os.replace ile atomik olarak eskisinin yerine geçer - okuyan
+taraf hiçbir zaman yarım dosya görmez.
+
+Girdi alanları (CSV başlığı veya JSON anahtarı):
+    kategori, marka, model, yil, fiyat, ozellikler
+    (category, brand, model, year, price, features da kabul edilir)
+CSV'de özellikler '|' veya ';' ile ayrılır: "Otomatik|Hibrit|SUV"
+
+Aynı marka/model/yıl birden çok kez geçerse ilk satır geçerlidir, sonrakiler
+tekrar olarak sayılır. Hatalı satırlar atlanır ve raporlanır; hiç geçerli
+satır yoksa mevcut katalog değiştirilmez.
+
+Çalıştırma:
+    python catalog_import.py stok.csv
+    python catalog_import.py stok.jsonl -o data/vehicles.json --dry-run
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import date
+
+FIELD_ALIASES = {
+    'kategori': ('kategori', 'category', 'type'),
+    'marka': ('marka', 'brand', 'make'),
+    'model': ('model',),
+    'yil': ('yil', 'yıl', 'year'),
+    'fiyat': ('fiyat', 'price'),
+    'ozellikler': ('ozellikler', 'özellikler', 'features'),
+}
+MIN_YEAR = 1950
+MAX_ERROR_SAMPLES = 20
+_FEATURE_SEPARATOR_RE = re.compile(r'[|;]')
+
+
+def detect_format(filename):
+    return 'jsonl' if filename.endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def read_rows(source, fmt):
+    """(satır no, ham kayıt veya ValueError) üret - dosyanın tamamı okunmaz"""
+    if fmt == 'csv':
+        reader = csv.DictReader(source)
+        try:
+            for row in reader:
+                yield reader.line_num, row
+        except csv.Error as e:
+            raise ValueError(f"satır {reader.line_num}: geçersiz CSV: {e}") from None
+    elif fmt == 'jsonl':
+        for line_no, line in enumerate(source, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except ValueError as e:
+                yield line_no, ValueError(f"geçersiz JSON: {e}")
+    else:
+        raise ValueError(f"bilinmeyen format: {fmt}")
+
+
+def _field(row, name):
+    for alias in FIELD_ALIASES[name]:
+        value = row.get(alias)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def validate_row(row, max_year=None):
+    """Ham kaydı (kategori, araç) olarak doğrula - hatalıysa ValueError"""
+    if not isinstance(row, dict):
+        raise ValueError("kayıt bir nesne olmalı")
+    max_year = max_year or date.today().year + 1
+
+    values = {name: _field(row, name) for name in FIELD_ALIASES}
+    missing = [name for name in ('kategori', 'marka', 'model', 'yil', 'fiyat') if values[name] is None]
+    if missing:
+        raise ValueError(f"eksik alan: {', '.join(missing)}")
+
+    try:
+        year = int(values['yil'])
+        price = int(float(str(values['fiyat']).replace(' ', '')))
+    except ValueError:
+        raise ValueError("yil ve fiyat sayı olmalı") from None
+    if not MIN_YEAR <= year <= max_year:
+        raise ValueError(f"yil {MIN_YEAR}-{max_year} arasında olmalı")
+    if price <= 0:
+        raise ValueError("fiyat pozitif olmalı")
+
+    features = values['ozellikler'] or []
+    if isinstance(features, str):
+        features = _FEATURE_SEPARATOR_RE.split(features)
+    features = [str(f).strip() for f in features if str(f).strip()]
+
+    vehicle = {
+        'marka': str(values['marka']).strip(),
+        'model': str(values['model']).strip(),
+        'yil': year,
+        'fiyat': price,
+        'ozellikler': features
+    }
+    return str(values['kategori']).strip().lower(), vehicle
+
+
+def import_catalog(source, path, fmt='csv', dry_run=False, prepare=None, max_year=None):
+    """Stok akışını doğrulayıp path'e atomik olarak yaz, rapor döndür
+
+    prepare(vehicles): yeni katalog yerine geçmeden hemen önce çağrılır
+    (ör. canlı önbellek için indeksleri önceden kurmak). dry_run ise dosya
+    değiştirilmez.
+    """
+    started = time.perf_counter()
+    report = {'rows': 0, 'imported': 0, 'duplicates': 0, 'errors': 0, 'error_samples': [], 'categories': {}}
+    directory = os.path.dirname(os.path.abspath(path))
+    seen = set()
+    spools = {}  # kategori -> geçici dosya (satır başına bir JSON araç)
+
+    try:
+        for line_no, row in read_rows(source, fmt):
+            report['rows'] += 1
+            try:
+                if isinstance(row, ValueError):
+                    raise row
+                category, vehicle = validate_row(row, max_year)
+            except ValueError as e:
+                report['errors'] += 1
+                if len(report['error_samples']) < MAX_ERROR_SAMPLES:
+                    report['error_samples'].append({'line': line_no, 'error': str(e)})
+                continue
+
+            key = (vehicle['marka'].lower(), vehicle['model'].lower(), vehicle['yil'])
+            if key in seen:
+                report['duplicates'] += 1
+                continue
+            seen.add(key)
+
+            spool = spools.get(category)
+            if spool is None:
+                spool = spools[category] = tempfile.TemporaryFile('w+', encoding='utf-8', dir=directory)
+            spool.write(json.dumps(vehicle, ensure_ascii=False) + '\n')
+            report['imported'] += 1
+            report['categories'][category] = report['categories'].get(category, 0) + 1
+
+        if not report['imported']:
+            raise ValueError("geçerli satır yok, katalog değiştirilmedi")
+        if not dry_run:
+            _write_catalog(spools, path, directory, prepare)
+    finally:
+        for spool in spools.values():
+            spool.close()
+
+    elapsed = time.perf_counter() - started
+    report['seconds'] = round(elapsed, 3)
+    report['rows_per_sec'] = round(report['rows'] / elapsed) if elapsed else 0
+    return report
+
+
+def _write_catalog(spools, path, directory, prepare):
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.vehicles.', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as out:
+            out.write('{')
+            for i, (category, spool) in enumerate(spools.items()):
+                spool.seek(0)
+                out.write(f"{',' if i else ''}\n{json.dumps(category, ensure_ascii=False)}: [")
+                for j, line in enumerate(spool):
+                    out.write(f"{',' if j else ''}\n  {line.rstrip()}")
+                out.write('\n]')
+            out.write('\n}\n')
+            out.flush()
+            os.fsync(out.fileno())
+        # mkstemp dosyayı 0600 açar - eski kataloğun izinleri korunur
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        if prepare is not None:
+            with open(tmp_path, encoding='utf-8') as f:
+                prepare(json.load(f))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='CSV/JSONL bayi stok dosyasından araç kataloğu içe aktarma')
+    parser.add_argument('input', help="girdi dosyası ('-' ise stdin)")
+    parser.add_argument('-o', '--output', default='data/vehicles.json', help='katalog dosyası (varsayılan data/vehicles.json)')
+    parser.add_argument('--format', choices=('csv', 'jsonl'), help='girdi formatı (varsayılan: dosya uzantısından)')
+    parser.add_argument('--dry-run', action='store_true', help='sadece doğrula, kataloğu değiştirme')
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ('csv' if args.input == '-' else detect_format(args.input))
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8-sig', newline='')
+    try:
+        report = import_catalog(source, args.output, fmt, dry_run=args.dry_run)
+    except ValueError as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    for sample in report['error_samples']:
+        print(f"satır {sample['line']}: {sample['error']}", file=sys.stderr)
+    print(f"{report['rows']} satır, {report['imported']} araç, {report['duplicates']} tekrar, "
+          f"{report['errors']} hata - {report['seconds']:.2f} sn ({report['rows_per_sec']} satır/sn)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
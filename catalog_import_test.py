@@ -0,0 +1,62 @@
+"""
+Galeri AI Asistan - Katalog İçe Aktarma Testleri
+"""
+
+import io
+import json
+
+import pytest
+
+from catalog_import import import_catalog
+
+CSV_FEED = """marka,model,yil,fiyat,kategori,ozellikler
+Toyota,Corolla,2023,850000,Otomobil,Otomatik|Hibrit
+Honda,Civic,2023,920000,otomobil,Otomatik;Benzin
+toyota,corolla,2023,799000,otomobil,Manuel
+Ford,Kuga,abc,1100000,suv,
+,Eksik,2022,500000,suv,
+Honda,CR-V,2023,1350000,suv,Otomatik|SUV
+"""
+
+
+def test_csv_import_validates_dedupes_and_replaces(tmp_path):
+    """Test: hatalı satırlar atlanır, ilk marka/model/yıl geçerli, dosya atomik yazılır"""
+    path = tmp_path / 'vehicles.json'
+    path.write_text('{"eski": []}', encoding='utf-8')
+    prepared = []
+
+    report = import_catalog(io.StringIO(CSV_FEED), str(path), 'csv', prepare=prepared.append)
+
+    assert (report['rows'], report['imported'], report['duplicates'], report['errors']) == (6, 3, 1, 2)
+    assert [sample['line'] for sample in report['error_samples']] == [5, 6]
+    assert report['categories'] == {'otomobil': 2, 'suv': 1}
+    vehicles = json.loads(path.read_text(encoding='utf-8'))
+    assert prepared == [vehicles]
+    assert vehicles['otomobil'][0] == {'marka': 'Toyota', 'model': 'Corolla', 'yil': 2023, 'fiyat': 850000,
+                                       'ozellikler': ['Otomatik', 'Hibrit']}
+    assert vehicles['suv'][0]['ozellikler'] == ['Otomatik', 'SUV']
+    assert [p.name for p in tmp_path.iterdir()] == ['vehicles.json']
+
+
+def test_jsonl_import_keeps_catalog_when_nothing_valid(tmp_path):
+    """Test: geçerli satır yoksa veya prepare hata verirse eski katalog kalır"""
+    path = tmp_path / 'vehicles.json'
+    path.write_text('{"eski": []}', encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        import_catalog(io.StringIO('{"marka": "Toyota"}\nbozuk\n'), str(path), 'jsonl')
+
+    feed = '{"brand": "Toyota", "model": "RAV4", "year": 2024, "price": 1500000, "category": "suv"}\n'
+
+    def failing_prepare(vehicles):
+        raise RuntimeError("indeks kurulamadı")
+
+    with pytest.raises(RuntimeError):
+        import_catalog(io.StringIO(feed), str(path), 'jsonl', prepare=failing_prepare)
+
+    assert path.read_text(encoding='utf-8') == '{"eski": []}'
+    assert [p.name for p in tmp_path.iterdir()] == ['vehicles.json']
+
+    report = import_catalog(io.StringIO(feed), str(path), 'jsonl')
+    assert report['imported'] == 1
+    assert json.loads(path.read_text(encoding='utf-8'))['suv'][0]['model'] == 'RAV4'
@@ -0,0 +1,68 @@
+"""
+Galeri AI Asistan - İndeksli Katalog Testleri
+"""
+
+import random
+
+import pytest
+
+from catalog import SORT_KEYS, VehicleCatalog
+
+FEATURES = ['Otomatik', 'Manuel', 'Benzin', 'Dizel', 'Hibrit']
+
+
+def random_catalog(n=600):
+    rng = random.Random(7)
+    vehicles = {category: [] for category in ('otomobil', 'suv', 'karavan')}
+    for _ in range(n):
+        vehicles[rng.choice(list(vehicles))].append({
+            'marka': rng.choice(['Toyota', 'Honda', 'Mercedes']),
+            'model': f"M{rng.randint(1, 40)}",
+            'yil': rng.randint(2018, 2024),
+            'fiyat': rng.randint(50, 300) * 10000,
+            'ozellikler': rng.sample(FEATURES, 2)
+        })
+    return VehicleCatalog(vehicles)
+
+
+def brute_force(catalog, category=None, brand=None, min_price=None, max_price=None, features=(), sort=None):
+    result = [v for v in catalog.vehicles
+              if (category is None or v['kategori'] == category)
+              and (brand is None or v['marka'].lower() == brand.lower())
+              and (min_price is None or v['fiyat'] >= min_price)
+              and (max_price is None or v['fiyat'] <= max_price)
+              and all(f in v['ozellikler'] for f in features)]
+    if sort:
+        field, reverse = SORT_KEYS[sort]
+        result.sort(key=lambda v: v[field], reverse=reverse)
+    return result
+
+
+@pytest.mark.parametrize('query', [
+    {'min_price': 1000000, 'max_price': 1200000},
+    {'features': ['Hibrit'], 'max_price': 900000, 'sort': 'price'},
+    {'category': 'suv', 'brand': 'toyota', 'sort': '-year'},
+    {'features': ['Dizel', 'Otomatik'], 'category': 'karavan'},
+    {'sort': '-price', 'min_price': 2500000},
+    {'brand': 'honda', 'min_price': 2000000, 'max_price': 2100000, 'sort': '-price'},  # eşit fiyatlar, fiyat dalı
+    {'brand': 'honda', 'category': 'suv', 'sort': '-price'},  # eşit fiyatlar, küme dalı
+    {'brand': 'yok'},
+])
+def test_search_matches_full_scan(query):
+    """Test: İndeksli arama tam taramayla aynı sonucu verir"""
+    catalog = random_catalog()
+    expected = brute_force(catalog, **query)
+    items, total = catalog.search(**query)
+    assert total == len(expected)
+    assert items == expected  # eşit değerler her iki dalda da katalog sırasında
+
+
+def test_paging_and_bad_sort():
+    """Test: limit/offset sayfalar, toplam değişmez; bilinmeyen sort reddedilir"""
+    catalog = random_catalog()
+    first, total = catalog.search(sort='price', limit=10)
+    second, _ = catalog.search(sort='price', limit=10, offset=10)
+    assert total == len(catalog)
+    assert first[-1]['fiyat'] <= second[0]['fiyat']
+    with pytest.raises(ValueError):
+        catalog.search(sort='name')
@@ -0,0 +1,77 @@
+"""
+Galeri AI Asistan - Sohbet Bağlam Penceresi
+Oturumlarda sadece kullanıcı/asistan turları tutulur; büyük sistem mesajı
+(araç kataloğu) istek hazırlanırken başa eklenir. Geçmiş token bütçesini
+aşınca en eski turlar düşürülür ve kullanıcı mesajlarından kısa bir özet
+olarak saklanır - randevu bilgileri çoğunlukla kullanıcı mesajlarındadır.
+"""
+
+from sessions import Message
+
+SUMMARY_PREFIX = "Önceki konuşma özeti (müşteri mesajları): "
+
+# OpenAI sohbet formatında mesaj başına sabit ek yük
+MESSAGE_OVERHEAD = 4
+
+
+def estimate_tokens(text):
+    """Yaklaşık token sayısı - Türkçe metinde ~3 karakter/token"""
+    return len(text) // 3 + 1
+
+
+class ConversationWindow:
+    """Sohbet geçmişini token bütçesi içinde tutar"""
+
+    def __init__(self, max_tokens=1500, summary_tokens=200, count_tokens=estimate_tokens):
+        self.max_tokens = max_tokens
+        self.summary_tokens = summary_tokens
+        self.count_tokens = count_tokens
+
+    def message_tokens(self, message):
+        return MESSAGE_OVERHEAD + self.count_tokens(message['content'])
+
+    def history_tokens(self, history):
+        return sum(self.message_tokens(message) for message in history)
+
+    def fit(self, history):
+        """Bütçeyi aşan en eski turları özete katarak yeni geçmiş döndür
+
+        Son tur her zaman korunur. Özet dışındaki sistem mesajları (eski
+        oturumlarda saklanmış katalog mesajı) atılır.
+        """
+        summary = None
+        turns = []
+        for message in history:
+            if message['role'] != 'system':
+                turns.append(message)
+            elif message['content'].startswith(SUMMARY_PREFIX):
+                summary = message['content'][len(SUMMARY_PREFIX):]
+
+        budget = self.max_tokens
+        if summary:
+            budget -= MESSAGE_OVERHEAD + self.count_tokens(summary)
+        total = self.history_tokens(turns)
+
+        dropped = []
+        while len(turns) > 1 and (total > budget or turns[0]['role'] == 'assistant' and dropped):
+            message = turns.pop(0)
+            total -= self.message_tokens(message)
+            dropped.append(message)
+
+        if dropped:
+            summary = self.summarize(summary, dropped)
+
+        if summary:
+            return [Message("system", SUMMARY_PREFIX + summary)] + turns
+        return turns
+
+    def summarize(self, previous, dropped):
+        """Düşen kullanıcı mesajlarını özete ekle, en yeni kısmı bütçede tut"""
+        parts = [previous] if previous else []
+        parts.extend(message['content'].strip() for message in dropped if message['role'] == 'user')
+        summary = " | ".join(part for part in parts if part)
+
+        max_chars = self.summary_tokens * 3
+        if len(summary) > max_chars:
+            summary = "…" + summary[-max_chars:]
+        return summary
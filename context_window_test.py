@@ -0,0 +1,46 @@
+"""
+Galeri AI Asistan - Sohbet Bağlam Penceresi Testleri
+"""
+
+from context_window import SUMMARY_PREFIX, ConversationWindow
+
+
+def count_words(text):
+    return len(text.split())
+
+
+def test_history_under_budget_is_unchanged():
+    """Test: Bütçe aşılmadıkça geçmiş olduğu gibi kalır"""
+    window = ConversationWindow(max_tokens=100, count_tokens=count_words)
+    history = [
+        {"role": "user", "content": "merhaba"},
+        {"role": "assistant", "content": "hoş geldiniz"}
+    ]
+    assert window.fit(history) == history
+
+
+def test_old_turns_are_summarized():
+    """Test: Eski turlar düşer, kullanıcı mesajları özette kalır"""
+    window = ConversationWindow(max_tokens=20, count_tokens=count_words)
+    history = []
+    for i in range(4):
+        history.append({"role": "user", "content": f"soru {i} " + "x " * 4})
+        history.append({"role": "assistant", "content": f"cevap {i} " + "y " * 4})
+
+    fitted = window.fit(history)
+    assert fitted[0]["role"] == "system"
+    assert fitted[0]["content"].startswith(SUMMARY_PREFIX + "soru 0")
+    assert "cevap 0" not in fitted[0]["content"]
+    assert fitted[1]["role"] == "user"
+    assert fitted[-1] == history[-1]
+    assert window.history_tokens(fitted[1:]) <= 20
+
+
+def test_stored_catalog_prompt_is_dropped():
+    """Test: Eski oturumlarda saklanan sistem mesajı geçmişten çıkarılır"""
+    window = ConversationWindow(max_tokens=100, count_tokens=count_words)
+    history = [
+        {"role": "system", "content": "Sen bir otomotiv galerisinin asistanısın"},
+        {"role": "user", "content": "merhaba"}
+    ]
+    assert window.fit(history) == [{"role": "user", "content": "merhaba"}]
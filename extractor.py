@@ -0,0 +1,350 @@
+"""
+Galeri AI Asistan - Randevu Bilgisi Çıkarıcı
+Sohbet geçmişi, tek mesaj ve sesli arama için ortak çıkarım motoru.
+Tüm kalıplar modül yüklenirken bir kez derlenir; araç ve gün anahtar
+kelimeleri tek bir birleşik regex ile metin üzerinden tek geçişte bulunur.
+Tek geçiş yalnızca anahtar kelimeler içindir: isim, telefon, tarih ve saat
+kendi (önceden derlenmiş) kalıplarıyla ayrı taranır. Bu kalıplar sıraya ve
+ilk eşleşmeye bağlı öncelik kurallarıyla çalıştığından tek alternation'a
+katılmaz; rakam içermeyen metinde telefon/tarih/saat taraması hiç yapılmaz.
+Her kullanım yerinin kuralları bir profil olarak tanımlanır.
+"""
+
+import re
+from datetime import datetime, timedelta
+
+APPOINTMENT_FIELDS = ('name', 'phone', 'vehicle_type', 'date', 'time')
+LETTERS = 'a-zA-ZçğıöşüÇĞİÖŞÜ'
+
+WEEKDAYS = ['pazartesi', 'salı', 'çarşamba', 'perşembe', 'cuma', 'cumartesi', 'pazar']
+TOMORROW = 'yarın'
+
+# İsim olamayacak kelimeler (araç, gün, randevu kelimeleri)
+LEADING_STOPWORDS = ['toyota', 'honda', 'volkswagen', 'mercedes', 'civic', 'corolla', 'golf', 'otomobil',
+                     'suv', 'karavan', 'randevu', 'telefon', 'saat', 'yarın', 'pazartesi', 'salı', 'çarşamba',
+                     'perşembe', 'cuma', 'cumartesi', 'pazar']
+NAME_STOPWORDS = ['toyota', 'honda', 'volkswagen', 'mercedes', 'civic', 'corolla', 'golf', 'otomobil',
+                  'suv', 'karavan', 'randevu', 'telefon']
+
+
+def _alternation(words):
+    # Uzun kelimeler önce: 'cumartesi' 'cuma'dan, 'marco polo' 'marco'dan önce denenir
+    return re.compile('|'.join(re.escape(w) for w in sorted(words, key=len, reverse=True)))
+
+
+_DIGIT_RE = re.compile(r'\d')
+_NON_DIGIT_RE = re.compile(r'[^\d]')
+_LEADING_STOPWORDS_RE = _alternation(LEADING_STOPWORDS)
+_NAME_STOPWORDS_RE = _alternation(NAME_STOPWORDS)
+_NAME_PAIR_RE = re.compile(rf'^[{LETTERS}]+\s+[{LETTERS}]+$')
+_LETTERS_ONLY_RE = re.compile(rf'^[{LETTERS}\s]+$')
+_CHAT_NAME_PATTERNS = [
+    re.compile(r'([A-ZÇĞİÖŞÜ][a-zçğıöşü]+\s+[A-ZÇĞİÖŞÜ][a-zçğıöşü]+)'),
+    re.compile(rf'([{LETTERS}]+\s+[{LETTERS}]+)'),
+    re.compile(rf'isim.*?([{LETTERS}\s]+)'),
+    re.compile(rf'ben\s+([{LETTERS}\s]+)'),
+]
+_VOICE_NAME_RE = re.compile(rf"(?:ben|ismim|adım)\s+([{LETTERS}\s]+)", re.IGNORECASE)
+
+
+# =============================================
+# İSİM STRATEJİLERİ
+# =============================================
+
+def chat_name(text):
+    """Yazılı mesajdan isim: önce baştaki iki kelime, sonra kalıplar"""
+    words = text.split()
+    if len(words) >= 2:
+        first_two_words = f"{words[0]} {words[1]}"
+        # İlk iki kelime araba kelimesi değilse ve sadece harfse isim olabilir
+        if (not _LEADING_STOPWORDS_RE.search(first_two_words.lower()) and
+                _NAME_PAIR_RE.match(first_two_words) and
+                len(first_two_words) > 4):
+            return first_two_words.title()
+
+    for pattern in _CHAT_NAME_PATTERNS:
+        for match in pattern.finditer(text):
+            name = match.group(1).strip()
+            if (2 < len(name) < 30 and
+                    not _NAME_STOPWORDS_RE.search(name.lower()) and
+                    _LETTERS_ONLY_RE.match(name)):
+                return name.title()
+    return None
+
+
+def voice_name(text):
+    """Sesli girişten isim: 2-3 kelimelik yanıt veya 'ben/ismim/adım ...'"""
+    words = text.strip().split()
+
+    # 2 veya 3 kelimeli isim - her kelime harf ve en az 2 karakter
+    if 2 <= len(words) <= 3:
+        if all(word.replace("'", "").isalpha() and len(word) >= 2 for word in words):
+            return " ".join(word.title() for word in words)
+
+    elif len(words) > 3:
+        match = _VOICE_NAME_RE.search(text)
+        if match:
+            name_part = match.group(1).strip().split()[:3]  # max 3 kelime
+            if len(name_part) >= 2:
+                return " ".join(word.title() for word in name_part)
+    return None
+
+
+# =============================================
+# ÇIKARIM MOTORU
+# =============================================
+
+class KeywordMatcher:
+    """Birden çok alanın anahtar kelimelerini tek alternation regex ile bulur"""
+
+    def __init__(self, table):
+        # table: {alan: {değer: [anahtar kelimeler]}}
+        self._lookup = {}
+        for field, values in table.items():
+            for value, keywords in values.items():
+                for keyword in keywords:
+                    self._lookup.setdefault(keyword, (field, value))
+        self.pattern = _alternation(self._lookup)
+
+    def scan(self, text):
+        """{alan: {bulunan değerler}} - metin tek geçişte taranır"""
+        found = {}
+        for match in self.pattern.finditer(text):
+            field, value = self._lookup[match.group()]
+            found.setdefault(field, set()).add(value)
+        return found
+
+
+class AppointmentExtractor:
+    """Profil kurallarıyla isim, telefon, araç tipi, tarih ve saat çıkarır
+
+    time_patterns öğeleri (regex, tür): 'hm' saat+dakika, 'h' sadece saat,
+    'hhmm' 1430 gibi dört hane, 'half' '14 buçuk'. first_match_only ile her
+    tarih/saat kalıbının yalnızca ilk eşleşmesine bakılır (sesli girişte
+    telefon numarası parçalarının saat sanılmaması için).
+    """
+
+    def __init__(self, name_strategy, vehicle_keywords, day_order, phone_patterns=(),
+                 strict_phone=False, date_patterns=(), numeric_date_first=False, time_patterns=(),
+                 first_match_only=False):
+        self.name_strategy = name_strategy
+        self.vehicle_order = list(vehicle_keywords)
+        self.day_order = list(day_order)
+        self.phone_patterns = [re.compile(p) for p in phone_patterns]
+        self.strict_phone = strict_phone
+        self.date_patterns = [re.compile(p) for p in date_patterns]
+        self.numeric_date_first = numeric_date_first
+        self.time_patterns = [(re.compile(p), kind) for p, kind in time_patterns]
+        self.first_match_only = first_match_only
+        self.matcher = KeywordMatcher({
+            'vehicle_type': vehicle_keywords,
+            'day': {day: [day] for day in day_order}
+        })
+
+    def extract(self, text, skip=(), now=None):
+        """Bulunan alanları içeren sözlük döndür; skip'teki alanlar aranmaz"""
+        info = {}
+        lower = text.lower()
+        keywords = self.matcher.scan(lower)
+        has_digits = _DIGIT_RE.search(lower) is not None
+
+        if 'name' not in skip:
+            name = self.name_strategy(text)
+            if name:
+                info['name'] = name
+
+        if 'phone' not in skip and has_digits:
+            phone = self._phone(lower)
+            if phone:
+                info['phone'] = phone
+
+        if 'vehicle_type' not in skip:
+            vehicle_types = keywords.get('vehicle_type', ())
+            for vehicle_type in self.vehicle_order:
+                if vehicle_type in vehicle_types:
+                    info['vehicle_type'] = vehicle_type
+                    break
+
+        if 'date' not in skip:
+            now = now or datetime.now()
+            if self.numeric_date_first:
+                date = (has_digits and self._numeric_date(lower, now)) or self._day_date(keywords, now)
+            else:
+                date = self._day_date(keywords, now) or (has_digits and self._numeric_date(lower, now))
+            if date:
+                info['date'] = date
+
+        if 'time' not in skip and has_digits:
+            time = self._time(lower)
+            if time:
+                info['time'] = time
+
+        return info
+
+    def _matches(self, pattern, text):
+        if self.first_match_only:
+            match = pattern.search(text)
+            return (match,) if match else ()
+        return pattern.finditer(text)
+
+    def _phone(self, text):
+        for pattern in self.phone_patterns:
+            for match in pattern.finditer(text):
+                phone = _NON_DIGIT_RE.sub('', ''.join(match.groups()))
+                if len(phone) < 10:
+                    continue
+                if self.strict_phone:
+                    # 11 haneli ise 05, 10 haneli ise 5 ile başlamalı
+                    if len(phone) == 11 and phone.startswith('0') and not phone.startswith('05'):
+                        continue
+                    if len(phone) == 10 and not phone.startswith('5'):
+                        continue
+                return phone
+        return None
+
+    def _day_date(self, keywords, now):
+        days = keywords.get('day', ())
+        for day_name in self.day_order:
+            if day_name in days:
+                if day_name == TOMORROW:
+                    target_date = now + timedelta(days=1)
+                else:
+                    days_ahead = (WEEKDAYS.index(day_name) - now.weekday()) % 7
+                    if days_ahead == 0:
+                        days_ahead = 7
+                    target_date = now + timedelta(days=days_ahead)
+                return target_date.strftime('%Y-%m-%d')
+        return None
+
+    def _numeric_date(self, text, now):
+        for pattern in self.date_patterns:
+            for match in self._matches(pattern, text):
+                groups = match.groups()
+                try:
+                    if len(groups) == 3:
+                        if len(groups[2]) == 4:  # Son grup yıl
+                            day, month, year = int(groups[0]), int(groups[1]), int(groups[2])
+                        else:  # İlk grup yıl
+                            year, month, day = int(groups[0]), int(groups[1]), int(groups[2])
+                    else:
+                        # Yıl yok - bu yılı kullan
+                        day, month = int(groups[0]), int(groups[1])
+                        year = now.year
+                    return datetime(year, month, day).strftime('%Y-%m-%d')
+                except ValueError:
+                    continue
+        return None
+
+    def _time(self, text):
+        for pattern, kind in self.time_patterns:
+            for match in self._matches(pattern, text):
+                groups = match.groups()
+                if kind == 'hhmm':
+                    hour, minute = int(groups[0][:2]), int(groups[0][2:])
+                elif kind == 'hm':
+                    hour, minute = int(groups[0]), int(groups[1])
+                elif kind == 'half':
+                    hour, minute = int(groups[0]), 30
+                else:
+                    hour, minute = int(groups[0]), 0
+
+                # Çalışma saatleri (8-18 arası)
+                if 8 <= hour <= 18 and 0 <= minute <= 59:
+                    return f"{hour:02d}:{minute:02d}"
+        return None
+
+
+def conversation_text(history):
+    """Sohbet geçmişindeki sadece kullanıcı mesajlarını küçük harfle birleştir"""
+    return "".join(" " + message['content'].lower() for message in history if message.get('role') == 'user')
+
+
+def missing_fields(info, required=APPOINTMENT_FIELDS):
+    """Randevu için eksik kalan alanlar"""
+    return [field for field in required if not info.get(field)]
+
+
+# =============================================
+# PROFİLLER
+# =============================================
+
+# Sohbet geçmişinin tamamı (küçük harfe çevrilmiş kullanıcı mesajları)
+conversation_extractor = AppointmentExtractor(
+    name_strategy=chat_name,
+    vehicle_keywords={
+        'otomobil': ['otomobil', 'sedan', 'corolla', 'civic', 'golf', 'araba', 'binek'],
+        'suv': ['suv', 'rav4', 'crv', 'cr-v', 'es u vi'],
+        'karavan': ['karavan', 'california', 'marco polo', 'kamper', 'marco', 'polo']
+    },
+    day_order=WEEKDAYS + [TOMORROW],
+    phone_patterns=[
+        r'\b(05\d{9})\b',
+        r'\b(5\d{9})\b',
+        r'\b(0\d{10})\b',
+        r'(\d{11})',
+        r'(\d{10})',
+        r'telefon.*?(\d{10,11})',
+        r'numara.*?(\d{10,11})',
+        r'(\d{3})\s*(\d{3})\s*(\d{4})',
+        r'(\d{3})\s*(\d{3})\s*(\d{2})\s*(\d{2})',
+    ],
+    strict_phone=True,
+    date_patterns=[
+        r'\b(\d{1,2})[./](\d{1,2})[./](\d{4})\b',
+        r'\b(\d{4})[/-](\d{1,2})[/-](\d{1,2})\b'
+    ],
+    numeric_date_first=True,
+    time_patterns=[
+        (r'\b(\d{1,2})[:.,-](\d{2})\b', 'hm'),
+        (r'saat\s*(\d{1,2})\b', 'h'),
+        (r'\b(\d{1,2})\s*(?:saat|saatte)\b', 'h')
+    ]
+)
+
+# Tek mesaj - RANDEVU_OLUSTUR tetiklendiğinde sadece son kullanıcı mesajı
+message_extractor = AppointmentExtractor(
+    name_strategy=chat_name,
+    vehicle_keywords={
+        'otomobil': ['otomobil', 'sedan', 'araba'],
+        'suv': ['suv'],
+        'karavan': ['karavan', 'kamper']
+    },
+    day_order=[TOMORROW] + WEEKDAYS,
+    phone_patterns=[
+        r'(05\d{9})',
+        r'(5\d{9})',
+        r'(\d{11})',
+        r'(\d{10})',
+    ],
+    time_patterns=[
+        (r'(\d{1,2}):(\d{2})', 'hm'),
+        (r'saat\s*(\d{1,2})', 'h'),
+        (r'(\d{1,2})\s*saat', 'h')
+    ]
+)
+
+# Sesli arama - konuşmadan metne çevrilmiş (STT) tek cümle
+voice_extractor = AppointmentExtractor(
+    name_strategy=voice_name,
+    vehicle_keywords={
+        'otomobil': ['otomobil', 'araba', 'sedan', 'hatchback', 'binek'],
+        'suv': ['suv', 'es u vi', 'esuvi', 's u v', 'sav', 'jeep', 'crossover'],
+        'karavan': ['karavan', 'kamper', 'rv', 'motorhome']
+    },
+    day_order=WEEKDAYS + [TOMORROW],
+    date_patterns=[
+        r"(\d{1,2})[./](\d{1,2})[./](\d{4})",  # 15/06/2025
+        r"(\d{4})[./](\d{1,2})[./](\d{1,2})",  # 2025/06/15
+        r"(\d{1,2})[./](\d{1,2})",  # 15/06 (bu yıl)
+        r"(\d{1,2})\s+(\d{1,2})\s+(\d{4})",  # 8 06 2025 (sesli)
+        r"(\d{1,2})\s+(\d{1,2})",  # 8 06 (bu yıl, sesli)
+    ],
+    time_patterns=[
+        (r"(\d{4})", 'hhmm'),  # 1400, 1430 gibi
+        (r"(\d{1,2}):(\d{2})", 'hm'),  # 14:30
+        (r"saat\s*(\d{1,2})", 'h'),  # saat 14, saat 2
+        (r"(\d{1,2})\s*saat", 'h'),  # 14 saat
+        (r"(\d{1,2})\s*buçuk", 'half'),  # 14 buçuk
+    ],
+    first_match_only=True
+)
@@ -0,0 +1,55 @@
+"""
+Galeri AI Asistan - Randevu Bilgisi Çıkarıcı Testleri
+"""
+
+from datetime import datetime
+
+from extractor import KeywordMatcher, conversation_extractor, message_extractor, voice_extractor
+
+# 2025-06-11 bir çarşamba
+NOW = datetime(2025, 6, 11, 10, 0)
+
+
+def test_single_message_extracts_all_fields():
+    """Test: Tek mesajdan beş alan birden çıkarılır"""
+    info = message_extractor.extract("Ahmet Yılmaz 05321234567 yarın saat 14:00 suv randevu", now=NOW)
+    assert info == {
+        'name': 'Ahmet Yılmaz',
+        'phone': '05321234567',
+        'vehicle_type': 'suv',
+        'date': '2025-06-12',
+        'time': '14:00'
+    }
+
+
+def test_conversation_phone_and_numeric_date():
+    """Test: Boşluklu telefon ve sayısal tarih birleştirilir"""
+    info = conversation_extractor.extract(" ayşe demir telefon 532 123 4567 15/06/2025 saat 9 sedan", now=NOW)
+    assert info['phone'] == '5321234567'
+    assert info['date'] == '2025-06-15'
+    assert info['time'] == '09:00'
+    assert info['vehicle_type'] == 'otomobil'
+
+
+def test_longest_keyword_wins():
+    """Test: 'cumartesi' artık 'cuma' olarak algılanmaz, büyük harfli 'Saat' tanınır"""
+    info = message_extractor.extract("cumartesi karavan", now=NOW)
+    assert info['date'] == '2025-06-14'
+
+    # Saat kalıpları küçük harfe çevrilmiş metinde aranır: cümle başındaki "Saat" de tanınır
+    assert message_extractor.extract("Saat 14 uygun", now=NOW)['time'] == '14:00'
+    assert voice_extractor.extract("Saat 15", skip={'name': 'Ali'}, now=NOW) == {'time': '15:00'}
+
+    matcher = KeywordMatcher({'vehicle_type': {'karavan': ['marco', 'marco polo']}})
+    assert matcher.scan('marco polo istiyorum') == {'vehicle_type': {'karavan'}}
+
+
+def test_voice_skips_known_fields_and_ignores_phone_digits():
+    """Test: Sesli girişte bilinen alanlar atlanır, telefon parçaları saat sayılmaz"""
+    info = voice_extractor.extract("Mehmet Kaya", skip={'vehicle_type': 'suv'}, now=NOW)
+    assert info == {'name': 'Mehmet Kaya'}
+
+    info = voice_extractor.extract("numaram 0555 101 23 45", skip={'name': 'Ali'}, now=NOW)
+    assert 'time' not in info
+
+    assert voice_extractor.extract("14 buçuk", skip={'name': 'Ali'}, now=NOW) == {'time': '14:30'}
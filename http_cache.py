@@ -0,0 +1,77 @@
+"""
+Galeri AI Asistan - Koşullu GET ve Sıkıştırma
+Sürüm sayacından türetilen ETag başlığı ile JSON yanıtları. İstemcideki kopya
+güncelse gövde hiç üretilmeden 304 döner; değilse gövde (ve sıkıştırılmış hali)
+sürüm değişene kadar önbellekte tutulur. Last-Modified kullanılmaz: dosya damgası
+saniye çözünürlüklüdür, aynı saniyedeki iki yazma If-Modified-Since ile bayat
+304'e yol açardı.
+"""
+
+import gzip
+import hashlib
+
+from flask import Response, current_app
+from werkzeug.http import is_resource_modified
+
+try:
+    import brotli
+except ImportError:  # opsiyonel - yoksa sadece gzip kullanılır
+    brotli = None
+
+MIN_COMPRESS_SIZE = 1024  # bundan küçük gövdeleri sıkıştırmaya değmez
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def make_etag(*parts):
+    """Sürüm bilgisinden kısa etiket - aynı sürüm her worker'da aynı etiketi verir"""
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:20]
+
+
+def encode(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def negotiate(request, body):
+    """İstemcinin kabul ettiği en iyi sıkıştırma - gerek yoksa None"""
+    if len(body) < MIN_COMPRESS_SIZE:
+        return None
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def dumps(value):
+    """jsonify ile aynı çıktı (uygulamanın JSON ayarları)"""
+    return current_app.json.dumps(value).encode('utf-8')
+
+
+def conditional_json(request, tag, build, cache=None, cache_key=None):
+    """Sürüm etiketli JSON yanıtı
+
+    tag sürümden türetilmiş ETag'dir. İstemci aynı etiketi If-None-Match ile
+    gönderirse build hiç çağrılmadan 304 döner. cache_key
+    verilirse serileştirilmiş ve sıkıştırılmış gövde etiket değişene kadar
+    cache (ReadCache) içinde tutulur; sınırsız anahtar üretebilecek sorgular
+    için verilmemelidir.
+    """
+    response = Response(mimetype='application/json')
+    response.set_etag(tag, weak=True)  # sıkıştırılmış/sıkıştırılmamış gövde aynı etiketi paylaşır
+    response.cache_control.no_cache = True  # tarayıcı her seferinde doğrulasın (304 ucuz)
+    response.vary.add('Accept-Encoding')
+
+    if not is_resource_modified(request.environ, etag=tag):
+        response.status_code = 304
+        return response
+
+    def cached(key, loader):
+        if cache is None or cache_key is None:
+            return loader()
+        return cache.get_versioned(key, tag, loader)
+
+    body = cached(cache_key, lambda: dumps(build()))
+    encoding = negotiate(request, body)
+    if encoding:
+        body = cached(f'{cache_key}:{encoding}', lambda: encode(body, encoding))
+        response.content_encoding = encoding
+    response.set_data(body)
+    return response
@@ -0,0 +1,76 @@
+"""
+Galeri AI Asistan - Koşullu GET Testleri
+"""
+
+import gzip
+import json
+
+from flask import Flask, request
+
+from cache import ReadCache
+from http_cache import conditional_json, make_etag
+
+CATALOG = {'suv': [{'marka': 'Honda', 'model': 'CR-V', 'ozellikler': ['4x4 çekiş'] * 200}]}
+
+
+def make_app(state):
+    app = Flask(__name__)
+    read_cache = ReadCache()
+
+    @app.route('/catalog')
+    def catalog():
+        def build():
+            state['builds'] += 1
+            return CATALOG
+        return conditional_json(request, make_etag('catalog', state['version']), build,
+                                cache=read_cache, cache_key='catalog')
+
+    return app.test_client()
+
+
+def test_not_modified_skips_build():
+    """Test: ETag tutarsa 304 döner ve gövde üretilmez, sürüm değişince yeni etiket gelir"""
+    state = {'version': 1, 'builds': 0}
+    client = make_app(state)
+
+    first = client.get('/catalog')
+    etag = first.headers['ETag']
+    assert first.status_code == 200 and first.json == CATALOG
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    again = client.get('/catalog', headers={'If-None-Match': etag})
+    assert again.status_code == 304 and again.data == b''
+    assert again.headers['ETag'] == etag
+    assert state['builds'] == 1
+
+    state['version'] = 2
+    changed = client.get('/catalog', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
+
+
+def test_gzip_body_is_cached_per_version():
+    """Test: Büyük gövde gzip ile sıkıştırılır ve aynı sürümde tekrar serileştirilmez"""
+    state = {'version': 1, 'builds': 0}
+    client = make_app(state)
+
+    for _ in range(3):
+        response = client.get('/catalog', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert json.loads(gzip.decompress(response.data)) == CATALOG
+    assert state['builds'] == 1
+
+    plain = client.get('/catalog')
+    assert 'Content-Encoding' not in plain.headers and plain.json == CATALOG
+
+
+def test_if_modified_since_alone_is_not_a_validator():
+    """Test: Sadece If-Modified-Since gönderen istemci bayat 304 almaz"""
+    state = {'version': 1, 'builds': 0}
+    client = make_app(state)
+
+    first = client.get('/catalog')
+    assert 'Last-Modified' not in first.headers
+    state['version'] = 2
+    again = client.get('/catalog', headers={'If-Modified-Since': 'Wed, 21 Oct 2099 07:28:00 GMT'})
+    assert again.status_code == 200 and state['builds'] == 2
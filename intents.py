@@ -0,0 +1,137 @@
+"""
+Galeri AI Asistan - Kural Tabanlı Niyet Yönlendirici
+Cevabı katalogda hazır duran sohbet turları (fiyat sorusu, kategori listesi,
+özellik/bütçe filtresi) LLM'e gitmeden doğrudan yanıtlanır. Karşılaştırma,
+öneri gibi açık uçlu sorular veya emin olunamayan mesajlar için None döner;
+bu turlar modele gider. Yönlendirici katalog sürümü başına bir kez kurulur.
+"""
+
+import re
+
+from catalog import format_vehicle, turkish_lower
+from extractor import KeywordMatcher
+
+MAX_MESSAGE_LENGTH = 120  # daha uzun mesajlar genelde birden çok soru içerir
+MAX_LISTED = 5  # filtre yanıtında listelenen araç sayısı
+
+PRICE_WORDS = ['fiyat', 'kaç para', 'kaça', 'ne kadar', 'ücret', 'kaç tl', 'kaç lira']
+LIST_WORDS = ['neler', 'ne var', 'var mı', 'hangi', 'listele', 'seçenek', 'göster', 'mevcut']
+GENERIC_WORDS = ['araç', 'araba', 'model']
+SUPERLATIVES = {'price': ['en ucuz', 'en uygun fiyatlı', 'en hesaplı'], '-price': ['en pahalı']}
+# Bunlardan biri geçiyorsa yorum gerekir - model cevaplar
+OPEN_WORDS = ['hangisi', 'daha', 'karşılaştır', 'öner', 'tavsiye', 'fark', 'bütçe', 'kredi', 'taksit',
+              'indirim', 'takas', 'yakıt', 'yakar', 'tüket', 'neden', 'nasıl', 'randevu']
+CATEGORY_ALIASES = {'otomobil': ['sedan'], 'karavan': ['kamper']}
+
+_AMOUNT = r'(\d+(?:[.,]\d+)*)\s*(milyon|bin)?'
+_BETWEEN_RE = re.compile(_AMOUNT + r'\s*(?:ile|-)\s*' + _AMOUNT + r'\s*(?:tl|lira)?\s*aras')
+_BOUND_RE = re.compile(_AMOUNT + r'\s*(?:tl|lira)?\s*(?:ın|in|un|ün|n)?\s*(alt|kadar|üst|üzer|fazla)')
+_MULTIPLIERS = {'milyon': 1_000_000, 'bin': 1_000}
+
+
+def _variants(name):
+    # 'CR-V' -> cr-v, crv, cr v; 'RAV4' -> rav4
+    name = turkish_lower(name)
+    return {name, name.replace('-', ''), name.replace('-', ' ')}
+
+
+def parse_amount(number, unit):
+    """'1,5' + 'milyon' -> 1500000; birimsiz '850.000' -> 850000"""
+    if unit is None:
+        return int(re.sub(r'[.,]', '', number))
+    return int(float(number.replace(',', '.')) * _MULTIPLIERS[unit])
+
+
+def parse_budget(text):
+    """'1 milyon altı', '900 bin üstü', '1-2 milyon arası' -> (en az, en çok) veya None"""
+    match = _BETWEEN_RE.search(text)
+    if match:
+        low_number, low_unit, high_number, high_unit = match.groups()
+        return parse_amount(low_number, low_unit or high_unit), parse_amount(high_number, high_unit)
+    match = _BOUND_RE.search(text)
+    if match:
+        amount = parse_amount(match.group(1), match.group(2))
+        return (None, amount) if match.group(3) in ('alt', 'kadar') else (amount, None)
+    return None
+
+
+class IntentRouter:
+    """Mesajı katalogdan yanıtlanabilecek bir niyete eşler: route() -> (niyet, yanıt) veya None"""
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.matcher = KeywordMatcher({
+            # Aynı kelime birden çok alanda varsa ilk alan geçerlidir ('suv' özellik değil kategori)
+            'category': {c: [turkish_lower(c), *CATEGORY_ALIASES.get(c, [])] for c in catalog.categories},
+            'model': {m: _variants(m) for m in catalog.values('model')},
+            'brand': {b: _variants(b) for b in catalog.values('marka')},
+            'feature': {f: [turkish_lower(f)] for f in catalog.values('ozellikler')},
+            'superlative': SUPERLATIVES,
+            'price': {True: PRICE_WORDS},
+            'list': {True: LIST_WORDS},
+            'generic': {True: GENERIC_WORDS},
+            'open': {word: [word] for word in OPEN_WORDS},
+        })
+
+    def route(self, message):
+        text = turkish_lower(message.strip())
+        if not text or len(text) > MAX_MESSAGE_LENGTH:
+            return None
+        found = self.matcher.scan(text)
+        superlative = found.get('superlative', set())
+        # "en ucuz SUV hangisi?" katalogdan yanıtlanır, "Corolla mı Civic mi, hangisi?" modele gider
+        open_words = found.get('open', set()) - ({'hangisi'} if superlative else set())
+        if open_words or len(superlative) > 1:
+            return None
+
+        asks_price, asks_list = 'price' in found, 'list' in found
+        models = found.get('model', set())
+        brands = found.get('brand', set())
+        categories = found.get('category', set())
+        budget = parse_budget(text)
+
+        if asks_price and models and not budget:
+            vehicles = [v for model in sorted(models) for v in self.catalog.search(model=model)[0]]
+            return 'price', self._price_reply(vehicles)
+        if superlative or budget or 'feature' in found:
+            if models or len(brands) > 1 or len(categories) > 1:
+                return None
+            return 'filter', self._filter_reply(
+                category=next(iter(categories), None), brand=next(iter(brands), None),
+                features=sorted(found.get('feature', ())), budget=budget, sort=next(iter(superlative), None)
+            )
+        if asks_price and brands and not categories:
+            vehicles = [v for brand in sorted(brands) for v in self.catalog.search(brand=brand)[0]]
+            return 'price', self._price_reply(vehicles)
+        if (asks_list or asks_price) and categories and not models:
+            return 'category', self._category_reply(sorted(categories))
+        if asks_list and 'generic' in found and not (models or brands):
+            return 'catalog', self._category_reply(self.catalog.categories)
+        return None
+
+    def _price_reply(self, vehicles):
+        if len(vehicles) == 1:
+            reply = f"💰 {format_vehicle(vehicles[0])}"
+        else:
+            reply = "Fiyatlar:\n" + "\n".join(f"- {format_vehicle(v)}" for v in vehicles)
+        return reply + "\n\nİncelemek için randevu almak isterseniz isim, telefon, araç tipi, gün ve saat yazmanız yeterli."
+
+    def _filter_reply(self, category, brand, features, budget, sort):
+        min_price, max_price = budget or (None, None)
+        vehicles, total = self.catalog.search(category=category, brand=brand, features=features,
+                                              min_price=min_price, max_price=max_price,
+                                              sort=sort or 'price', limit=1 if sort else MAX_LISTED)
+        if not vehicles:
+            return "Bu kriterlere uygun aracımız şu an yok. Farklı bir bütçe veya özellik deneyebilirsiniz."
+        lines = "\n".join(f"- {format_vehicle(v)} ({v['kategori']})" for v in vehicles)
+        if sort:
+            return f"{'En uygun fiyatlı' if sort == 'price' else 'En pahalı'} seçeneğimiz:\n{lines}"
+        more = f"\n...ve {total - len(vehicles)} araç daha." if total > len(vehicles) else ""
+        return f"Kriterlerinize uyan {total} araç var (fiyata göre):\n{lines}{more}"
+
+    def _category_reply(self, categories):
+        parts = []
+        for category in categories:
+            lines = "\n".join(f"- {format_vehicle(v)}" for v in self.catalog.by_category(category))
+            parts.append(f"🚗 {category.upper()}:\n{lines}")
+        return "\n\n".join(parts) + "\n\nHangisiyle ilgilendiğinizi yazarsanız detay verebilirim."
@@ -0,0 +1,53 @@
+"""
+Galeri AI Asistan - Niyet Yönlendirici Testleri
+"""
+
+from catalog import VehicleCatalog
+from intents import IntentRouter, parse_budget
+
+VEHICLES = {
+    "otomobil": [{"marka": "Toyota", "model": "Corolla", "yil": 2023, "fiyat": 850000, "ozellikler": ["Otomatik"]}],
+    "suv": [
+        {"marka": "Toyota", "model": "RAV4", "yil": 2023, "fiyat": 1250000, "ozellikler": ["Hibrit"]},
+        {"marka": "Honda", "model": "CR-V", "yil": 2023, "fiyat": 1350000, "ozellikler": ["Benzin"]}
+    ]
+}
+router = IntentRouter(VehicleCatalog(VEHICLES))
+
+
+def test_catalogue_questions_are_answered():
+    """Test: Fiyat ve kategori soruları katalogdan yanıtlanır"""
+    intent, reply = router.route("CRV kaç para?")
+    assert intent == 'price' and '₺1,350,000 TL' in reply
+
+    intent, reply = router.route("Toyota fiyatları")
+    assert intent == 'price' and 'Corolla' in reply and 'RAV4' in reply
+
+    intent, reply = router.route("SUV modelleriniz neler?")
+    assert intent == 'category' and 'CR-V' in reply and 'Corolla' not in reply
+
+    assert router.route("Hangi araçlar var?")[0] == 'catalog'
+
+
+def test_open_ended_turns_go_to_llm():
+    """Test: Karşılaştırma, öneri ve belirsiz mesajlar yönlendirilmez"""
+    for message in ["Corolla mı RAV4 mü daha iyi?", "Corolla ne kadar yakar", "Merhaba",
+                    "Bütçem 1 milyon, ne önerirsiniz?", "Corolla fiyatı için randevu alabilir miyim"]:
+        assert router.route(message) is None, message
+
+
+def test_feature_budget_and_superlative_filters():
+    """Test: Özellik, bütçe ve 'en ucuz' soruları katalog indeksinden yanıtlanır"""
+    assert parse_budget("1,3 milyon altı") == (None, 1300000)
+    assert parse_budget("900 bin tl üstü") == (900000, None)
+    assert parse_budget("1-2 milyon arası") == (1000000, 2000000)
+
+    intent, reply = router.route("Hibrit araçlarınız neler?")
+    assert intent == 'filter' and 'RAV4' in reply and 'CR-V' not in reply
+
+    intent, reply = router.route("1,3 milyon altı SUV var mı?")
+    assert intent == 'filter' and 'Kriterlerinize uyan 1 araç' in reply and 'RAV4' in reply
+
+    intent, reply = router.route("En ucuz SUV hangisi?")
+    assert intent == 'filter' and 'RAV4' in reply and 'CR-V' not in reply
+    assert 'yok' in router.route("500 bin altı karavan")[1]
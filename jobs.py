@@ -0,0 +1,260 @@
+"""
+Galeri AI Asistan - Kalıcı İş Kuyruğu
+Giden Twilio aramaları gibi yavaş dış çağrılar HTTP isteği içinde değil,
+yerel SQLite (WAL) kuyruğundaki işler olarak arka plan thread'lerinde
+yürütülür. Kuyruk process yeniden başlasa da kaybolmaz; aynı dosyayı
+kullanan tüm worker'lar işleri güvenle paylaşır.
+
+- Hız sınırı: token bucket, dosyada tutulur - tüm process'ler aynı hesabın
+  saniyelik arama sınırını paylaşır
+- Tekrar deneme: üstel bekleme (backoff * 2^(deneme-1), max_backoff ile sınırlı)
+- Yarıda kalan işler: kira süresi (lease) dolunca başka bir worker yeniden alır;
+  deneme hakkı bitmişse (worker'ı her seferinde çökerten iş) başarısız sayılır
+"""
+
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class PermanentJobError(Exception):
+    """Tekrar denemenin anlamı olmayan hata (ör. geçersiz numara) - iş hemen başarısız olur"""
+
+
+class JobQueue:
+    """SQLite tabanlı iş kuyruğu ve worker havuzu
+
+    handlers: tür -> fonksiyon(payload). Dönen değer işin sonucu olarak saklanır.
+    """
+
+    def __init__(self, path, handlers, workers=2, rate=1.0, burst=1, max_attempts=5, backoff=2.0,
+                 max_backoff=300, lease=120, poll_interval=1.0, retention=7 * 24 * 3600, clock=time.time):
+        self.path = path
+        self.handlers = handlers
+        self.workers = workers
+        self.rate = rate
+        self.burst = burst
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.clock = clock
+        self._local = threading.local()
+        self._wakeup = threading.Condition()
+        self._stop = threading.Event()
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._connect().executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                run_at REAL NOT NULL,
+                lease_until REAL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                result TEXT,
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS jobs_due ON jobs (status, run_at);
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                name TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+        ''')
+
+    def _connect(self):
+        # sqlite bağlantıları thread'ler arası paylaşılamaz
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    # ---------------------------------------------
+    # Public API
+    # ---------------------------------------------
+
+    def enqueue(self, kind, payload, delay=0):
+        """İşi kuyruğa ekle, id döndür - worker'lar çalışmıyorsa başlatılır"""
+        if kind not in self.handlers:
+            raise ValueError(f"bilinmeyen iş türü: {kind}")
+        now = self.clock()
+        job_id = self._connect().execute(
+            'INSERT INTO jobs (kind, payload, status, run_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+            (kind, json.dumps(payload, ensure_ascii=False), 'queued', now + delay, now, now)
+        ).lastrowid
+        self.start()
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id):
+        """İş durumu - yoksa None"""
+        row = self._connect().execute(
+            'SELECT id, kind, status, attempts, run_at, created_at, updated_at, result, error '
+            'FROM jobs WHERE id = ?', (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(('id', 'kind', 'status', 'attempts', 'run_at', 'created_at', 'updated_at',
+                        'result', 'error'), row))
+        job['result'] = json.loads(job['result']) if job['result'] is not None else None
+        return job
+
+    def stats(self):
+        """Durum bazında iş sayıları ve worker sayısı"""
+        counts = dict(self._connect().execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'))
+        return {
+            'queued': counts.get('queued', 0),
+            'running': counts.get('running', 0),
+            'done': counts.get('done', 0),
+            'failed': counts.get('failed', 0),
+            'workers': sum(t.is_alive() for t in self._threads),
+            'rate_per_sec': self.rate
+        }
+
+    def purge(self, before):
+        """before'dan eski, bitmiş işleri sil"""
+        return self._connect().execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed') AND updated_at < ?", (before,)
+        ).rowcount
+
+    def start(self):
+        """Worker thread'lerini başlat (birden fazla çağrılabilir)"""
+        with self._start_lock:
+            if self._threads or self.workers <= 0:
+                return
+            self.purge(self.clock() - self.retention)
+            self._stop.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_pending(self):
+        """Vadesi gelmiş işleri bu thread'de çalıştır (test ve tek seferlik kullanım) - çalışan iş sayısı"""
+        count = 0
+        while True:
+            job, _ = self._claim()
+            if job is None:
+                return count
+            self._run(job)
+            count += 1
+
+    # ---------------------------------------------
+    # Worker
+    # ---------------------------------------------
+
+    def _take_token(self, conn, now):
+        """Paylaşılan bucket'tan bir token al - alınamadıysa beklenecek süre"""
+        row = conn.execute("SELECT tokens, updated_at FROM rate_limits WHERE name = 'jobs'").fetchone()
+        tokens = self.burst if row is None else min(self.burst, row[0] + max(0.0, now - row[1]) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        conn.execute("INSERT OR REPLACE INTO rate_limits (name, tokens, updated_at) VALUES ('jobs', ?, ?)",
+                     (tokens, now))
+        return wait
+
+    def _claim(self):
+        """Vadesi gelmiş ilk işi kirala - (iş, None) veya (None, beklenecek süre)"""
+        conn = self._connect()
+        now = self.clock()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            abandoned = conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, lease_until = NULL, updated_at = ? "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                ('Kira süresi doldu: worker iş bitmeden durdu', now, now, self.max_attempts)
+            ).rowcount
+            if abandoned:
+                logger.warning("Yarıda kalan işler başarısız sayıldı", extra={'jobs': abandoned})
+            row = conn.execute(
+                "SELECT id, kind, payload, attempts FROM jobs "
+                "WHERE (status = 'queued' AND run_at <= ?) OR (status = 'running' AND lease_until < ?) "
+                "ORDER BY run_at, id LIMIT 1", (now, now)
+            ).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None, None
+            wait = self._take_token(conn, now) if self.rate else 0.0
+            if wait:
+                conn.execute('COMMIT')
+                return None, wait
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_until = ?, updated_at = ? "
+                "WHERE id = ?", (now + self.lease, now, row[0])
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return {'id': row[0], 'kind': row[1], 'payload': json.loads(row[2]), 'attempts': row[3] + 1}, None
+
+    def _finish(self, job, status, result=None, error=None, run_at=None):
+        now = self.clock()
+        self._connect().execute(
+            'UPDATE jobs SET status = ?, result = ?, error = ?, run_at = COALESCE(?, run_at), '
+            'lease_until = NULL, updated_at = ? WHERE id = ?',
+            (status, json.dumps(result, ensure_ascii=False) if result is not None else None, error, run_at,
+             now, job['id'])
+        )
+
+    def _run(self, job):
+        try:
+            result = self.handlers[job['kind']](job['payload'])
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if isinstance(e, PermanentJobError) or job['attempts'] >= self.max_attempts:
+                logger.warning("İş başarısız", extra={'job_id': job['id'], 'kind': job['kind'], 'error': error})
+                self._finish(job, 'failed', error=error)
+            else:
+                delay = min(self.max_backoff, self.backoff * 2 ** (job['attempts'] - 1))
+                delay *= random.uniform(0.8, 1.2)  # aynı anda düşen işler aynı anda denenmesin
+                logger.info("İş tekrar denenecek",
+                            extra={'job_id': job['id'], 'attempt': job['attempts'], 'delay': round(delay, 1),
+                                   'error': error})
+                self._finish(job, 'queued', error=error, run_at=self.clock() + delay)
+            return
+        self._finish(job, 'done', result=result)
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                job, wait = self._claim()
+            except sqlite3.Error:
+                logger.exception("İş kuyruğu okunamadı")
+                job, wait = None, self.poll_interval
+            if job is not None:
+                try:
+                    self._run(job)
+                except Exception:
+                    # Sonuç yazılamadı (ör. "database is locked"): thread ölmez, kira dolunca iş yeniden alınır
+                    logger.exception("İş sonucu kaydedilemedi", extra={'job_id': job['id'], 'kind': job['kind']})
+                continue
+            # Boşta: yeni iş eklenince uyanılır, diğer process'lerin işleri poll ile görülür
+            with self._wakeup:
+                self._wakeup.wait(min(wait or self.poll_interval, self.poll_interval * 10))
@@ -0,0 +1,132 @@
+"""
+Galeri AI Asistan - İş Kuyruğu Testleri
+"""
+
+import sqlite3
+import time
+
+import pytest
+
+from jobs import JobQueue, PermanentJobError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_queue(tmp_path, handler, **kwargs):
+    clock = FakeClock()
+    queue = JobQueue(str(tmp_path / 'jobs.db'), {'call': handler}, workers=0, clock=clock, **kwargs)
+    return queue, clock
+
+
+def test_retry_with_backoff_then_done(tmp_path):
+    """Test: Geçici hata üstel beklemeyle tekrar denenir, sonuç saklanır"""
+    failures = [ConnectionError('timeout'), ConnectionError('timeout')]
+
+    def handler(payload):
+        if failures:
+            raise failures.pop(0)
+        return {'call_sid': 'CA1', 'to': payload['to']}
+
+    queue, clock = make_queue(tmp_path, handler, rate=0, backoff=2, max_backoff=60)
+    job_id = queue.enqueue('call', {'to': '+905321234567'})
+    assert queue.get(job_id)['status'] == 'queued'
+
+    assert queue.run_pending() == 1
+    job = queue.get(job_id)
+    assert (job['status'], job['attempts']) == ('queued', 1) and 'timeout' in job['error']
+    assert 1.6 <= job['run_at'] - clock.now <= 2.4
+    assert queue.run_pending() == 0  # vadesi gelmedi
+
+    clock.now += 3
+    queue.run_pending()
+    assert 3.2 <= queue.get(job_id)['run_at'] - clock.now <= 4.8
+
+    clock.now += 5
+    queue.run_pending()
+    job = queue.get(job_id)
+    assert (job['status'], job['attempts']) == ('done', 3)
+    assert job['result'] == {'call_sid': 'CA1', 'to': '+905321234567'}
+    assert queue.stats()['done'] == 1
+
+
+def test_permanent_error_and_attempt_limit(tmp_path):
+    """Test: Kalıcı hata hemen, geçici hata deneme sınırında başarısız olur"""
+    def handler(payload):
+        if payload['to'] == 'geçersiz':
+            raise PermanentJobError('Twilio 400: invalid number')
+        raise ConnectionError('down')
+
+    queue, clock = make_queue(tmp_path, handler, rate=0, max_attempts=2, backoff=1)
+    bad = queue.enqueue('call', {'to': 'geçersiz'})
+    flaky = queue.enqueue('call', {'to': '+905321234567'})
+
+    queue.run_pending()
+    assert queue.get(bad)['status'] == 'failed' and queue.get(bad)['attempts'] == 1
+    clock.now += 10
+    queue.run_pending()
+    assert queue.get(flaky)['status'] == 'failed' and queue.get(flaky)['attempts'] == 2
+
+    with pytest.raises(ValueError):
+        queue.enqueue('sms', {})
+
+
+def test_abandoned_job_fails_at_attempt_limit(tmp_path):
+    """Test: Worker'ı her seferinde çökerten iş kira dolunca deneme sınırında başarısız olur"""
+    queue, clock = make_queue(tmp_path, lambda payload: None, rate=0, max_attempts=2, lease=60)
+    job_id = queue.enqueue('call', {'to': '+905321234567'})
+
+    for attempt in (1, 2):
+        job, _ = queue._claim()  # worker işi aldı ve bitirmeden öldü
+        assert job['attempts'] == attempt
+        clock.now += 61
+    assert queue.run_pending() == 0
+    assert queue.get(job_id)['status'] == 'failed' and queue.get(job_id)['attempts'] == 2
+
+
+def test_rate_limit_is_shared_between_queues(tmp_path):
+    """Test: Aynı dosyayı kullanan kuyruklar saniyelik sınırı paylaşır"""
+    queue, clock = make_queue(tmp_path, lambda payload: None, rate=2, burst=1)
+    other = JobQueue(str(tmp_path / 'jobs.db'), {'call': lambda payload: None}, workers=0, clock=clock,
+                     rate=2, burst=1)
+    for _ in range(3):
+        queue.enqueue('call', {})
+
+    assert queue.run_pending() == 1
+    assert other.run_pending() == 0
+    assert other._claim() == (None, pytest.approx(0.5))
+
+    clock.now += 0.5
+    assert other.run_pending() == 1
+    clock.now += 10  # bucket en fazla burst kadar dolar
+    assert queue.run_pending() == 1
+
+
+def test_worker_survives_finish_error(tmp_path):
+    """Test: Sonuç yazılırken çıkan sqlite hatası worker thread'ini sonlandırmaz"""
+    queue = JobQueue(str(tmp_path / 'jobs.db'), {'call': lambda payload: payload['to']}, workers=1, rate=0,
+                     poll_interval=0.01)
+    finish = queue._finish
+    failures = [sqlite3.OperationalError('database is locked')]
+
+    def flaky_finish(*args, **kwargs):
+        if failures:
+            raise failures.pop()
+        finish(*args, **kwargs)
+
+    queue._finish = flaky_finish
+    try:
+        queue.enqueue('call', {'to': 'ilk'})
+        second = queue.enqueue('call', {'to': 'ikinci'})
+        deadline = time.monotonic() + 5
+        while queue.get(second)['status'] != 'done' and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert queue.get(second)['status'] == 'done'
+        assert queue.stats()['workers'] == 1
+    finally:
+        queue.stop()
@@ -0,0 +1,218 @@
+"""
+Galeri AI Asistan - LLM HTTP İstemcisi
+OpenRouter'a giden tüm istekler tek bir requests.Session üzerinden gider.
+Bağlantılar havuzda tutulup yeniden kullanılır (keep-alive), böylece her
+mesajda yeni TCP + TLS el sıkışması yapılmaz. ASGI yolu için aynı işi
+aiohttp ile yapan AsyncLLMClient de buradadır.
+"""
+
+import asyncio
+import contextlib
+import threading
+import time
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class ConnectionStats:
+    """İstek, yeni bağlantı ve el sıkışma süresi sayaçları"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.handshake_total = 0.0
+        self.handshake_max = 0.0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connect(self, seconds):
+        with self._lock:
+            self.connections += 1
+            self.handshake_total += seconds
+            self.handshake_max = max(self.handshake_max, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            reused = max(self.requests - self.connections, 0)
+            return {
+                'requests': self.requests,
+                'new_connections': self.connections,
+                'reuse_rate': round(reused / self.requests, 4) if self.requests else 0.0,
+                'handshake_ms_avg': round(self.handshake_total / self.connections * 1000, 2) if self.connections else 0.0,
+                'handshake_ms_max': round(self.handshake_max * 1000, 2)
+            }
+
+
+def _timed_connection(connection_cls, stats):
+    """İstekleri sayan ve connect() süresini (TCP + TLS) ölçen bağlantı sınıfı üret
+
+    İstekler bağlantı seviyesinde sayılır: urllib3 Retry tek bir send() içinde
+    yeni bağlantı açtığında her deneme de ayrı istek olarak görülür.
+    """
+
+    class TimedConnection(connection_cls):
+        def connect(self):
+            started = time.perf_counter()
+            super().connect()
+            stats.record_connect(time.perf_counter() - started)
+
+        def request(self, *args, **kwargs):
+            stats.record_request()
+            return super().request(*args, **kwargs)
+
+    return TimedConnection
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """İstekleri, yeni bağlantıları ve el sıkışma süresini sayan HTTPAdapter"""
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+
+        class TimedHTTPConnectionPool(HTTPConnectionPool):
+            ConnectionCls = _timed_connection(HTTPConnection, self.stats)
+
+        class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+            ConnectionCls = _timed_connection(HTTPSConnection, self.stats)
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool
+        }
+
+
+class LLMClient:
+    """Havuzlu, yeniden denemeli OpenRouter istemcisi"""
+
+    def __init__(self, url, headers=None, pool_size=10, max_retries=2, backoff=0.5,
+                 timeout=30, connect_timeout=5):
+        self.url = url
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.stats = ConnectionStats()
+
+        # Okuma zaman aşımları tekrar denenmez - yavaş model yanıtı 2 katına çıkmasın
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,
+            status=max_retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'POST']),
+            raise_on_status=False
+        )
+        adapter = InstrumentedAdapter(
+            self.stats,
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+    def post(self, payload, stream=False, timeout=None):
+        """Chat completion isteği gönder"""
+        return self.session.post(
+            self.url,
+            json=payload,
+            stream=stream,
+            timeout=(self.connect_timeout, timeout or self.timeout)
+        )
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncLLMClient:
+    """asyncio tabanlı, havuzlu OpenRouter istemcisi
+
+    Bekleme sırasında event loop serbest kalır; tek process yüzlerce açık
+    konuşmayı aynı anda taşıyabilir. Oturum ilk kullanımda, çalışan loop
+    içinde oluşturulur.
+    """
+
+    def __init__(self, url, headers=None, pool_size=100, max_retries=2, backoff=0.5,
+                 timeout=30, connect_timeout=5):
+        self.url = url
+        self.headers = dict(headers or {})
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.stats = ConnectionStats()
+        self._session = None
+
+    def _trace_config(self):
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            self.stats.record_request()
+
+        async def on_connection_create_start(session, context, params):
+            context.connect_started = time.perf_counter()
+
+        async def on_connection_create_end(session, context, params):
+            self.stats.record_connect(time.perf_counter() - context.connect_started)
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_start.append(on_connection_create_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        return trace
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60),
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(connect=self.connect_timeout, sock_read=self.timeout),
+                trace_configs=[self._trace_config()]
+            )
+        return self._session
+
+    @contextlib.asynccontextmanager
+    async def post(self, payload):
+        """Chat completion isteği - bağlantı hatası ve 429/5xx geri çekilmeyle tekrar denenir"""
+        session = self._get_session()
+        attempt = 0
+        while True:
+            try:
+                response = await session.post(self.url, json=payload)
+            except aiohttp.ClientConnectorError:
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                if response.status not in RETRY_STATUSES or attempt >= self.max_retries:
+                    break
+                response.release()
+
+            await asyncio.sleep(self.backoff * (2 ** attempt))
+            attempt += 1
+
+        try:
+            yield response
+        finally:
+            response.release()
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
@@ -0,0 +1,69 @@
+"""
+Galeri AI Asistan - LLM İstemcisi Testleri
+"""
+
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from llm_client import LLMClient
+
+
+class FakeOpenRouter(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    fail_next = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        if FakeOpenRouter.fail_next:
+            FakeOpenRouter.fail_next -= 1
+            status, body = 503, b'{}'
+        else:
+            status, body = 200, json.dumps({'choices': [{'message': {'content': 'Merhaba'}}]}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOpenRouter)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_connections_are_reused():
+    """Test: Ardışık istekler aynı bağlantıyı kullanır"""
+    server = start_server()
+    client = LLMClient(f'http://127.0.0.1:{server.server_port}/')
+    try:
+        for _ in range(5):
+            response = client.post({'messages': []})
+            assert response.json()['choices'][0]['message']['content'] == 'Merhaba'
+
+        stats = client.stats.snapshot()
+        assert stats['requests'] == 5
+        assert stats['new_connections'] == 1
+        assert stats['reuse_rate'] == 0.8
+    finally:
+        client.close()
+        server.shutdown()
+
+
+def test_retries_on_server_error():
+    """Test: 503 yanıtı geri çekilmeyle tekrar denenir"""
+    server = start_server()
+    FakeOpenRouter.fail_next = 2
+    client = LLMClient(f'http://127.0.0.1:{server.server_port}/', max_retries=2, backoff=0)
+    try:
+        assert client.post({'messages': []}).status_code == 200
+        stats = client.stats.snapshot()
+        assert stats['requests'] == 3  # her deneme ayrı istek
+        assert stats['requests'] >= stats['new_connections']
+    finally:
+        client.close()
+        server.shutdown()
@@ -0,0 +1,112 @@
+"""
+Galeri AI Asistan - Loglama Ayarları
+Tüm modüller logging.getLogger(__name__) kullanır. Kayıtlar istek
+thread'inde sadece kuyruğa atılır; stdout'a yazma ayrı bir QueueListener
+thread'inde yapılır. Seviye LOG_LEVEL ile, biçim LOG_FORMAT (text/json)
+ile seçilir. Kapalı seviyedeki çağrılar (logger.debug) hiç biçimlendirilmez.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+# LogRecord'un kendi alanları - geri kalanlar extra= ile gelen yapısal alanlardır
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener = None
+
+
+def record_fields(record):
+    """extra= ile eklenmiş alanlar"""
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_FIELDS}
+
+
+class StructuredFormatter(logging.Formatter):
+    """Mesaj + yapısal alanlar: text modunda key=value, json modunda tek satır JSON"""
+
+    def __init__(self, json_output=False):
+        super().__init__('%(asctime)s %(levelname)s %(name)s %(message)s')
+        self.json_output = json_output
+
+    def format(self, record):
+        fields = record_fields(record)
+        if not self.json_output:
+            line = super().format(record)
+            if fields:
+                line += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+            return line
+
+        data = {
+            'ts': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            **fields
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exc'] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """Traceback'i metin olarak listener'a taşıyan QueueHandler
+
+    Standart prepare mesajı traceback ile birleştirip exc_info/exc_text'i siler;
+    JSON biçimleyici 'exc' alanını hiç göremezdi. Burada sadece mesaj birleştirilir,
+    traceback exc_text olarak kalır (traceback nesneleri kuyrukta tutulmaz).
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(level=None, json_output=None, stream=None):
+    """Kök logger'a kuyruk handler'ı bağla ve yazıcı thread'i başlat (tekrar çağrılırsa yeniden kurar)"""
+    global _listener
+
+    level = level or os.getenv('LOG_LEVEL', 'INFO')
+    if json_output is None:
+        json_output = os.getenv('LOG_FORMAT', 'text') == 'json'
+
+    stop_logging()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(StructuredFormatter(json_output))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = StructuredQueueHandler(log_queue)
+    queue_handler.galeri = True
+
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """Kuyruktaki kayıtları yazıp yazıcı thread'i durdur"""
+    global _listener
+    root = logging.getLogger()
+    root.handlers = [h for h in root.handlers if not getattr(h, 'galeri', False)]
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
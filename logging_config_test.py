@@ -0,0 +1,65 @@
+"""
+Galeri AI Asistan - Loglama Ayarları Testleri
+"""
+
+import io
+import json
+import logging
+
+from logging_config import setup_logging, stop_logging
+
+
+class Loud:
+    """Biçimlendirilirse sayaç artırır"""
+    calls = 0
+
+    def __repr__(self):
+        Loud.calls += 1
+        return 'loud'
+
+    __str__ = __repr__
+
+
+def test_json_records_go_through_queue():
+    """Test: Kayıtlar kuyruk üzerinden yapısal JSON olarak yazılır"""
+    stream = io.StringIO()
+    setup_logging(level='INFO', json_output=True, stream=stream)
+    try:
+        logging.getLogger('galeri.test').info("Randevu oluşturuldu: %s", 7, extra={'source': 'chat'})
+    finally:
+        stop_logging()
+
+    line = json.loads(stream.getvalue().strip().splitlines()[-1])
+    assert line['msg'] == 'Randevu oluşturuldu: 7'
+    assert line['level'] == 'INFO'
+    assert line['source'] == 'chat'
+
+
+def test_json_exception_keeps_traceback():
+    """Test: logger.exception kaydında traceback kuyruktan sonra 'exc' alanına yazılır"""
+    stream = io.StringIO()
+    setup_logging(level='INFO', json_output=True, stream=stream)
+    try:
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logging.getLogger('galeri.test').exception("Genel hata")
+    finally:
+        stop_logging()
+
+    line = json.loads(stream.getvalue().strip().splitlines()[-1])
+    assert line['msg'] == 'Genel hata'
+    assert 'ZeroDivisionError' in line['exc']
+
+
+def test_disabled_debug_does_not_format():
+    """Test: Debug kapalıyken argümanlar hiç biçimlendirilmez"""
+    stream = io.StringIO()
+    setup_logging(level='INFO', stream=stream)
+    try:
+        logging.getLogger('galeri.test').debug("bilgi: %s", Loud())
+    finally:
+        stop_logging()
+
+    assert Loud.calls == 0
+    assert stream.getvalue() == ''
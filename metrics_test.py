@@ -0,0 +1,43 @@
+"""
+Galeri AI Asistan - Metrik Testleri
+"""
+
+from metrics import Registry
+
+
+def test_exposition_format():
+    """Test: Sayaç, histogram ve gauge Prometheus metin formatında yazılır"""
+    registry = Registry()
+    requests_total = registry.counter('http_requests_total', 'İstek sayısı', ('route', 'status'))
+    duration = registry.histogram('stage_seconds', 'Aşama süresi', ('stage',), buckets=(0.1, 1))
+    registry.gauge('sessions', 'Oturum sayısı', lambda: {('voice',): 3}, ('store',))
+
+    requests_total.inc('/api/"x"', '200')
+    requests_total.inc('/api/"x"', '200')
+    duration.observe(0.05, 'llm')
+    duration.observe(0.1, 'llm')  # sınır değeri kendi kovasına girer
+    duration.observe(7, 'llm')
+
+    text = registry.expose()
+    assert '# TYPE http_requests_total counter' in text
+    assert 'http_requests_total{route="/api/\\"x\\"",status="200"} 2' in text
+    assert 'stage_seconds_bucket{stage="llm",le="0.1"} 2' in text
+    assert 'stage_seconds_bucket{stage="llm",le="1"} 2' in text
+    assert 'stage_seconds_bucket{stage="llm",le="+Inf"} 3' in text
+    assert 'stage_seconds_sum{stage="llm"} 7.15' in text
+    assert 'stage_seconds_count{stage="llm"} 3' in text
+    assert 'sessions{store="voice"} 3' in text
+    assert text.endswith('\n')
+
+
+def test_histogram_timer():
+    """Test: time() hata durumunda da süreyi kaydeder"""
+    duration = Registry().histogram('stage_seconds', 'Aşama süresi', ('stage',))
+    with duration.time('storage_read'):
+        pass
+    try:
+        with duration.time('twilio'):
+            raise ConnectionError
+    except ConnectionError:
+        pass
+    assert duration.count('storage_read') == 1 and duration.count('twilio') == 1
@@ -0,0 +1,208 @@
+"""
+Galeri AI Asistan - LLM Yanıt Önbelleği
+Aynı katalog için aynı soruların ("SUV'larınız neler?") yanıtı modelden bir
+kez alınır. Anahtar: sistem mesajı sürümü + normalize edilmiş kullanıcı
+turları. Sürüm değişince (katalog güncellendi) önbellek tamamen boşaltılır.
+
+- Tam eşleşme: normalize metin sözlükte aranır
+- Yakın eşleşme (isteğe bağlı): karakter trigram Jaccard benzerliği; aday
+  kayıtlar trigram indeksinden bulunur, tüm önbellek taranmaz
+- Düşürme: LRU (max_entries) + yaşam süresi (ttl)
+- Kalıcılık: JSON dosyası, yazma aralığıyla sınırlı ve os.replace ile atomik
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from catalog import turkish_lower
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+TURN_SEPARATOR = ' | '
+
+
+def normalize(text):
+    """Büyük/küçük harf, noktalama ve boşluk farklarını sil"""
+    return _SPACE_RE.sub(' ', _PUNCTUATION_RE.sub(' ', turkish_lower(text))).strip()
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ResponseCache:
+    """Sürüm + kullanıcı turları -> yanıt; tam ve yakın eşleşme, LRU/TTL, disk kalıcılığı
+
+    near_threshold 0 ise yakın eşleşme kapalıdır (yalnızca tam eşleşme).
+    """
+
+    def __init__(self, max_entries=1000, ttl=6 * 3600, near_threshold=0.0, path=None, save_interval=30,
+                 clock=time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.near_threshold = near_threshold
+        self.path = path
+        self.save_interval = save_interval
+        self.clock = clock
+        self.version = None
+        self._entries = OrderedDict()  # normalize metin -> (yanıt, son kullanma zamanı)
+        self._index = {}  # trigram -> {metin}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved_at = clock()
+        self.hits = self.near_hits = self.misses = 0
+        if path:
+            self._load()
+
+    @staticmethod
+    def key(turns):
+        return TURN_SEPARATOR.join(normalize(turn) for turn in turns)
+
+    # ---------------------------------------------
+    # Public API
+    # ---------------------------------------------
+
+    def get(self, version, turns):
+        """Önbellekteki yanıt - yoksa None"""
+        text = self.key(turns)
+        with self._lock:
+            self._check_version(version)
+            entry = self._lookup(text)
+            if entry is not None:
+                self.hits += 1
+                return entry
+            if self.near_threshold:
+                match = self._nearest(text)
+                entry = self._lookup(match) if match is not None else None
+                if entry is not None:
+                    self.near_hits += 1
+                    return entry
+            self.misses += 1
+            return None
+
+    def put(self, version, turns, response):
+        text = self.key(turns)
+        with self._lock:
+            self._check_version(version)
+            if text in self._entries:
+                self._entries.move_to_end(text)
+            else:
+                self._add_to_index(text)
+            self._entries[text] = (response, self.clock() + self.ttl)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            self._dirty = True
+            due = self.path and self.clock() - self._saved_at >= self.save_interval
+        if due:
+            self.save()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._index.clear()
+            self._dirty = True
+
+    def save(self):
+        """Değişiklik varsa dosyaya yaz (geçici dosya + os.replace)"""
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+            snapshot = {'version': self.version,
+                        'entries': [[text, response, expires] for text, (response, expires) in self._entries.items()]}
+            self._dirty = False
+            self._saved_at = self.clock()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.response_cache.')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            logger.exception("Yanıt önbelleği yazılamadı")
+            os.unlink(tmp_path)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.near_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'near_hits': self.near_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.near_hits) / lookups, 4) if lookups else 0.0
+            }
+
+    # ---------------------------------------------
+    # İç yardımcılar (kilit altında çağrılır)
+    # ---------------------------------------------
+
+    def _check_version(self, version):
+        if version != self.version:
+            if self._entries:
+                logger.info("Katalog değişti, yanıt önbelleği boşaltıldı", extra={'entries': len(self._entries)})
+            self._entries.clear()
+            self._index.clear()
+            self.version = version
+            self._dirty = True
+
+    def _lookup(self, text):
+        entry = self._entries.get(text)
+        if entry is None:
+            return None
+        if entry[1] <= self.clock():
+            self._remove(text)
+            return None
+        self._entries.move_to_end(text)
+        return entry[0]
+
+    def _nearest(self, text):
+        grams = trigrams(text)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._index.get(gram, ()))
+        best, best_score = None, self.near_threshold
+        for candidate, common in shared.items():
+            score = common / (len(grams) + len(trigrams(candidate)) - common)
+            if score >= best_score:
+                best, best_score = candidate, score
+        return best
+
+    def _add_to_index(self, text):
+        if self.near_threshold:
+            for gram in trigrams(text):
+                self._index.setdefault(gram, set()).add(text)
+
+    def _remove(self, text):
+        self._entries.pop(text, None)
+        if self.near_threshold:
+            for gram in trigrams(text):
+                keys = self._index.get(gram)
+                if keys is not None:
+                    keys.discard(text)
+                    if not keys:
+                        del self._index[gram]
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            logger.warning("Yanıt önbelleği okunamadı, boş başlanıyor", extra={'path': self.path})
+            return
+        now = self.clock()
+        self.version = snapshot.get('version')
+        for text, response, expires in snapshot.get('entries', [])[-self.max_entries:]:
+            if expires > now:
+                self._entries[text] = (response, expires)
+                self._add_to_index(text)
@@ -0,0 +1,62 @@
+"""
+Galeri AI Asistan - LLM Yanıt Önbelleği Testleri
+"""
+
+from response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_exact_match_lru_ttl_and_version():
+    """Test: Normalize tam eşleşme, LRU/TTL düşürme ve katalog sürümüyle boşalma"""
+    clock = FakeClock()
+    cache = ResponseCache(max_entries=2, ttl=60, clock=clock)
+    cache.put('v1', ["SUV'larınız neler?"], 'RAV4 ve CR-V')
+    assert cache.get('v1', ["suv larınız   NELER"]) == 'RAV4 ve CR-V'
+    assert cache.get('v1', ["Merhaba", "SUV'larınız neler?"]) is None  # turlar anahtarın parçası
+
+    cache.put('v1', ['en ucuz araç'], 'Corolla')
+    cache.get('v1', ["SUV'larınız neler?"])
+    cache.put('v1', ['karavan var mı'], 'Marco Polo')  # en eski kullanılan düşer
+    assert cache.get('v1', ['en ucuz araç']) is None
+    assert cache.get('v1', ["SUV'larınız neler?"]) == 'RAV4 ve CR-V'
+
+    clock.now += 61
+    assert cache.get('v1', ['karavan var mı']) is None
+
+    cache.put('v1', ['karavan var mı'], 'Marco Polo')
+    assert cache.get('v2', ['karavan var mı']) is None  # katalog değişti
+    assert cache.stats()['size'] == 0
+
+
+def test_near_match_and_persistence(tmp_path):
+    """Test: Yakın eşleşme eşik üstünde bulunur, kayıtlar diskten geri yüklenir"""
+    path = str(tmp_path / 'response_cache.json')
+    cache = ResponseCache(near_threshold=0.7, path=path)
+    cache.put('v1', ['en ucuz araç hangisi'], 'Toyota Corolla')
+    assert cache.get('v1', ['en ucuz araç hangisi acaba']) == 'Toyota Corolla'
+    assert cache.get('v1', ['en pahalı karavan']) is None
+    assert cache.stats()['near_hits'] == 1
+    cache.save()
+
+    restored = ResponseCache(near_threshold=0.7, path=path)
+    assert restored.get('v1', ['En ucuz araç hangisi?']) == 'Toyota Corolla'
+    assert restored.get('v1', ['en ucuz araç hangisi acaba']) == 'Toyota Corolla'
+    assert ResponseCache(path=path).get('v2', ['en ucuz araç hangisi']) is None
+
+
+def test_expired_near_match_counts_as_miss():
+    """Test: Süresi dolmuş yakın eşleşme isabet sayılmaz"""
+    clock = FakeClock()
+    cache = ResponseCache(ttl=60, near_threshold=0.7, clock=clock)
+    cache.put('v1', ['en ucuz araç hangisi'], 'Toyota Corolla')
+    clock.now += 61
+    assert cache.get('v1', ['en ucuz araç hangisi acaba']) is None
+    stats = cache.stats()
+    assert (stats['near_hits'], stats['misses']) == (0, 1)
@@ -0,0 +1,365 @@
+"""
+Galeri AI Asistan - Oturum Deposu
+Sohbet (conversations) ve sesli arama (voice_sessions) oturumları için
+sınırlı boyutlu depo: LRU + boşta kalma süresi (TTL) + bellek tavanı.
+Backend değiştirilebilir: process içi bellek veya worker'lar arasında
+paylaşılan yerel SQLite dosyası (Redis yerine geçen hafif çözüm).
+
+Oturum değerleri sözlük yerine __slots__ sınıflarıdır (Message, VoiceSession):
+nesne başına ~140 byte sözlük tablosu tutulmaz, rol metinleri tüm oturumlarca
+paylaşılır. Katalog içeren sistem mesajı oturumda saklanmaz; istek hazırlanırken
+katalog sürümü başına tek kopya olan metin başa eklenir.
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+class Message:
+    """Sohbet mesajı - eski kod ve ConversationWindow için sözlük gibi de okunur"""
+    __slots__ = ('role', 'content')
+
+    def __init__(self, role, content):
+        self.role = sys.intern(role)  # 'user'/'assistant' tüm mesajlarda aynı nesne
+        self.content = content
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, sys.intern(value) if key == 'role' else value)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def to_dict(self):
+        """OpenRouter / JSON formatı"""
+        return {'role': self.role, 'content': self.content}
+
+    def __eq__(self, other):
+        if isinstance(other, (Message, dict)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, Message) else other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f'Message({self.role!r}, {self.content!r})'
+
+
+class VoiceSession:
+    """Sesli arama oturumu"""
+    __slots__ = ('conversation_history', 'collected_info', 'step', 'caller')
+
+    def __init__(self, caller, step='greeting', collected_info=None, conversation_history=None):
+        self.caller = caller
+        self.step = sys.intern(step)
+        self.collected_info = collected_info if collected_info is not None else {}
+        self.conversation_history = conversation_history if conversation_history is not None else []
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __eq__(self, other):
+        return isinstance(other, VoiceSession) and self.to_dict() == other.to_dict()
+
+
+def encode_value(value):
+    """Slots nesnelerini JSON'a sözlük olarak yaz (json.dumps default)"""
+    if isinstance(value, (Message, VoiceSession)):
+        return value.to_dict()
+    raise TypeError(f"{type(value).__name__} JSON'a çevrilemez")
+
+
+def decode_value(obj):
+    """json.loads object_hook - alan kümesinden sınıfı geri kur"""
+    keys = obj.keys()
+    if keys == {'role', 'content'}:
+        return Message(obj['role'], obj['content'])
+    if keys == set(VoiceSession.__slots__):
+        return VoiceSession(**obj)
+    return obj
+
+
+# Depodaki kayıt başına sabit yük: [değer, son_erişim, boyut] listesi, float, int ve
+# OrderedDict girdisi (tracemalloc ile ölçüldü, 10 bin kayıtta ~170 byte)
+ENTRY_OVERHEAD = 170
+
+
+def estimate_size(value):
+    """Oturum değerinin yaklaşık bellek boyutu (byte) - iç içe sys.getsizeof toplamı
+
+    Türkçe karakterli metinler karakter başına 2 byte tutar; getsizeof bunu da sayar.
+    Paylaşılan (intern edilmiş) rol ve adım metinleri sayılmaz.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, Message):
+        return size + estimate_size(value.content)
+    if isinstance(value, VoiceSession):
+        return size + sum(estimate_size(getattr(value, field)) for field in VoiceSession.__slots__
+                          if field != 'step')
+    if isinstance(value, dict):
+        return size + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return size + sum(estimate_size(v) for v in value)
+    return size
+
+
+class MemorySessionBackend:
+    """Process içi backend - OrderedDict sırası aynı zamanda LRU sırasıdır"""
+
+    def __init__(self):
+        self._data = OrderedDict()  # anahtar -> [değer, son_erişim, boyut]
+        self._bytes = 0
+
+    def get(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            return None, None
+        last_access = entry[1]
+        entry[1] = now
+        self._data.move_to_end(key)
+        return entry[0], last_access
+
+    def set(self, key, value, size, now):
+        old = self._data.pop(key, None)
+        if old is not None:
+            self._bytes -= old[2]
+        self._data[key] = [value, now, size]
+        self._bytes += size
+
+    def delete(self, key):
+        old = self._data.pop(key, None)
+        if old is not None:
+            self._bytes -= old[2]
+        return old is not None
+
+    def count(self):
+        return len(self._data)
+
+    def total_bytes(self):
+        return self._bytes
+
+    def evict(self, max_entries, max_bytes, idle_before):
+        """En eski oturumlardan başlayarak sil - {sebep: sayı} döndürür"""
+        evicted = {'ttl': 0, 'lru': 0, 'memory': 0}
+        while self._data:
+            key, (value, last_access, size) = next(iter(self._data.items()))
+            if last_access < idle_before:
+                reason = 'ttl'
+            elif len(self._data) > max_entries:
+                reason = 'lru'
+            elif self._bytes > max_bytes:
+                reason = 'memory'
+            else:
+                break
+            self.delete(key)
+            evicted[reason] += 1
+        return evicted
+
+
+class SqliteSessionBackend:
+    """Yerel SQLite (WAL) backend - tüm gunicorn worker'ları aynı oturumları görür"""
+
+    def __init__(self, path, namespace):
+        self.path = path
+        self.namespace = namespace
+        self._local = threading.local()
+        self._connect().executescript('''
+            CREATE TABLE IF NOT EXISTS sessions (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            );
+            CREATE INDEX IF NOT EXISTS sessions_by_access ON sessions (namespace, last_access);
+        ''')
+
+    def _connect(self):
+        # sqlite bağlantıları thread'ler arası paylaşılamaz
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, now):
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT value, last_access FROM sessions WHERE namespace = ? AND key = ?',
+            (self.namespace, key)
+        ).fetchone()
+        if row is None:
+            return None, None
+        conn.execute(
+            'UPDATE sessions SET last_access = ? WHERE namespace = ? AND key = ?',
+            (now, self.namespace, key)
+        )
+        return json.loads(row[0], object_hook=decode_value), row[1]
+
+    def set(self, key, value, size, now):
+        self._connect().execute(
+            'INSERT OR REPLACE INTO sessions (namespace, key, value, size, last_access) VALUES (?, ?, ?, ?, ?)',
+            (self.namespace, key, json.dumps(value, ensure_ascii=False, default=encode_value), size, now)
+        )
+
+    def delete(self, key):
+        cursor = self._connect().execute(
+            'DELETE FROM sessions WHERE namespace = ? AND key = ?', (self.namespace, key)
+        )
+        return cursor.rowcount > 0
+
+    def count(self):
+        return self._connect().execute(
+            'SELECT COUNT(*) FROM sessions WHERE namespace = ?', (self.namespace,)
+        ).fetchone()[0]
+
+    def total_bytes(self):
+        return self._connect().execute(
+            'SELECT COALESCE(SUM(size), 0) FROM sessions WHERE namespace = ?', (self.namespace,)
+        ).fetchone()[0]
+
+    def evict(self, max_entries, max_bytes, idle_before):
+        conn = self._connect()
+        evicted = {'ttl': 0, 'lru': 0, 'memory': 0}
+
+        evicted['ttl'] = conn.execute(
+            'DELETE FROM sessions WHERE namespace = ? AND last_access < ?', (self.namespace, idle_before)
+        ).rowcount
+
+        excess = self.count() - max_entries
+        if excess > 0:
+            evicted['lru'] = conn.execute(
+                'DELETE FROM sessions WHERE rowid IN ('
+                'SELECT rowid FROM sessions WHERE namespace = ? ORDER BY last_access LIMIT ?)',
+                (self.namespace, excess)
+            ).rowcount
+
+        overflow = self.total_bytes() - max_bytes
+        if overflow > 0:
+            victims = []
+            for key, size in conn.execute(
+                'SELECT key, size FROM sessions WHERE namespace = ? ORDER BY last_access', (self.namespace,)
+            ):
+                victims.append(key)
+                overflow -= size
+                if overflow <= 0:
+                    break
+            for key in victims:
+                self.delete(key)
+            evicted['memory'] = len(victims)
+
+        return evicted
+
+
+class SessionStore:
+    """Sözlük gibi kullanılan, sınırlı ve süreli oturum deposu
+
+    Değerler yerinde değiştirildiyse paylaşılan backend'lerde görünmesi için
+    store[key] = value ile geri yazılmalıdır.
+    """
+
+    def __init__(self, backend=None, max_entries=10000, idle_ttl=1800,
+                 max_bytes=64 * 1024 * 1024, sweep_interval=30, clock=time.time):
+        self.backend = backend or MemorySessionBackend()
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._last_sweep = clock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {'ttl': 0, 'lru': 0, 'memory': 0}
+
+    def _record_evictions(self, evicted):
+        for reason, count in evicted.items():
+            self.evictions[reason] += count
+
+    def sweep(self):
+        """Süresi dolan ve sınırı aşan oturumları temizle"""
+        with self._lock:
+            now = self.clock()
+            self._last_sweep = now
+            self._record_evictions(
+                self.backend.evict(self.max_entries, self.max_bytes, now - self.idle_ttl)
+            )
+
+    def get(self, key, default=None):
+        with self._lock:
+            now = self.clock()
+            value, last_access = self.backend.get(key, now)
+            if value is not None and last_access < now - self.idle_ttl:
+                self.backend.delete(key)
+                self.evictions['ttl'] += 1
+                value = None
+
+            if value is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            now = self.clock()
+            size = estimate_size(value) + sys.getsizeof(key) + ENTRY_OVERHEAD
+            self.backend.set(key, value, size, now)
+            if (self.backend.count() > self.max_entries
+                    or now - self._last_sweep >= self.sweep_interval):
+                self.sweep()
+            elif self.backend.total_bytes() > self.max_bytes:
+                self.sweep()
+
+    def __delitem__(self, key):
+        with self._lock:
+            if not self.backend.delete(key):
+                raise KeyError(key)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            value = self.get(key)
+            if value is None:
+                return default
+            self.backend.delete(key)
+            return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return self.backend.count()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.backend.count(),
+                'bytes': self.backend.total_bytes(),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': dict(self.evictions)
+            }
+
+
+def create_session_store(namespace, backend='memory', db_path=None, **kwargs):
+    """Ayarlara göre oturum deposu oluştur"""
+    if backend == 'sqlite':
+        return SessionStore(SqliteSessionBackend(db_path, namespace), **kwargs)
+    return SessionStore(MemorySessionBackend(), **kwargs)
@@ -0,0 +1,122 @@
+"""
+Galeri AI Asistan - Oturum Deposu Testleri
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from sessions import Message, SessionStore, SqliteSessionBackend, VoiceSession, create_session_store
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction():
+    """Test: Kapasite aşılınca en uzun süredir kullanılmayan oturum düşer"""
+    store = SessionStore(max_entries=2)
+    store['a'] = [1]
+    store['b'] = [2]
+    assert store.get('a') == [1]  # 'a' yeniden kullanıldı
+    store['c'] = [3]
+
+    assert store.get('b') is None
+    assert store.get('a') == [1] and store.get('c') == [3]
+    assert store.stats()['evictions']['lru'] == 1
+
+
+def test_idle_ttl_eviction():
+    """Test: Boşta kalma süresi dolan oturum düşer"""
+    clock = FakeClock()
+    store = SessionStore(idle_ttl=60, sweep_interval=10, clock=clock)
+    store['old'] = {'step': 'greeting'}
+    clock.now += 30
+    store['fresh'] = {'step': 'greeting'}
+    clock.now += 45
+
+    assert store.get('old') is None
+    assert store.get('fresh') == {'step': 'greeting'}
+    assert store.stats()['evictions']['ttl'] == 1
+
+
+def test_memory_ceiling():
+    """Test: Toplam boyut tavanı aşılınca eski oturumlar düşer"""
+    store = SessionStore(max_bytes=2000)
+    for i in range(10):
+        store[str(i)] = [{'role': 'user', 'content': 'x' * 300}]
+
+    stats = store.stats()
+    assert stats['bytes'] <= 2000
+    assert stats['evictions']['memory'] > 0
+    assert store.get('9') is not None
+
+
+def test_sqlite_backend_is_shared(tmp_path):
+    """Test: SQLite backend'i kullanan iki depo (iki worker) aynı oturumları görür"""
+    db_path = str(tmp_path / 'sessions.db')
+    worker_a = create_session_store('conversations', backend='sqlite', db_path=db_path)
+    worker_b = create_session_store('conversations', backend='sqlite', db_path=db_path)
+    voice = create_session_store('voice', backend='sqlite', db_path=db_path)
+
+    worker_a['user-1'] = [{'role': 'user', 'content': 'Merhaba'}]
+    assert worker_b.get('user-1') == [{'role': 'user', 'content': 'Merhaba'}]
+    assert voice.get('user-1') is None
+
+    worker_b.pop('user-1')
+    assert 'user-1' not in worker_a
+
+
+def test_sqlite_backend_eviction(tmp_path):
+    """Test: SQLite backend'inde LRU ve TTL temizliği"""
+    clock = FakeClock()
+    store = SessionStore(SqliteSessionBackend(str(tmp_path / 'sessions.db'), 'voice'),
+                         max_entries=2, idle_ttl=60, clock=clock)
+    store['a'] = {'n': 1}
+    clock.now += 1
+    store['b'] = {'n': 2}
+    clock.now += 1
+    store['c'] = {'n': 3}
+    assert store.get('a') is None and len(store) == 2
+
+    clock.now += 120
+    store.sweep()
+    assert len(store) == 0
+
+
+def test_compact_sessions_round_trip(tmp_path):
+    """Test: Message/VoiceSession rolleri paylaşır, SQLite backend'inden aynı sınıfla döner"""
+    history = [Message(''.join(['us', 'er']), 'Merhaba'), Message('assistant', 'Hoş geldiniz')]
+    assert history[0].role is sys.intern('user') and history[0]['content'] == 'Merhaba'
+    assert history[0] == {'role': 'user', 'content': 'Merhaba'}
+
+    store = create_session_store('voice', backend='sqlite', db_path=str(tmp_path / 'sessions.db'))
+    store['chat'] = history
+    store['call'] = VoiceSession('+905551112233', step='waiting_phone', collected_info={'name': 'Ahmet'})
+
+    loaded = store.get('chat')
+    assert [type(m) for m in loaded] == [Message, Message] and loaded == history
+    call = store.get('call')
+    assert call.step == 'waiting_phone' and call.collected_info == {'name': 'Ahmet'}
+    assert call.conversation_history == []
+
+
+def test_size_estimate_tracks_measured_memory():
+    """Test: Tahmini boyut tracemalloc ölçümünden en fazla %15 sapar (Türkçe metin dahil)"""
+    store = SessionStore(max_entries=10 ** 6, max_bytes=1 << 40)
+    gc.collect()
+    tracemalloc.start()
+    for i in range(2000):
+        store[f'kullanıcı-{i}'] = [Message(''.join(['us', 'er']), f"Yarın öğleden sonra gelebilir miyim? #{i}"),
+                                   Message('assistant', f"Tabii, isim ve telefon bilgilerinizi yazın. #{i}")]
+        store[f'CA{i:032d}'] = VoiceSession(f'+90555{i}', step='waiting_phone',
+                                            collected_info={'name': f'Ahmet Yılmaz {i}'},
+                                            conversation_history=[f'Ahmet Yılmaz {i}'])
+    gc.collect()
+    measured = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert abs(store.stats()['bytes'] - measured) / measured < 0.15
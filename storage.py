@@ -0,0 +1,612 @@
+"""
+Galeri AI Asistan - Randevu Deposu
+Randevular append-only bir log dosyasında saklanır, bellekte id -> kayıt
+indeksi tutulur. Her yazma işlemi log'a tek satır ekler (O(1)), tüm dosya
+yeniden yazılmaz. Birden fazla process aynı log'u paylaşabilir.
+"""
+
+import abc
+import bisect
+import collections
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows - sadece thread kilidi kullanılır
+    fcntl = None
+
+
+# İkincil indeksi tutulan alanlar - eşitlik filtreleri, date ayrıca aralık filtresi
+INDEXED_FIELDS = ('status', 'vehicle_type', 'callback_requested', 'date')
+
+
+def index_value(record, field):
+    """Kaydın indeks anahtarı; callback_requested olmayan kayıtlar False sayılır"""
+    value = record.get(field)
+    if field == 'callback_requested':
+        return bool(value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+# Bu durumdaki randevular saat doldurmaz
+SLOT_FREE_STATUSES = ('cancelled',)
+
+
+class SlotUnavailable(Exception):
+    """İstenen tarih/saat/araç tipi kapasitesi dolu"""
+
+    def __init__(self, slot):
+        super().__init__(f"randevu saati dolu: {slot[0]} {slot[1]} ({slot[2]})")
+        self.slot = slot
+
+
+def slot_key(record):
+    """(tarih, saat, araç tipi) - saat tutmayan kayıtlar (geri arama, iptal) için None"""
+    if record.get('callback_requested') or record.get('status') in SLOT_FREE_STATUSES:
+        return None
+    date, time_, vehicle_type = record.get('date'), record.get('time'), record.get('vehicle_type')
+    if not isinstance(date, str) or not isinstance(time_, str):
+        return None
+    return date, time_, vehicle_type
+
+
+def matches(record, filters):
+    """Kayıt filtreleri sağlıyor mu - date_from/date_to dahil sınırlardır"""
+    for field, expected in filters.items():
+        if field == 'date_from':
+            if not isinstance(record.get('date'), str) or record['date'] < expected:
+                return False
+        elif field == 'date_to':
+            if not isinstance(record.get('date'), str) or record['date'] > expected:
+                return False
+        elif index_value(record, field) != expected:
+            return False
+    return True
+
+
+def _page(candidates, filters, limit):
+    """Aday kayıtlardan filtreye uyan ilk limit kadarını ve sonraki imleci al"""
+    page = list(itertools.islice((r for r in candidates if matches(r, filters)), limit + 1))
+    if len(page) > limit:
+        return page[:limit], page[limit - 1]['id'] if limit else None
+    return page, None
+
+
+class AppointmentStore(abc.ABC):
+    """Randevu deposu arayüzü - farklı backend'ler bu sınıfı uygular
+
+    Soyut metotlardan biri eksik olan backend daha oluşturulurken TypeError verir.
+    """
+
+    @abc.abstractmethod
+    def get(self, appointment_id):
+        """Kayıt - yoksa None"""
+
+    @abc.abstractmethod
+    def all(self):
+        """Tüm kayıtlar (eklenme sırasıyla)"""
+
+    @abc.abstractmethod
+    def insert(self, record, capacity=None):
+        """Yeni kayıt ekle, id ata; kapasite doluysa SlotUnavailable"""
+
+    @abc.abstractmethod
+    def update(self, appointment_id, changes, capacity=None):
+        """Alanları güncelle - kayıt yoksa None"""
+
+    @abc.abstractmethod
+    def delete(self, appointment_id):
+        """Kaydı sil, silinen kaydı döndür - yoksa None"""
+
+    def query(self, filters=None, after=None, limit=50, descending=False):
+        """id sırasıyla filtreli sayfa: (kayıtlar, sonraki imleç veya None)
+
+        after bir önceki sayfanın imlecidir (son kaydın id'si). Varsayılan
+        uygulama tüm kayıtları tarar; indeksli backend'ler bunu ezer.
+        """
+        records = sorted(self.all(), key=lambda r: r['id'], reverse=descending)
+        if after is not None:
+            records = [r for r in records if (r['id'] < after if descending else r['id'] > after)]
+        return _page(records, filters or {}, limit)
+
+    def slot_count(self, slot):
+        """Saatteki aktif randevu sayısı - varsayılan uygulama tarar"""
+        return sum(1 for record in self.all() if slot_key(record) == slot)
+
+    def free_slots(self, candidates, vehicle_type, capacity, limit=5):
+        """Aday (tarih, saat) çiftlerinden kapasitesi dolmamış ilk limit kadarı"""
+        free = []
+        for date, time_ in candidates:
+            if self.slot_count((date, time_, vehicle_type)) < capacity:
+                free.append((date, time_))
+                if len(free) >= limit:
+                    break
+        return free
+
+    def changes(self, since):
+        """since sürümünden sonraki değişiklik olayları ve güncel sürüm
+
+        Olaylar: {'version', 'op': insert|update|delete, 'id', 'record'}.
+        Geçmiş artık tutulmuyorsa None döner - çağıran tam listeyi yeniden almalı.
+        """
+        return None
+
+    def wait_for_change(self, since, timeout):
+        """Sürüm since'i geçene kadar en fazla timeout saniye bekle"""
+        time.sleep(timeout)
+        return self.version != since
+
+    @property
+    @abc.abstractmethod
+    def version(self):
+        """Her değişiklikte artan sayaç"""
+
+    @abc.abstractmethod
+    def __len__(self):
+        """Kayıt sayısı"""
+
+
+class FileLock:
+    """Thread ve process'ler arası kilit (fcntl yoksa sadece thread kilidi)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._fd = None
+        self._depth = 0
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            # fork sonrası paylaşılmaması için her seferinde yeniden açılır
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+
+class IdAllocator:
+    """Kalıcı, artan id sayacı - son verilen id deponun yanındaki .seq dosyasında
+
+    Silinen kayıtların id'leri asla tekrar verilmez. Kilit thread'ler ve
+    gunicorn worker process'leri arasında tek bir sıra garanti eder. Depo kendi
+    kilidini verir; id alma ve log'a ekleme aynı kilit altında sıralanır.
+    """
+
+    def __init__(self, path, lock=None):
+        self.path = path
+        self.lock = lock or FileLock(path + '.lock')
+
+    def _read(self, fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        raw = os.read(fd, 32).strip()
+        return int(raw) if raw else 0
+
+    def _write(self, fd, value):
+        data = str(value).encode('ascii')
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, data)
+        os.ftruncate(fd, len(data))
+
+    def allocate(self, floor=0):
+        """Yeni id ver; floor, deponun bildiği en büyük id'nin altına düşmemek için"""
+        with self.lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                value = max(self._read(fd), floor) + 1
+                self._write(fd, value)
+            finally:
+                os.close(fd)
+            return value
+
+    def seed(self, value):
+        """Sayacı en az value değerine çek (taşıma sırasında)"""
+        with self.lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if value > self._read(fd):
+                    self._write(fd, value)
+            finally:
+                os.close(fd)
+
+
+def _walk(ids, after, descending):
+    """Sıralı id listesinde imleçten sonrasını tembel gez"""
+    if descending:
+        end = bisect.bisect_left(ids, after) if after is not None else len(ids)
+        return (ids[i] for i in range(end - 1, -1, -1))
+    start = bisect.bisect_right(ids, after) if after is not None else 0
+    return (ids[i] for i in range(start, len(ids)))
+
+
+def _insert_sorted(ids, value):
+    # Yeni id'ler neredeyse her zaman en büyüktür - sona ekleme O(1)
+    if not ids or ids[-1] < value:
+        ids.append(value)
+    else:
+        bisect.insort(ids, value)
+
+
+def _remove_sorted(ids, value):
+    i = bisect.bisect_left(ids, value)
+    if i < len(ids) and ids[i] == value:
+        del ids[i]
+
+
+class LogAppointmentStore(AppointmentStore):
+    """Append-only JSON-lines log + bellek içi id indeksi
+
+    Log satırları:
+        {"op": "put", "record": {...}}   -> ekleme / güncelleme
+        {"op": "del", "id": 5}           -> silme
+        {"op": "meta", "version": 10, "max_id": 42}  -> sıkıştırma başlığı
+    """
+
+    def __init__(self, path, legacy_json_path=None, fsync=False, compact_min=1000, id_allocator=None,
+                 change_log_size=1000, poll_interval=0.5):
+        self.path = path
+        self.fsync = fsync
+        self.compact_min = compact_min
+        self.poll_interval = poll_interval
+        self.lock = FileLock(path + '.lock')
+        self.id_allocator = id_allocator or IdAllocator(os.path.splitext(path)[0] + '.seq', lock=self.lock)
+        self._mutex = threading.RLock()
+        self._changed = threading.Condition(self._mutex)
+        self._changes = collections.deque(maxlen=change_log_size)
+        self._reset()
+
+        with self.lock:
+            if legacy_json_path and not os.path.exists(path) and os.path.exists(legacy_json_path):
+                self._migrate(legacy_json_path)
+            self._sync()
+            if self._changes_floor is None:
+                self._changes_floor = self._version  # henüz log yok - ilk yazma ilk olaydır
+
+    # ---------------------------------------------
+    # Log okuma
+    # ---------------------------------------------
+
+    def _reset(self):
+        self._records = {}
+        self._ids = []  # sıralı tüm id'ler
+        self._index = {field: {} for field in INDEXED_FIELDS}  # alan -> değer -> sıralı id'ler
+        self._date_keys = []  # aralık sorguları için sıralı farklı tarihler
+        self._slots = {}  # (tarih, saat, araç tipi) -> aktif randevu sayısı
+        self._offset = 0
+        self._file_id = None
+        self._version = 0
+        self._max_id = 0
+        self._dead = 0
+        # Dosya baştan okunurken uygulanan satırlar olay sayılmaz (anlık görüntüdür)
+        self._changes.clear()
+        self._changes_floor = None
+
+    def _add_to_index(self, record):
+        slot = slot_key(record)
+        if slot is not None:
+            self._slots[slot] = self._slots.get(slot, 0) + 1
+        for field in INDEXED_FIELDS:
+            value = index_value(record, field)
+            postings = self._index[field].get(value)
+            if postings is None:
+                postings = self._index[field][value] = []
+                if field == 'date' and isinstance(value, str):
+                    bisect.insort(self._date_keys, value)
+            _insert_sorted(postings, record['id'])
+
+    def _remove_from_index(self, record):
+        slot = slot_key(record)
+        if slot is not None:
+            if self._slots[slot] == 1:
+                del self._slots[slot]
+            else:
+                self._slots[slot] -= 1
+        for field in INDEXED_FIELDS:
+            value = index_value(record, field)
+            postings = self._index[field].get(value)
+            if postings is None:
+                continue
+            _remove_sorted(postings, record['id'])
+            if not postings:
+                del self._index[field][value]
+                if field == 'date' and isinstance(value, str):
+                    _remove_sorted(self._date_keys, value)
+
+    def _apply(self, entry):
+        op = entry.get('op')
+        if op == 'put':
+            record = entry['record']
+            old = self._records.get(record['id'])
+            if old is not None:
+                self._dead += 1
+                self._remove_from_index(old)
+            else:
+                _insert_sorted(self._ids, record['id'])
+            self._records[record['id']] = record
+            self._add_to_index(record)
+            self._max_id = max(self._max_id, record['id'])
+            self._version += 1
+            self._record_change('update' if old is not None else 'insert', record['id'], record)
+        elif op == 'del':
+            old = self._records.pop(entry['id'], None)
+            if old is not None:
+                self._dead += 2
+                self._remove_from_index(old)
+                _remove_sorted(self._ids, entry['id'])
+            self._version += 1
+            if old is not None:
+                self._record_change('delete', entry['id'], None)
+        elif op == 'meta':
+            self._version = entry.get('version', 0)
+            self._max_id = max(self._max_id, entry.get('max_id', 0))
+
+    def _record_change(self, op, appointment_id, record):
+        if self._changes_floor is None:
+            return
+        if len(self._changes) == self._changes.maxlen:
+            self._changes_floor = self._changes[0]['version']  # en eski olay düşüyor
+        self._changes.append({'version': self._version, 'op': op, 'id': appointment_id, 'record': record})
+
+    def _sync(self):
+        """Log'un başka process'ler tarafından eklenen kuyruğunu oku"""
+        with self._mutex:
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                if self._file_id is not None:
+                    self._reset()
+                return
+
+            file_id = (st.st_dev, st.st_ino)
+            if file_id != self._file_id or st.st_size < self._offset:
+                # Dosya sıkıştırılmış (değiştirilmiş) - baştan oku
+                if self._file_id is not None:
+                    self._reset()
+                self._file_id = file_id
+            if st.st_size == self._offset:
+                return
+
+            with open(self.path, 'rb') as f:
+                fst = os.fstat(f.fileno())
+                if (fst.st_dev, fst.st_ino) != self._file_id:
+                    self._reset()
+                    self._file_id = (fst.st_dev, fst.st_ino)
+                f.seek(self._offset)
+                data = f.read()
+
+            # Yarım yazılmış son satırı bir sonraki okumaya bırak
+            end = data.rfind(b'\n')
+            if end < 0:
+                return
+            for line in data[:end + 1].splitlines():
+                if line.strip():
+                    self._apply(json.loads(line))
+            self._offset += end + 1
+            if self._changes_floor is None:
+                self._changes_floor = self._version
+            self._changed.notify_all()
+
+    # ---------------------------------------------
+    # Log yazma (kilit altında çağrılmalı)
+    # ---------------------------------------------
+
+    def _append(self, entry):
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        # Okuyucular satırı iki kez uygulamasın diye yazma + uygulama tek adım
+        with self._mutex:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                if self.fsync:
+                    os.fsync(fd)
+                st = os.fstat(fd)
+            finally:
+                os.close(fd)
+
+            if self._file_id is None:
+                self._file_id = (st.st_dev, st.st_ino)
+            if self._changes_floor is None:
+                self._changes_floor = self._version
+            self._apply(entry)
+            self._offset += len(line)
+            self._changed.notify_all()
+
+        if self._dead > max(self.compact_min, len(self._records)):
+            self.compact()
+
+    def _write_snapshot(self, path, records, version, max_id):
+        with open(path, 'w', encoding='utf-8') as f:
+            base_version = version - len(records)
+            f.write(json.dumps({'op': 'meta', 'version': base_version, 'max_id': max_id}) + '\n')
+            for record in records:
+                f.write(json.dumps({'op': 'put', 'record': record}, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def compact(self):
+        """Eskimiş satırları at, log'u canlı kayıtlarla yeniden yaz"""
+        with self.lock:
+            self._sync()
+            with self._mutex:
+                tmp_path = self.path + '.tmp'
+                self._write_snapshot(tmp_path, list(self._records.values()), self._version, self._max_id)
+                os.replace(tmp_path, self.path)
+                st = os.stat(self.path)
+                self._file_id = (st.st_dev, st.st_ino)
+                self._offset = st.st_size
+                self._dead = 0
+
+    def _migrate(self, legacy_json_path):
+        """Eski data/appointments.json dosyasını log formatına taşı"""
+        try:
+            with open(legacy_json_path, 'r', encoding='utf-8') as f:
+                appointments = json.load(f)
+        except (ValueError, OSError):
+            appointments = []
+
+        # Eski sistem silme sonrası aynı id'yi tekrar verebiliyordu
+        max_id = max((a['id'] for a in appointments if isinstance(a.get('id'), int)), default=0)
+        seen = set()
+        records = []
+        for appointment in appointments:
+            appointment_id = appointment.get('id')
+            if not isinstance(appointment_id, int) or appointment_id in seen:
+                max_id += 1
+                appointment = {**appointment, 'id': max_id}
+            seen.add(appointment['id'])
+            records.append(appointment)
+
+        tmp_path = self.path + '.tmp'
+        self._write_snapshot(tmp_path, records, len(records), max_id)
+        os.replace(tmp_path, self.path)
+        os.replace(legacy_json_path, legacy_json_path + '.migrated')
+        self.id_allocator.seed(max_id)
+
+    # ---------------------------------------------
+    # Public API
+    # ---------------------------------------------
+
+    @property
+    def version(self):
+        self._sync()
+        return self._version
+
+    def __len__(self):
+        self._sync()
+        return len(self._records)
+
+    def changes(self, since):
+        self._sync()
+        with self._mutex:
+            if self._changes_floor is None:
+                return ([], self._version) if since == self._version else None
+            if since < self._changes_floor or since > self._version:
+                return None
+            events = []
+            for event in reversed(self._changes):
+                if event['version'] <= since:
+                    break
+                events.append(event)
+            return events[::-1], self._version
+
+    def wait_for_change(self, since, timeout):
+        """Bu process'teki yazmalar anında uyandırır, diğerleri poll_interval ile görülür"""
+        deadline = time.monotonic() + timeout
+        while True:
+            self._sync()
+            with self._changed:
+                if self._version != since:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._changed.wait(min(remaining, self.poll_interval))
+
+    def get(self, appointment_id):
+        self._sync()
+        return self._records.get(appointment_id)
+
+    def all(self):
+        """Tüm randevular (eklenme sırasıyla) - dönen kayıtlar salt okunur"""
+        self._sync()
+        with self._mutex:
+            return list(self._records.values())
+
+    def _candidates(self, filters, after, descending):
+        """En seçici indeksten imleç sonrasındaki id'ler (sıralı, tembel)"""
+        options = [(len(self._ids), lambda: _walk(self._ids, after, descending))]
+
+        for field in INDEXED_FIELDS:
+            if field in filters:
+                postings = self._index[field].get(filters[field], [])
+                options.append((len(postings), lambda p=postings: _walk(p, after, descending)))
+
+        if 'date_from' in filters or 'date_to' in filters:
+            low = bisect.bisect_left(self._date_keys, filters['date_from']) if 'date_from' in filters else 0
+            high = (bisect.bisect_right(self._date_keys, filters['date_to']) if 'date_to' in filters
+                    else len(self._date_keys))
+            lists = [self._index['date'][key] for key in self._date_keys[low:high]]
+            options.append((sum(map(len, lists)), lambda: heapq.merge(
+                *(_walk(p, after, descending) for p in lists), reverse=descending)))
+
+        return min(options, key=lambda option: option[0])[1]()
+
+    def query(self, filters=None, after=None, limit=50, descending=False):
+        """İndeksli sayfa sorgusu - maliyet toplam kayıt sayısına değil sayfa boyutuna bağlı"""
+        filters = filters or {}
+        self._sync()
+        with self._mutex:
+            ids = self._candidates(filters, after, descending)
+            return _page((self._records[i] for i in ids), filters, limit)
+
+    def slot_count(self, slot):
+        self._sync()
+        return self._slots.get(slot, 0)
+
+    def free_slots(self, candidates, vehicle_type, capacity, limit=5):
+        """Her aday tek sözlük araması - tarama yok"""
+        self._sync()
+        free = []
+        with self._mutex:
+            for date, time_ in candidates:
+                if self._slots.get((date, time_, vehicle_type), 0) < capacity:
+                    free.append((date, time_))
+                    if len(free) >= limit:
+                        break
+        return free
+
+    def _check_slot(self, record, capacity, current=None):
+        """Kilit altında çağrılır - kontrol ve yazma arasında başka process araya giremez"""
+        slot = slot_key(record)
+        if capacity is None or slot is None or (current is not None and slot_key(current) == slot):
+            return
+        if self._slots.get(slot, 0) >= capacity:
+            raise SlotUnavailable(slot)
+
+    def insert(self, record, capacity=None):
+        """Yeni randevu ekle, id kalıcı sayaçtan alınır
+
+        capacity verilirse saat dolu olduğunda SlotUnavailable fırlatılır.
+        """
+        with self.lock:
+            self._sync()
+            self._check_slot(record, capacity)
+            fields = {k: v for k, v in record.items() if k != 'id'}
+            record = {'id': self.id_allocator.allocate(floor=self._max_id), **fields}
+            self._append({'op': 'put', 'record': record})
+            return record
+
+    def update(self, appointment_id, changes, capacity=None):
+        with self.lock:
+            self._sync()
+            current = self._records.get(appointment_id)
+            if current is None:
+                return None
+            record = {**current, **changes, 'id': appointment_id}
+            self._check_slot(record, capacity, current)
+            self._append({'op': 'put', 'record': record})
+            return record
+
+    def delete(self, appointment_id):
+        with self.lock:
+            self._sync()
+            current = self._records.get(appointment_id)
+            if current is None:
+                return None
+            self._append({'op': 'del', 'id': appointment_id})
+            return current
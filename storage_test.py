@@ -0,0 +1,211 @@
+"""
+Galeri AI Asistan - Randevu Deposu Testleri
+"""
+
+import json
+import threading
+
+import pytest
+
+from storage import AppointmentStore, LogAppointmentStore, SlotUnavailable
+
+
+def make_store(tmp_path, **kwargs):
+    return LogAppointmentStore(str(tmp_path / 'appointments.log'), **kwargs)
+
+
+def test_incomplete_backend_fails_on_creation():
+    """Test: Soyut metodu eksik backend ilk kullanımda değil oluşturulurken hata verir"""
+    class ReadOnlyStore(AppointmentStore):
+        def get(self, appointment_id):
+            return None
+
+    with pytest.raises(TypeError):
+        ReadOnlyStore()
+
+
+def test_insert_update_delete(tmp_path):
+    """Test: Ekleme, güncelleme ve silme"""
+    store = make_store(tmp_path)
+    first = store.insert({'name': 'Ahmet Yılmaz', 'time': '14:00'})
+    second = store.insert({'name': 'Ayşe Demir', 'time': '15:00'})
+    assert (first['id'], second['id']) == (1, 2)
+
+    updated = store.update(1, {'time': '16:00'})
+    assert updated == {'id': 1, 'name': 'Ahmet Yılmaz', 'time': '16:00'}
+    assert store.get(1)['time'] == '16:00'
+
+    assert store.delete(2)['name'] == 'Ayşe Demir'
+    assert store.delete(2) is None
+    assert store.update(99, {'time': '10:00'}) is None
+    assert [a['id'] for a in store.all()] == [1]
+    assert store.version == 4
+
+
+def test_reopen_replays_log(tmp_path):
+    """Test: Log yeniden açıldığında aynı durum elde edilir"""
+    store = make_store(tmp_path)
+    store.insert({'name': 'Ahmet Yılmaz'})
+    store.insert({'name': 'Ayşe Demir'})
+    store.update(2, {'status': 'done'})
+    store.delete(1)
+
+    reopened = make_store(tmp_path)
+    assert reopened.all() == [{'id': 2, 'name': 'Ayşe Demir', 'status': 'done'}]
+    assert reopened.version == store.version
+
+
+def test_second_instance_sees_writes(tmp_path):
+    """Test: Aynı log'u paylaşan iki depo (iki worker) birbirinin yazdığını görür"""
+    a = make_store(tmp_path)
+    b = make_store(tmp_path)
+    a.insert({'name': 'Ahmet Yılmaz'})
+    created = b.insert({'name': 'Ayşe Demir'})
+    assert created['id'] == 2
+    assert [x['name'] for x in a.all()] == ['Ahmet Yılmaz', 'Ayşe Demir']
+
+
+def test_compaction_keeps_state(tmp_path):
+    """Test: Sıkıştırma sonrası kayıtlar ve sürüm korunur"""
+    store = make_store(tmp_path, compact_min=5)
+    store.insert({'name': 'Ahmet Yılmaz'})
+    for i in range(10):
+        store.update(1, {'counter': i})
+    with open(tmp_path / 'appointments.log', encoding='utf-8') as f:
+        assert len(f.readlines()) < 10
+
+    reopened = make_store(tmp_path)
+    assert reopened.get(1)['counter'] == 9
+    assert reopened.version == store.version
+
+
+def test_legacy_json_migration(tmp_path):
+    """Test: Eski appointments.json otomatik taşınır, tekrar eden id'ler düzeltilir"""
+    legacy = tmp_path / 'appointments.json'
+    legacy.write_text(json.dumps([
+        {'id': 1, 'name': 'Ahmet Yılmaz'},
+        {'id': 2, 'name': 'Ayşe Demir'},
+        {'id': 2, 'name': 'Mehmet Kaya'},
+    ]), encoding='utf-8')
+
+    store = make_store(tmp_path, legacy_json_path=str(legacy))
+    assert [a['id'] for a in store.all()] == [1, 2, 3]
+    assert not legacy.exists()
+    assert (tmp_path / 'appointments.json.migrated').exists()
+    assert store.insert({'name': 'Yeni Müşteri'})['id'] == 4
+
+
+def test_deleted_ids_are_never_reused(tmp_path):
+    """Test: Son kayıt silinse ve log sıkıştırılsa bile id tekrar verilmez"""
+    store = make_store(tmp_path)
+    store.insert({'name': 'Ahmet Yılmaz'})
+    store.insert({'name': 'Ayşe Demir'})
+    store.delete(2)
+    store.compact()
+
+    reopened = make_store(tmp_path)
+    assert reopened.insert({'name': 'Mehmet Kaya'})['id'] == 3
+    assert (tmp_path / 'appointments.seq').read_text() == '3'
+
+
+def test_id_allocator_is_thread_safe(tmp_path):
+    """Test: Paralel eklemelerde çakışan id oluşmaz"""
+    stores = [make_store(tmp_path), make_store(tmp_path)]
+    created = []
+
+    def worker(store):
+        for _ in range(25):
+            created.append(store.insert({'name': 'Test'})['id'])
+
+    threads = [threading.Thread(target=worker, args=(stores[i % 2],)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(created) == list(range(1, 101))
+    assert len(stores[0].all()) == 100
+
+
+def test_query_filters_and_cursor(tmp_path):
+    """Test: İndeksli sorgu filtreler, sayfalar ve güncellemeleri izler"""
+    store = make_store(tmp_path)
+    for day in range(1, 11):
+        store.insert({'name': f'Müşteri {day}', 'vehicle_type': 'suv' if day % 2 else 'otomobil',
+                      'date': f'2025-07-{day:02d}', 'status': 'active'})
+    store.update(3, {'status': 'cancelled'})
+    store.update(5, {'callback_requested': True})
+
+    page, cursor = store.query({'vehicle_type': 'suv'}, limit=2)
+    assert [a['id'] for a in page] == [1, 3] and cursor == 3
+    page, cursor = store.query({'vehicle_type': 'suv'}, after=cursor, limit=2)
+    assert [a['id'] for a in page] == [5, 7] and cursor == 7
+    page, cursor = store.query({'vehicle_type': 'suv'}, after=cursor, limit=2)
+    assert [a['id'] for a in page] == [9] and cursor is None
+
+    page, _ = store.query({'date_from': '2025-07-03', 'date_to': '2025-07-06', 'status': 'active'},
+                          descending=True)
+    assert [a['id'] for a in page] == [6, 5, 4]
+    assert [a['id'] for a in store.query({'callback_requested': True})[0]] == [5]
+    assert [a['id'] for a in store.query({'callback_requested': False}, after=8)[0]] == [9, 10]
+
+    store.delete(5)
+    assert store.query({'callback_requested': True}) == ([], None)
+    assert store.query(limit=0) == ([], None)
+
+    # Başka bir süreç açtığında indeks log'dan yeniden kurulur
+    reopened = make_store(tmp_path)
+    assert reopened.query({'status': 'cancelled'})[0] == [store.get(3)]
+
+
+def test_change_feed_across_processes(tmp_path):
+    """Test: Değişiklik olayları sürümle sıralanır, diğer process'in yazmaları da görülür"""
+    store = make_store(tmp_path, change_log_size=3, poll_interval=0.01)
+    other = make_store(tmp_path)
+    start = store.version
+
+    other.insert({'name': 'Ahmet Yılmaz'})
+    assert store.wait_for_change(start, timeout=1)
+    store.update(1, {'status': 'done'})
+    store.delete(1)
+
+    events, version = store.changes(start)
+    assert [(e['op'], e['id']) for e in events] == [('insert', 1), ('update', 1), ('delete', 1)]
+    assert [e['version'] for e in events] == [start + 1, start + 2, version]
+    assert events[1]['record']['status'] == 'done' and events[2]['record'] is None
+    assert store.changes(version) == ([], version)
+    assert not store.wait_for_change(version, timeout=0.05)
+
+    # Tampondan düşen ya da sıkıştırmayla kaybolan geçmiş için yeniden yükleme istenir
+    store.insert({'name': 'Ayşe Demir'})
+    assert store.changes(start) is None
+    other.compact()
+    assert store.changes(version) is None
+    assert store.changes(store.version) == ([], store.version)
+
+
+def test_slot_capacity_guard(tmp_path):
+    """Test: Dolu saate ekleme/taşıma reddedilir, iptal ve geri arama saat tutmaz"""
+    store = make_store(tmp_path)
+    other = make_store(tmp_path)
+    booking = {'name': 'Ahmet', 'date': '2025-07-01', 'time': '14:00', 'vehicle_type': 'suv'}
+    store.insert(booking, capacity=1)
+
+    with pytest.raises(SlotUnavailable) as error:
+        other.insert(dict(booking, name='Ayşe'), capacity=1)
+    assert error.value.slot == ('2025-07-01', '14:00', 'suv')
+    other.insert(dict(booking, vehicle_type='karavan'), capacity=1)
+    other.insert(dict(booking, callback_requested=True), capacity=1)
+    other.insert(dict(booking, name='Ayşe'), capacity=2)
+    assert store.slot_count(('2025-07-01', '14:00', 'suv')) == 2
+
+    second = store.insert(dict(booking, time='15:00'), capacity=1)
+    with pytest.raises(SlotUnavailable):
+        store.update(second['id'], {'time': '14:00'}, capacity=2)
+    store.update(second['id'], {'name': 'Mehmet'}, capacity=1)  # aynı saatte kalan güncelleme serbest
+
+    candidates = [('2025-07-01', t) for t in ('14:00', '15:00', '16:00')]
+    assert store.free_slots(candidates, 'suv', capacity=1) == [('2025-07-01', '16:00')]
+    store.update(1, {'status': 'cancelled'})
+    store.delete(second['id'])
+    assert other.free_slots(candidates, 'suv', capacity=2) == candidates
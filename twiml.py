@@ -0,0 +1,61 @@
+"""
+Galeri AI Asistan - Önceden Derlenmiş TwiML Şablonları
+Sesli asistanın her adımında yanıtın iskeleti aynıdır (soru + Gather +
+"Dinliyorum..." + vedalaşma); sadece soru metni değişir. İskelet açılışta
+VoiceResponse ile bir kez üretilir, yer tutucularından parçalara bölünür ve
+her istekte parçalar XML-escape edilmiş metinle birleştirilir.
+"""
+
+from xml.sax.saxutils import escape
+
+from twilio.twiml.voice_response import Gather, VoiceResponse
+
+VOICE = {'voice': 'Polly.Filiz', 'language': 'tr-TR'}
+LISTENING = "Dinliyorum..."
+NO_INPUT_GOODBYE = "Sizi duymadım. Aramayı sonlandırıyorum. İyi günler!"
+ERROR_MESSAGE = "Bir hata oluştu. Tekrar arayabilirsiniz."
+SLOT = "\x1eSLOT\x1e"  # metinde geçmeyen yer tutucu
+
+
+class TwimlTemplate:
+    """Yer tutucularla üretilmiş VoiceResponse'u parçalara ayırıp metin dolduran şablon"""
+
+    def __init__(self, response):
+        self._parts = str(response).split(SLOT)
+
+    @property
+    def slots(self):
+        return len(self._parts) - 1
+
+    def render(self, *texts):
+        if len(texts) != self.slots:
+            raise ValueError(f"şablon {self.slots} metin bekliyor, {len(texts)} verildi")
+        out = [self._parts[0]]
+        for text, part in zip(texts, self._parts[1:]):
+            out.append(escape(text))
+            out.append(part)
+        return ''.join(out)
+
+
+def _ask():
+    response = VoiceResponse()
+    response.say(SLOT, **VOICE)
+    gather = Gather(input='speech', timeout=8, speechTimeout=4, language='tr-TR', action='/voice', method='POST')
+    gather.say(LISTENING, **VOICE)
+    response.append(gather)
+    response.say(NO_INPUT_GOODBYE, **VOICE)
+    return response
+
+
+def _say(text=SLOT):
+    response = VoiceResponse()
+    response.say(text, **VOICE)
+    return response
+
+
+# Soru sor ve konuşmayı dinle - cevap gelmezse vedalaş
+ASK = TwimlTemplate(_ask())
+# Tek mesaj söyle ve aramayı bitir
+SAY = TwimlTemplate(_say())
+# Tamamen sabit hata yanıtı
+ERROR = str(_say(ERROR_MESSAGE))
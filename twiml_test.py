@@ -0,0 +1,29 @@
+"""
+Galeri AI Asistan - TwiML Şablon Testleri
+"""
+
+import pytest
+from twilio.twiml.voice_response import Gather, VoiceResponse
+
+import twiml
+
+
+def test_templates_match_voice_response():
+    """Test: Şablon çıktısı VoiceResponse ile birebir aynı, metin XML-escape edilir"""
+    question = "Saat kaçta? <14> & \"15\" olur mu?"
+
+    expected = VoiceResponse()
+    expected.say(question, voice='Polly.Filiz', language='tr-TR')
+    gather = Gather(input='speech', timeout=8, speechTimeout=4, language='tr-TR', action='/voice', method='POST')
+    gather.say("Dinliyorum...", voice='Polly.Filiz', language='tr-TR')
+    expected.append(gather)
+    expected.say("Sizi duymadım. Aramayı sonlandırıyorum. İyi günler!", voice='Polly.Filiz', language='tr-TR')
+    assert twiml.ASK.render(question) == str(expected)
+
+    goodbye = VoiceResponse()
+    goodbye.say("Randevu numaranız: 7 & iyi günler", voice='Polly.Filiz', language='tr-TR')
+    assert twiml.SAY.render("Randevu numaranız: 7 & iyi günler") == str(goodbye)
+    assert 'Bir hata oluştu' in twiml.ERROR
+
+    with pytest.raises(ValueError):
+        twiml.ASK.render()